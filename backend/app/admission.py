@@ -0,0 +1,202 @@
+# backend/app/admission.py
+
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from fastapi import HTTPException
+
+from . import tracing
+
+INTERACTIVE = "interactive" # 사용자가 화면에서 기다리는 요청 (경기 리포트, 선수 분석, 포메이션 추천)
+BATCH = "batch"             # 여러 건을 한꺼번에 처리하거나 백그라운드에서 도는 요청
+PRIORITIES = (INTERACTIVE, BATCH) # 앞의 등급이 먼저 실행됩니다.
+
+# 동시에 실행할 Gemini 호출 수와, 등급별로 쓸 수 있는 최대 실행 수
+# 배치는 전체보다 적게 제한해 대화형 요청이 항상 바로 들어갈 자리를 남겨 둡니다.
+MAX_IN_FLIGHT = 4
+IN_FLIGHT_LIMITS = {INTERACTIVE: 4, BATCH: 2}
+
+# 등급별 대기열 길이. 대기 중인 요청도 스레드풀 스레드를 하나씩 차지하므로
+# 실행 수 + 대기열 길이의 합이 스레드풀 크기(기본 40)보다 충분히 작아야 합니다.
+QUEUE_LIMITS = {INTERACTIVE: 16, BATCH: 8}
+# 이보다 오래 기다리면 대기를 포기하고 거절합니다. (초)
+QUEUE_TIMEOUTS = {INTERACTIVE: 20.0, BATCH: 60.0}
+
+# 호출 시간 기록이 없을 때 Retry-After 계산에 쓰는 기본값 (초)
+DEFAULT_SERVICE_SECONDS = 5.0
+SERVICE_EWMA_ALPHA = 0.2
+# 대기 시간 분위수를 계산할 최근 표본 수
+WAIT_SAMPLES = 500
+
+class AdmissionRejected(Exception):
+    """대기열이 가득 찼거나 대기 시간이 초과되어 요청을 받지 않을 때 발생합니다."""
+
+    def __init__(self, priority: str, reason: str, retry_after: int):
+        super().__init__(f"{priority} 요청 거절 ({reason})")
+        self.priority = priority
+        self.reason = reason
+        self.retry_after = retry_after
+
+class _ClassStats:
+    def __init__(self):
+        self.admitted = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+        self.waits = deque(maxlen=WAIT_SAMPLES)
+
+    def wait_percentile(self, pct: float):
+        if not self.waits:
+            return None
+        ordered = sorted(self.waits)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+class AdmissionController:
+    """Gemini 호출 앞에서 동시 실행 수를 제한하고, 대화형 요청을 배치 요청보다 먼저 실행합니다.
+
+    각 등급은 자기 대기열에서 도착 순서대로 실행되며, 더 높은 등급의 대기 요청이 있으면
+    낮은 등급은 자리가 비어도 기다립니다. 대기열이 가득 차거나 대기 시간이 초과되면
+    AdmissionRejected를 발생시킵니다.
+    """
+
+    def __init__(self, max_in_flight: int = MAX_IN_FLIGHT, in_flight_limits: dict = None,
+                 queue_limits: dict = None, queue_timeouts: dict = None, clock=time.monotonic):
+        self.max_in_flight = max_in_flight
+        self.in_flight_limits = in_flight_limits or IN_FLIGHT_LIMITS
+        self.queue_limits = queue_limits or QUEUE_LIMITS
+        self.queue_timeouts = queue_timeouts or QUEUE_TIMEOUTS
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._queues = {priority: deque() for priority in PRIORITIES}
+        self._in_flight = {priority: 0 for priority in PRIORITIES}
+        self._stats = {priority: _ClassStats() for priority in PRIORITIES}
+        self._service_ewma = None
+
+    def _can_start(self, priority: str, ticket) -> bool:
+        if self._queues[priority][0] is not ticket:
+            return False
+        if sum(self._in_flight.values()) >= self.max_in_flight:
+            return False
+        if self._in_flight[priority] >= self.in_flight_limits[priority]:
+            return False
+        for higher in PRIORITIES[:PRIORITIES.index(priority)]:
+            if self._queues[higher]:
+                return False
+        return True
+
+    def _retry_after(self, priority: str) -> int:
+        """지금 대기 중인 요청들이 빠질 때까지 걸릴 대략적인 시간(초)"""
+        service = self._service_ewma or DEFAULT_SERVICE_SECONDS
+        ahead = sum(len(self._queues[p]) for p in PRIORITIES[:PRIORITIES.index(priority) + 1])
+        return max(1, math.ceil((ahead + 1) * service / self.max_in_flight))
+
+    def acquire(self, priority: str):
+        """실행 자리가 날 때까지 기다린 뒤, release에 넘길 티켓을 반환합니다."""
+        with self._cond:
+            stats = self._stats[priority]
+            queue = self._queues[priority]
+            if len(queue) >= self.queue_limits[priority]:
+                stats.rejected_queue_full += 1
+                raise AdmissionRejected(priority, "queue_full", self._retry_after(priority))
+
+            ticket = object()
+            queue.append(ticket)
+            enqueued_at = self._clock()
+            deadline = enqueued_at + self.queue_timeouts[priority]
+            while not self._can_start(priority, ticket):
+                remaining = deadline - self._clock()
+                if remaining <= 0:
+                    queue.remove(ticket)
+                    stats.rejected_timeout += 1
+                    # 이 요청이 앞을 막고 있었을 수 있으므로 다른 대기 요청을 깨웁니다.
+                    self._cond.notify_all()
+                    raise AdmissionRejected(priority, "timeout", self._retry_after(priority))
+                self._cond.wait(remaining)
+
+            queue.popleft()
+            self._in_flight[priority] += 1
+            started_at = self._clock()
+            stats.admitted += 1
+            stats.waits.append(started_at - enqueued_at)
+            self._cond.notify_all()
+            return (priority, started_at)
+
+    def release(self, ticket):
+        priority, started_at = ticket
+        with self._cond:
+            self._in_flight[priority] -= 1
+            service = self._clock() - started_at
+            if self._service_ewma is None:
+                self._service_ewma = service
+            else:
+                self._service_ewma = SERVICE_EWMA_ALPHA * service + (1 - SERVICE_EWMA_ALPHA) * self._service_ewma
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, priority: str):
+        """with 블록 동안 실행 자리 하나를 차지합니다. (백그라운드 작업용)"""
+        ticket = self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release(ticket)
+
+    def idle(self) -> bool:
+        """실행 중이거나 대기 중인 요청이 하나도 없으면 True"""
+        with self._cond:
+            return not any(self._in_flight.values()) and not any(self._queues.values())
+
+    def metrics(self) -> dict:
+        """등급별 실행/대기 수, 처리/거절 횟수와 대기 시간 분위수"""
+        def to_ms(seconds):
+            return round(seconds * 1000, 1) if seconds is not None else None
+
+        with self._cond:
+            return {
+                "max_in_flight": self.max_in_flight,
+                "service_ewma_ms": to_ms(self._service_ewma),
+                "classes": {
+                    priority: {
+                        "in_flight": self._in_flight[priority],
+                        "queued": len(self._queues[priority]),
+                        "admitted": stats.admitted,
+                        "rejected_queue_full": stats.rejected_queue_full,
+                        "rejected_timeout": stats.rejected_timeout,
+                        "wait_p50_ms": to_ms(stats.wait_percentile(50)),
+                        "wait_p95_ms": to_ms(stats.wait_percentile(95)),
+                        "wait_max_ms": to_ms(max(stats.waits) if stats.waits else None),
+                    }
+                    for priority, stats in self._stats.items()
+                },
+            }
+
+controller = AdmissionController()
+
+@contextmanager
+def admitted(priority: str):
+    """with 블록 동안 priority 등급의 실행 자리를 차지하고, 받을 수 없으면 429 HTTPException을 발생시킵니다.
+
+    저장된 결과를 먼저 확인하는 엔드포인트처럼 LLM 호출이 필요할 때만 자리를 차지할 때 사용합니다.
+    """
+    try:
+        with tracing.span("admission.wait", **{"admission.priority": priority}):
+            ticket = controller.acquire(priority)
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=429,
+            detail="AI 요청이 많아 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    try:
+        yield
+    finally:
+        controller.release(ticket)
+
+def admit(priority: str):
+    """엔드포인트 의존성: 요청 처리 동안 priority 등급의 실행 자리를 차지하고, 받을 수 없으면 429를 반환합니다."""
+    def dependency():
+        with admitted(priority):
+            yield
+    return dependency
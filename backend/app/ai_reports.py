@@ -0,0 +1,96 @@
+# backend/app/ai_reports.py
+
+# 경기 리포트와 포메이션 추천의 프롬프트를 만들고, 생성 결과를 ai_reports 테이블에 저장/조회합니다.
+# 엔드포인트와 사전 생성 스케줄러(precompute.py)가 같은 함수를 사용하므로,
+# 미리 만들어 둔 결과는 프롬프트 입력이 바뀌지 않은 동안 그대로 재사용됩니다.
+
+from collections import namedtuple
+from typing import Callable, Optional
+
+from sqlalchemy.orm import Session
+
+from . import analytics, crud, prompts, ratings
+
+GAME_REPORT = "game_report"
+FORMATION = "formation"
+
+# text는 LLM에 보낼 프롬프트, hash_input은 저장된 결과가 오래되었는지 판단할 입력입니다.
+# 포메이션 추천의 Elo 레이팅처럼 다른 상대와의 경기마다 조금씩 바뀌는 참고 정보는 text에만 넣어,
+# 그 변화만으로 저장된 결과가 오래된 것으로 처리되지 않게 합니다.
+Prompt = namedtuple("Prompt", ["text", "hash_input"])
+
+def formation_key(opponent_team: str, opponent_style: Optional[str] = None) -> str:
+    """같은 상대라도 전술 스타일 입력이 다르면 별도로 저장합니다."""
+    if opponent_style:
+        return f"{opponent_team}\n{opponent_style}"
+    return opponent_team
+
+def game_report_prompt(db: Session, game_id: int) -> Optional[Prompt]:
+    """경기가 없으면 None"""
+    db_game = crud.get_game(db, game_id=game_id)
+    if not db_game:
+        return None
+    text = prompts.game_report_prompt(db_game)
+    return Prompt(text, text)
+
+def formation_prompt(db: Session, opponent_team: str, opponent_style: Optional[str] = None) -> Optional[Prompt]:
+    """등록된 선수가 없으면 None"""
+    return formation_prompts(db, [(opponent_team, opponent_style)]).get((opponent_team, opponent_style))
+
+def formation_prompts(db: Session, targets: list) -> dict:
+    """(상대 팀, 전술 스타일) 목록의 프롬프트를 선수/전적/레이팅을 한 번씩만 읽어 만듭니다. 등록된 선수가 없으면 빈 dict
+
+    레이팅은 프롬프트에만 넣고 입력 해시에서는 뺍니다. 그 상대와의 전적이 바뀌면 해시도 바뀝니다.
+    """
+    all_players = crud.get_players(db, limit=100)
+    if not all_players:
+        return {}
+    opponent_stats = {s.opponent_team: s for s in analytics.get_stats_by_opponent(db)}
+    matchups = ratings.get_matchups(db, [opponent_team for opponent_team, _ in targets])
+    result = {}
+    for opponent_team, opponent_style in targets:
+        opponent_stat = opponent_stats.get(opponent_team)
+        result[(opponent_team, opponent_style)] = Prompt(
+            prompts.formation_prompt(all_players, opponent_team, opponent_stat, opponent_style,
+                                     matchups[opponent_team]),
+            prompts.formation_prompt(all_players, opponent_team, opponent_stat, opponent_style),
+        )
+    return result
+
+def get_stored(db: Session, kind: str, target_key: str, prompt: Prompt):
+    """저장된 결과와, 그 뒤 프롬프트 입력이 바뀌었는지(stale) 여부를 반환합니다. 없으면 (None, False)"""
+    db_report = crud.get_ai_report(db, kind, target_key)
+    if db_report is None:
+        return None, False
+    return db_report, db_report.input_hash != prompts.input_hash(prompt.hash_input)
+
+def get_fresh(db: Session, kind: str, target_key: str, prompt: Prompt) -> Optional[str]:
+    """저장된 결과가 있고 그 뒤 프롬프트 입력이 바뀌지 않았으면 그 결과를, 아니면 None을 반환합니다."""
+    db_report, stale = get_stored(db, kind, target_key, prompt)
+    if db_report is None or stale:
+        return None
+    return db_report.report
+
+def get_stored_many(db: Session, kind: str, prompts_by_key: dict) -> dict:
+    """get_stored를 여러 대상에 대해 한 번의 조회로 수행합니다. 저장된 결과가 있는 대상만 {target_key: (결과, stale)}"""
+    return {
+        db_report.target_key: (
+            db_report, db_report.input_hash != prompts.input_hash(prompts_by_key[db_report.target_key].hash_input)
+        )
+        for db_report in crud.get_ai_reports(db, kind, list(prompts_by_key))
+    }
+
+def generate_and_store(db: Session, kind: str, target_key: str, prompt: Prompt, task: str,
+                       generate: Callable[..., str]) -> str:
+    report = generate(prompt.text, task=task)
+    crud.save_ai_report(db, kind, target_key, report, prompts.input_hash(prompt.hash_input))
+    return report
+
+def get_or_generate(db: Session, kind: str, target_key: str, prompt: Prompt, task: str,
+                    generate: Callable[..., str], refresh: bool = False) -> str:
+    """저장된 결과가 최신이면 그대로, 아니면 새로 생성해 저장한 결과를 반환합니다."""
+    if not refresh:
+        report = get_fresh(db, kind, target_key, prompt)
+        if report is not None:
+            return report
+    return generate_and_store(db, kind, target_key, prompt, task, generate)
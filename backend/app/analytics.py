@@ -0,0 +1,392 @@
+# backend/app/analytics.py
+
+import threading
+from collections import namedtuple
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from . import changes, crud, models
+from .database import SessionLocal
+
+# 문자열 컬럼은 작은 정수 코드로 저장합니다.
+EVENT_TYPE_CODES = {"GOAL": 0, "ASSIST": 1}
+RESULT_CODES = {"WIN": 0, "LOSE": 1, "DRAW": 2}
+GOAL, ASSIST = EVENT_TYPE_CODES["GOAL"], EVENT_TYPE_CODES["ASSIST"]
+WIN, LOSE, DRAW = RESULT_CODES["WIN"], RESULT_CODES["LOSE"], RESULT_CODES["DRAW"]
+
+# 시작 시 DB에서 한 번에 읽어올 행 수
+LOAD_CHUNK_SIZE = 50000
+
+# crud.py의 SQL 집계 결과와 같은 필드 이름을 사용합니다.
+OpponentStatsRow = namedtuple("OpponentStatsRow", ["opponent_team", "total_games", "wins", "losses", "draws"])
+LeaderboardRow = namedtuple("LeaderboardRow", ["player_id", "name", "goals", "assists"])
+
+def to_micros(value: datetime) -> int:
+    """datetime을 int64 마이크로초 값으로 변환합니다."""
+    return int(np.datetime64(value, "us").astype(np.int64))
+
+def _date_bounds(start_date: Optional[date], end_date: Optional[date]):
+    """날짜 범위(양 끝 포함)를 [start, end) 마이크로초 범위로 변환합니다."""
+    start = to_micros(datetime.combine(start_date, time.min)) if start_date else None
+    end = to_micros(datetime.combine(end_date + timedelta(days=1), time.min)) if end_date else None
+    return start, end
+
+class GrowableArray:
+    """용량을 두 배씩 늘려가며 값을 덧붙이는 1차원 NumPy 배열입니다."""
+
+    def __init__(self, dtype, capacity: int = 1024):
+        self._data = np.empty(capacity, dtype=dtype)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._data[:self._size]
+
+    def extend(self, values):
+        values = np.asarray(values, dtype=self._data.dtype)
+        needed = self._size + len(values)
+        if needed > len(self._data):
+            grown = np.empty(max(needed, len(self._data) * 2), dtype=self._data.dtype)
+            grown[:self._size] = self.values
+            self._data = grown
+        self._data[self._size:needed] = values
+        self._size = needed
+
+    def keep(self, mask: np.ndarray):
+        """mask가 True인 값만 남깁니다."""
+        kept = self.values[mask]
+        self._data[:len(kept)] = kept
+        self._size = len(kept)
+
+class AnalyticsEngine:
+    """경기/이벤트를 메모리의 컬럼 배열로 보관하고, 통계를 NumPy 벡터 연산으로 계산합니다.
+
+    시작 시 DB 전체를 한 번 읽고, 이후에는 crud.py가 발행하는 변경 이벤트(changes.py)를 받아
+    바뀐 경기만 반영합니다. 통계 요청은 SQL을 실행하지 않습니다.
+    """
+
+    def __init__(self, session_factory=SessionLocal):
+        self._session_factory = session_factory
+        self._lock = threading.RLock()
+        self._applied = threading.Condition(self._lock)
+        self.applied_version = 0
+        self.ready = False
+        self._reset()
+
+    def _reset(self):
+        self.game_ids = GrowableArray(np.int32)
+        self.game_dates = GrowableArray(np.int64)
+        self.game_opponents = GrowableArray(np.int32)
+        self.game_our_scores = GrowableArray(np.int32)
+        self.game_opponent_scores = GrowableArray(np.int32)
+        self.game_results = GrowableArray(np.int8)
+        self.event_game_ids = GrowableArray(np.int32)
+        self.event_player_ids = GrowableArray(np.int32)
+        self.event_types = GrowableArray(np.int8)
+        self.event_dates = GrowableArray(np.int64)
+        self.event_opponents = GrowableArray(np.int32)
+        self.opponent_names = []
+        self._opponent_codes = {}
+        self._game_index = {}
+        self.player_names = {}
+
+    # --- 적재 및 변경 반영 ---
+    def start(self):
+        """변경 이벤트 리스너를 등록하고 DB 전체를 적재합니다."""
+        changes.broadcaster.add_listener(self.on_change)
+        db = self._session_factory()
+        try:
+            self.load(db)
+        finally:
+            db.close()
+
+    def load(self, db: Session):
+        """DB의 경기, 이벤트, 선수 정보를 모두 읽어 컬럼 배열을 새로 만듭니다."""
+        # ORM 세션 대신 Core 커넥션으로 읽어 행마다 드는 비용을 줄입니다.
+        conn = db.connection()
+        with self._lock:
+            self._reset()
+            games = conn.execute(
+                select(models.Game.id, models.Game.game_date, models.Game.opponent_team,
+                       models.Game.our_score, models.Game.opponent_score, models.Game.result)
+                .order_by(models.Game.id).execution_options(yield_per=LOAD_CHUNK_SIZE)
+            )
+            for rows in games.partitions(LOAD_CHUNK_SIZE):
+                self._append_games(rows)
+
+            events = conn.execute(
+                select(models.GameEvent.game_id, models.GameEvent.player_id, models.GameEvent.event_type)
+                .where(models.GameEvent.event_type.in_(list(EVENT_TYPE_CODES)))
+                .order_by(models.GameEvent.id).execution_options(yield_per=LOAD_CHUNK_SIZE)
+            )
+            for rows in events.partitions(LOAD_CHUNK_SIZE):
+                self._append_events(rows)
+
+            self.player_names = dict(conn.execute(select(models.Player.id, models.Player.name)).all())
+            self.ready = True
+
+    def _opponent_code(self, name: str) -> int:
+        code = self._opponent_codes.get(name)
+        if code is None:
+            code = self._opponent_codes[name] = len(self.opponent_names)
+            self.opponent_names.append(name)
+        return code
+
+    def _append_games(self, rows):
+        """(id, game_date, opponent_team, our_score, opponent_score, result) 행들을 추가합니다."""
+        ids, dates, opponents, our_scores, opponent_scores, results = zip(*rows)
+        offset = len(self.game_ids)
+        self._game_index.update((game_id, offset + i) for i, game_id in enumerate(ids))
+        self.game_ids.extend(ids)
+        self.game_dates.extend(np.array(dates, dtype="datetime64[us]").astype(np.int64))
+        self.game_opponents.extend([self._opponent_code(name) for name in opponents])
+        self.game_our_scores.extend([score or 0 for score in our_scores])
+        self.game_opponent_scores.extend([score or 0 for score in opponent_scores])
+        self.game_results.extend([RESULT_CODES.get(result, DRAW) for result in results])
+
+    def _append_events(self, rows):
+        """(game_id, player_id, event_type) 행들을 추가합니다. 경기 날짜와 상대 팀은 경기 배열에서 가져옵니다."""
+        game_ids, player_ids, event_types = zip(*rows)
+        game_ids = np.array(game_ids, dtype=np.int32)
+        # 이벤트마다 경기 배열에서의 위치를 이진 탐색으로 찾습니다. (없는 경기의 이벤트는 버립니다)
+        all_game_ids = self.game_ids.values
+        if not len(all_game_ids):
+            return
+        sorter = np.argsort(all_game_ids, kind="stable")
+        found = np.searchsorted(all_game_ids, game_ids, sorter=sorter).clip(max=len(all_game_ids) - 1)
+        positions = sorter[found]
+        known = all_game_ids[positions] == game_ids
+        positions = positions[known]
+        self.event_game_ids.extend(game_ids[known])
+        self.event_player_ids.extend(np.array(player_ids, dtype=np.int32)[known])
+        self.event_types.extend(np.where(np.array(event_types) == "GOAL", GOAL, ASSIST).astype(np.int8)[known])
+        self.event_dates.extend(self.game_dates.values[positions])
+        self.event_opponents.extend(self.game_opponents.values[positions])
+
+    def on_change(self, event: dict):
+        """changes.py 리스너: 바뀐 경기/선수만 DB에서 다시 읽어 반영합니다."""
+        try:
+            if event["entity"] == "game":
+                self._apply_game_change(event["id"])
+            elif event["entity"] == "player":
+                self._apply_player_change(event["id"])
+        finally:
+            with self._applied:
+                self.applied_version = max(self.applied_version, event["version"])
+                self._applied.notify_all()
+
+    def _apply_game_change(self, game_id: int):
+        db = self._session_factory()
+        try:
+            game = db.execute(
+                select(models.Game.id, models.Game.game_date, models.Game.opponent_team,
+                       models.Game.our_score, models.Game.opponent_score, models.Game.result)
+                .where(models.Game.id == game_id)
+            ).first()
+            # 새 경기인지는 아래에서 lock을 잡은 뒤 판단합니다. (그 사이 load가 인덱스를 바꿀 수 있으므로
+            # 여기서는 경기가 있으면 이벤트를 항상 읽어 둡니다)
+            events = []
+            if game is not None:
+                events = db.execute(
+                    select(models.GameEvent.game_id, models.GameEvent.player_id, models.GameEvent.event_type)
+                    .where(models.GameEvent.game_id == game_id,
+                           models.GameEvent.event_type.in_(list(EVENT_TYPE_CODES)))
+                    .order_by(models.GameEvent.id)
+                ).all()
+        finally:
+            db.close()
+
+        with self._lock:
+            position = self._game_index.get(game_id)
+            if game is None:
+                # 삭제된 경기: 경기와 이벤트 행을 제거합니다.
+                if position is not None:
+                    self._remove_game(game_id)
+            elif position is None:
+                self._append_games([game])
+                if events:
+                    self._append_events(events)
+            else:
+                # 수정된 경기: 해당 행과 이벤트의 날짜/상대 팀을 제자리에서 갱신합니다.
+                _, game_date, opponent_team, our_score, opponent_score, result = game
+                micros = to_micros(game_date)
+                opponent_code = self._opponent_code(opponent_team)
+                self.game_dates.values[position] = micros
+                self.game_opponents.values[position] = opponent_code
+                self.game_our_scores.values[position] = our_score or 0
+                self.game_opponent_scores.values[position] = opponent_score or 0
+                self.game_results.values[position] = RESULT_CODES.get(result, DRAW)
+                game_events = self.event_game_ids.values == game_id
+                self.event_dates.values[game_events] = micros
+                self.event_opponents.values[game_events] = opponent_code
+
+    def _remove_game(self, game_id: int):
+        game_mask = self.game_ids.values != game_id
+        event_mask = self.event_game_ids.values != game_id
+        for column in (self.game_ids, self.game_dates, self.game_opponents,
+                       self.game_our_scores, self.game_opponent_scores, self.game_results):
+            column.keep(game_mask)
+        for column in (self.event_game_ids, self.event_player_ids, self.event_types,
+                       self.event_dates, self.event_opponents):
+            column.keep(event_mask)
+        self._game_index = {gid: i for i, gid in enumerate(self.game_ids.values.tolist())}
+
+    def _apply_player_change(self, player_id: int):
+        db = self._session_factory()
+        try:
+            name = db.execute(select(models.Player.name).where(models.Player.id == player_id)).scalar()
+        finally:
+            db.close()
+        with self._lock:
+            if name is None:
+                self.player_names.pop(player_id, None)
+            else:
+                self.player_names[player_id] = name
+
+    def sync(self, timeout: float = 1.0):
+        """지금까지 커밋된 변경이 반영될 때까지 잠시 기다립니다. (쓰기 직후 조회 일관성)"""
+        target = changes.broadcaster.version
+        with self._applied:
+            self._applied.wait_for(lambda: self.applied_version >= target, timeout)
+
+    # --- 집계 ---
+    def _game_mask(self, start: Optional[int], end: Optional[int]) -> np.ndarray:
+        dates = self.game_dates.values
+        mask = np.ones(len(dates), dtype=bool)
+        if start is not None:
+            mask &= dates >= start
+        if end is not None:
+            mask &= dates < end
+        return mask
+
+    def _event_mask(self, start: Optional[int], end: Optional[int]) -> np.ndarray:
+        dates = self.event_dates.values
+        mask = np.ones(len(dates), dtype=bool)
+        if start is not None:
+            mask &= dates >= start
+        if end is not None:
+            mask &= dates < end
+        return mask
+
+    def opponent_stats(self, start_date: Optional[date] = None, end_date: Optional[date] = None) -> list:
+        """상대 팀별 전적 (crud.get_stats_by_opponent와 같은 결과)"""
+        start, end = _date_bounds(start_date, end_date)
+        with self._lock:
+            mask = self._game_mask(start, end)
+            opponents = self.game_opponents.values[mask]
+            results = self.game_results.values[mask]
+            size = len(self.opponent_names)
+            totals = np.bincount(opponents, minlength=size)
+            wins = np.bincount(opponents[results == WIN], minlength=size)
+            losses = np.bincount(opponents[results == LOSE], minlength=size)
+            draws = np.bincount(opponents[results == DRAW], minlength=size)
+            names = list(self.opponent_names)
+
+        return [
+            OpponentStatsRow(names[code], int(totals[code]), int(wins[code]), int(losses[code]), int(draws[code]))
+            for code in sorted(np.flatnonzero(totals), key=lambda code: names[code])
+        ]
+
+    def score_columns(self):
+        """(상대 팀 이름 목록, 경기별 상대 코드, 우리 득점, 상대 득점) 복사본 (경기 시뮬레이션용)"""
+        with self._lock:
+            return (
+                list(self.opponent_names),
+                self.game_opponents.values.copy(),
+                self.game_our_scores.values.copy(),
+                self.game_opponent_scores.values.copy(),
+            )
+
+    def _event_counts(self, mask: np.ndarray, size: int):
+        players = self.event_player_ids.values[mask]
+        types = self.event_types.values[mask]
+        goals = np.bincount(players[types == GOAL], minlength=size)
+        assists = np.bincount(players[types == ASSIST], minlength=size)
+        return goals, assists
+
+    def leaderboard(self, start_date: Optional[date] = None, end_date: Optional[date] = None) -> list:
+        """선수별 득점/도움 (crud.get_leaderboard_stats와 같은 결과)"""
+        start, end = _date_bounds(start_date, end_date)
+        with self._lock:
+            player_names = dict(self.player_names)
+            max_event_player = int(self.event_player_ids.values.max()) if len(self.event_player_ids) else 0
+            size = max([max_event_player, *player_names]) + 1
+            goals, assists = self._event_counts(self._event_mask(start, end), size)
+
+        return [
+            LeaderboardRow(player_id, name, int(goals[player_id]), int(assists[player_id]))
+            for player_id, name in sorted(player_names.items())
+        ]
+
+    def player_summary(self, player_id: int, start_date: Optional[date] = None, end_date: Optional[date] = None) -> Optional[dict]:
+        """한 선수의 득점/도움 합계와 상대 팀별 기록을 반환합니다."""
+        start, end = _date_bounds(start_date, end_date)
+        with self._lock:
+            name = self.player_names.get(player_id)
+            if name is None:
+                return None
+            mask = self._event_mask(start, end) & (self.event_player_ids.values == player_id)
+            games = len(np.unique(self.event_game_ids.values[mask]))
+            types = self.event_types.values[mask]
+            opponents = self.event_opponents.values[mask]
+            size = len(self.opponent_names)
+            goals_by_opponent = np.bincount(opponents[types == GOAL], minlength=size)
+            assists_by_opponent = np.bincount(opponents[types == ASSIST], minlength=size)
+            names = list(self.opponent_names)
+
+        goals = int((types == GOAL).sum())
+        assists = int((types == ASSIST).sum())
+        by_opponent = [
+            {"opponent_team": names[code], "goals": int(goals_by_opponent[code]), "assists": int(assists_by_opponent[code])}
+            for code in sorted(np.flatnonzero(goals_by_opponent + assists_by_opponent), key=lambda code: names[code])
+        ]
+        return {
+            "player_id": player_id, "name": name, "goals": goals, "assists": assists,
+            "points": goals + assists, "games": games, "by_opponent": by_opponent,
+        }
+
+    def verify_against_sql(self, db: Session, start_date: Optional[date] = None, end_date: Optional[date] = None) -> list:
+        """SQL 집계 결과와 비교하여 서로 다른 항목의 설명 목록을 반환합니다. (빈 목록이면 일치)"""
+        mismatches = []
+        sql_opponents = {
+            row.opponent_team: (row.total_games, row.wins or 0, row.losses or 0, row.draws or 0)
+            for row in crud.get_stats_by_opponent(db, start_date, end_date)
+        }
+        engine_opponents = {row.opponent_team: tuple(row[1:]) for row in self.opponent_stats(start_date, end_date)}
+        for team in sorted(set(sql_opponents) | set(engine_opponents)):
+            if sql_opponents.get(team) != engine_opponents.get(team):
+                mismatches.append(f"상대 팀 {team}: SQL={sql_opponents.get(team)} 엔진={engine_opponents.get(team)}")
+
+        sql_leaderboard = {
+            row.player_id: (row.name, row.goals or 0, row.assists or 0)
+            for row in crud.get_leaderboard_stats(db, start_date, end_date)
+        }
+        engine_leaderboard = {row.player_id: tuple(row[1:]) for row in self.leaderboard(start_date, end_date)}
+        for player_id in sorted(set(sql_leaderboard) | set(engine_leaderboard)):
+            if sql_leaderboard.get(player_id) != engine_leaderboard.get(player_id):
+                mismatches.append(f"선수 {player_id}: SQL={sql_leaderboard.get(player_id)} 엔진={engine_leaderboard.get(player_id)}")
+        return mismatches
+
+# 프로세스 전체에서 하나만 사용하는 엔진
+engine = AnalyticsEngine()
+
+def get_stats_by_opponent(db: Session, start_date: Optional[date] = None, end_date: Optional[date] = None) -> list:
+    """엔진이 준비되어 있으면 메모리에서, 아니면 SQL로 상대 팀별 전적을 계산합니다."""
+    if engine.ready:
+        engine.sync()
+        return engine.opponent_stats(start_date, end_date)
+    return crud.get_stats_by_opponent(db, start_date, end_date)
+
+def get_leaderboard_stats(db: Session, start_date: Optional[date] = None, end_date: Optional[date] = None) -> list:
+    """엔진이 준비되어 있으면 메모리에서, 아니면 SQL로 선수별 득점/도움을 계산합니다."""
+    if engine.ready:
+        engine.sync()
+        return engine.leaderboard(start_date, end_date)
+    return crud.get_leaderboard_stats(db, start_date, end_date)
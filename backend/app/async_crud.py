@@ -0,0 +1,109 @@
+# backend/app/async_crud.py
+
+# crud.py의 비동기(AsyncSession) 버전입니다.
+# 응답 직렬화 시점에는 지연 로딩(lazy load)을 할 수 없으므로, 경기를 반환하는 함수는 events와 선수를 미리 읽어 둡니다.
+# 집계/튜플 조회처럼 쿼리가 긴 함수는 run_sync로 crud.py의 구현을 그대로 재사용합니다.
+
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from . import changes, crud, models, schemas
+
+_WITH_EVENTS = selectinload(models.Game.events).joinedload(models.GameEvent.player)
+
+# Player CRUD
+async def get_player(db: AsyncSession, player_id: int):
+    return await db.get(models.Player, player_id)
+
+async def get_player_by_name(db: AsyncSession, name: str):
+    result = await db.execute(select(models.Player).where(models.Player.name == name))
+    return result.scalars().first()
+
+async def get_players(db: AsyncSession, skip: int = 0, limit: int = 100):
+    result = await db.execute(select(models.Player).offset(skip).limit(limit))
+    return result.scalars().all()
+
+async def create_player(db: AsyncSession, player: schemas.PlayerCreate):
+    db_player = models.Player(**player.dict())
+    db.add(db_player)
+    await db.commit()
+    await db.refresh(db_player)
+    changes.publish("player", db_player.id, "created")
+    return db_player
+
+async def update_player(db: AsyncSession, player_id: int, player: schemas.PlayerUpdate):
+    db_player = await get_player(db, player_id)
+    if db_player:
+        update_data = player.dict(exclude_unset=True)
+        for key, value in update_data.items():
+            setattr(db_player, key, value)
+        await db.commit()
+        await db.refresh(db_player)
+        changes.publish("player", player_id, "updated")
+    return db_player
+
+async def delete_player(db: AsyncSession, player_id: int):
+    db_player = await get_player(db, player_id)
+    if db_player:
+        await db.delete(db_player)
+        await db.commit()
+        changes.publish("player", player_id, "deleted")
+    return db_player
+
+async def get_player_rows(db: AsyncSession, columns: list, skip: int = 0, limit: int = 100):
+    return await db.run_sync(crud.get_player_rows, columns, skip=skip, limit=limit)
+
+# Game CRUD
+async def get_games(db: AsyncSession, skip: int = 0, limit: int = 100):
+    result = await db.execute(select(models.Game).options(_WITH_EVENTS).offset(skip).limit(limit))
+    return result.scalars().all()
+
+async def get_game(db: AsyncSession, game_id: int):
+    result = await db.execute(select(models.Game).options(_WITH_EVENTS).where(models.Game.id == game_id))
+    return result.scalars().first()
+
+async def get_game_event_rows(db: AsyncSession, skip: int = 0, limit: int = 100):
+    return await db.run_sync(crud.get_game_event_rows, skip=skip, limit=limit)
+
+async def create_game(db: AsyncSession, game: schemas.GameCreate):
+    # 경기와 이벤트를 만드는 부분은 동기 경로와 같은 crud.add_game을 사용합니다.
+    db_game = await db.run_sync(crud.add_game, game)
+    await db.commit()
+    game_id = db_game.id
+    changes.publish("game", game_id, "created")
+    # 세션에 남아 있는 객체 대신 events가 채워진 객체를 새로 읽어 반환합니다.
+    db.expunge(db_game)
+    return await get_game(db, game_id)
+
+async def update_game(db: AsyncSession, game_id: int, game: schemas.GameUpdate):
+    db_game = await get_game(db, game_id)
+    if db_game:
+        update_data = game.dict(exclude_unset=True)
+        for key, value in update_data.items():
+            setattr(db_game, key, value)
+
+        # 점수가 변경되었을 수 있으므로 결과 재계산
+        db_game.result = crud.game_result(db_game.our_score, db_game.opponent_score)
+
+        await db.commit()
+        changes.publish("game", game_id, "updated")
+    return db_game
+
+async def delete_game(db: AsyncSession, game_id: int):
+    db_game = await get_game(db, game_id)
+    if db_game:
+        await db.delete(db_game)
+        await db.commit()
+        changes.publish("game", game_id, "deleted")
+    return db_game
+
+# Stats CRUD
+async def get_stats_by_opponent(db: AsyncSession, start_date: Optional[date] = None, end_date: Optional[date] = None):
+    return await db.run_sync(crud.get_stats_by_opponent, start_date, end_date)
+
+async def get_leaderboard_stats(db: AsyncSession, start_date: Optional[date] = None, end_date: Optional[date] = None):
+    return await db.run_sync(crud.get_leaderboard_stats, start_date, end_date)
@@ -0,0 +1,104 @@
+# backend/app/changes.py
+
+import asyncio
+import logging
+import queue
+import threading
+
+logger = logging.getLogger(__name__)
+
+# 구독자별로 쌓아둘 수 있는 최대 이벤트 수 (넘치면 resync 이벤트로 대체)
+SUBSCRIBER_QUEUE_SIZE = 100
+
+class ChangeBroadcaster:
+    """crud.py의 쓰기 작업이 커밋될 때마다 변경 이벤트를 모든 구독자에게 전달합니다.
+
+    - SSE 구독자: 각자의 asyncio.Queue로 이벤트를 받습니다 (publish는 어느 스레드에서 호출해도 안전).
+    - 리스너: 서버 내부 모듈(통계 캐시 등)이 등록하는 동기 콜백으로, 요청 처리와 분리된
+      별도 스레드에서 이벤트 순서대로 실행됩니다.
+    """
+
+    def __init__(self, queue_size: int = SUBSCRIBER_QUEUE_SIZE):
+        self._lock = threading.Lock()
+        self._version = 0
+        self._queue_size = queue_size
+        self._subscribers = set()
+        self._listeners = []
+        self._listener_queue = queue.Queue()
+        self._listener_thread = None
+
+    @property
+    def version(self) -> int:
+        """데이터 버전. 쓰기가 커밋될 때마다 1씩 증가합니다."""
+        return self._version
+
+    def publish(self, entity: str, entity_id: int, action: str, **data) -> dict:
+        """변경 이벤트를 만들어 구독자와 리스너에게 전달합니다."""
+        with self._lock:
+            self._version += 1
+            event = {"version": self._version, "entity": entity, "id": entity_id, "action": action}
+            event.update(data)
+            subscribers = list(self._subscribers)
+            has_listeners = bool(self._listeners)
+
+        for loop, subscriber_queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._offer, subscriber_queue, event)
+            except RuntimeError:
+                # 이벤트 루프가 이미 종료된 구독자는 무시합니다.
+                pass
+        if has_listeners:
+            self._listener_queue.put(event)
+        return event
+
+    def _offer(self, subscriber_queue: asyncio.Queue, event: dict):
+        if subscriber_queue.full():
+            # 처리가 밀린 구독자는 밀린 이벤트를 버리고 전체 재조회를 하도록 알립니다.
+            while not subscriber_queue.empty():
+                subscriber_queue.get_nowait()
+            subscriber_queue.put_nowait({"version": event["version"], "entity": "*", "id": None, "action": "resync"})
+            return
+        subscriber_queue.put_nowait(event)
+
+    async def subscribe(self, heartbeat: float = 15.0):
+        """변경 이벤트를 비동기로 하나씩 반환합니다. heartbeat초 동안 이벤트가 없으면 None을 반환합니다."""
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue(maxsize=self._queue_size))
+        with self._lock:
+            self._subscribers.add(subscriber)
+        try:
+            while True:
+                try:
+                    yield await asyncio.wait_for(subscriber[1].get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+        finally:
+            with self._lock:
+                self._subscribers.discard(subscriber)
+
+    def add_listener(self, callback):
+        """커밋 후 실행할 동기 콜백(callback(event))을 등록합니다."""
+        with self._lock:
+            self._listeners.append(callback)
+            if self._listener_thread is None:
+                self._listener_thread = threading.Thread(target=self._run_listeners, name="change-listeners", daemon=True)
+                self._listener_thread.start()
+
+    def _run_listeners(self):
+        while True:
+            event = self._listener_queue.get()
+            for callback in list(self._listeners):
+                try:
+                    callback(event)
+                except Exception:
+                    logger.exception("변경 이벤트 리스너 실행 중 오류가 발생했습니다: %s", event)
+            self._listener_queue.task_done()
+
+    def wait_for_listeners(self):
+        """지금까지 발행된 이벤트가 모든 리스너에서 처리될 때까지 기다립니다."""
+        self._listener_queue.join()
+
+# 프로세스 전체에서 하나만 사용하는 브로드캐스터
+broadcaster = ChangeBroadcaster()
+
+def publish(entity: str, entity_id: int, action: str, **data) -> dict:
+    return broadcaster.publish(entity, entity_id, action, **data)
@@ -0,0 +1,93 @@
+# backend/app/columnar.py
+
+from datetime import date
+from typing import Optional
+
+from fastapi import HTTPException
+from fastapi.responses import Response
+from sqlalchemy.orm import Session
+
+from . import analytics, crud, fast_read
+from .export import PLAYER_STAT_COLUMNS
+
+# Arrow 형식은 pyarrow가 설치된 경우에만 지원합니다.
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+# 표 형태 응답 형식: json(행 목록, 기본값), columnar({컬럼: [값, ...]}), arrow(Arrow IPC 스트림)
+TABLE_FORMATS = ("json", "columnar", "arrow")
+
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+PLAYER_COLUMNS = ["id", "name", "position", "dominant_foot"] + PLAYER_STAT_COLUMNS
+GAME_COLUMNS = ["id", "game_date", "opponent_team", "our_score", "opponent_score", "result", "scorers", "assisters"]
+OPPONENT_STATS_COLUMNS = ["opponent_team", "wins", "losses", "draws", "total_games"]
+LEADERBOARD_COLUMNS = ["player_id", "name", "goals", "assists", "points"]
+
+def check_format(fmt: str):
+    """지원하지 않는 응답 형식이면 400 오류를 발생시킵니다."""
+    if fmt not in TABLE_FORMATS:
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 형식입니다: {fmt} (json, columnar, arrow)")
+    if fmt == "arrow" and pa is None:
+        raise HTTPException(status_code=400, detail="Arrow 형식에는 pyarrow가 필요합니다.")
+
+def to_columns(columns: list, rows) -> dict:
+    """행 튜플 목록을 {컬럼: [값, ...]} 형태로 전치합니다."""
+    if not rows:
+        return {col: [] for col in columns}
+    return {col: list(values) for col, values in zip(columns, zip(*rows))}
+
+def players_columns(db: Session, skip: int = 0, limit: int = 100) -> dict:
+    return to_columns(PLAYER_COLUMNS, crud.get_player_rows(db, PLAYER_COLUMNS, skip=skip, limit=limit))
+
+def games_columns(db: Session, skip: int = 0, limit: int = 100) -> dict:
+    """경기 목록과 경기별 득점/도움 선수 이름 목록을 컬럼 형태로 만듭니다."""
+    game_rows = crud.get_game_rows(db, skip=skip, limit=limit)
+    game_ids = [row[0] for row in game_rows]
+
+    scorers = {game_id: [] for game_id in game_ids}
+    assisters = {game_id: [] for game_id in game_ids}
+    for game_id, event_type, player_name in crud.get_event_rows(db, game_ids):
+        if event_type == "GOAL":
+            scorers[game_id].append(player_name)
+        elif event_type == "ASSIST":
+            assisters[game_id].append(player_name)
+
+    columns = to_columns(GAME_COLUMNS[:6], game_rows)
+    columns["scorers"] = [scorers[game_id] for game_id in game_ids]
+    columns["assisters"] = [assisters[game_id] for game_id in game_ids]
+    return columns
+
+def opponent_stats_columns(db: Session, start_date: Optional[date] = None, end_date: Optional[date] = None) -> dict:
+    rows = [
+        (row.opponent_team, row.wins, row.losses, row.draws, row.total_games)
+        for row in analytics.get_stats_by_opponent(db, start_date, end_date)
+    ]
+    return to_columns(OPPONENT_STATS_COLUMNS, rows)
+
+def leaderboard_columns(db: Session, start_date: Optional[date] = None, end_date: Optional[date] = None) -> dict:
+    """공격 포인트 내림차순으로 정렬된 리더보드를 컬럼 형태로 만듭니다."""
+    rows = []
+    for row in analytics.get_leaderboard_stats(db, start_date, end_date):
+        goals = row.goals or 0
+        assists = row.assists or 0
+        rows.append((row.player_id, row.name, goals, assists, goals + assists))
+    rows.sort(key=lambda r: r[4], reverse=True)
+    return to_columns(LEADERBOARD_COLUMNS, rows)
+
+def columnar_response(columns: dict, fmt: str) -> Response:
+    """컬럼 데이터를 요청한 형식(columnar JSON 또는 Arrow IPC)의 응답으로 만듭니다."""
+    if fmt == "arrow":
+        table = pa.table(columns)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return Response(content=sink.getvalue().to_pybytes(), media_type=ARROW_MEDIA_TYPE)
+
+    return json_response(columns)
+
+def json_response(payload) -> Response:
+    """datetime 값을 ISO 문자열로 바꾸어 JSON 응답을 만듭니다."""
+    return Response(content=fast_read.dumps(payload), media_type="application/json")
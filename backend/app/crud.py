@@ -1,6 +1,8 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func, case
-from . import models, schemas
+from sqlalchemy import func, case, select
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+from . import changes, models, schemas
 
 # Player CRUD
 def get_player(db: Session, player_id: int):
@@ -9,11 +11,15 @@ def get_player(db: Session, player_id: int):
 def get_players(db: Session, skip: int = 0, limit: int = 100):
     return db.query(models.Player).offset(skip).limit(limit).all()
 
+def get_players_by_ids(db: Session, player_ids: list):
+    return db.query(models.Player).filter(models.Player.id.in_(player_ids)).order_by(models.Player.id).all()
+
 def create_player(db: Session, player: schemas.PlayerCreate):
     db_player = models.Player(**player.dict())
     db.add(db_player)
     db.commit()
     db.refresh(db_player)
+    changes.publish("player", db_player.id, "created")
     return db_player
 
 def update_player(db: Session, player_id: int, player: schemas.PlayerUpdate):
@@ -24,6 +30,7 @@ def update_player(db: Session, player_id: int, player: schemas.PlayerUpdate):
             setattr(db_player, key, value)
         db.commit()
         db.refresh(db_player)
+        changes.publish("player", player_id, "updated")
     return db_player
 
 def delete_player(db: Session, player_id: int):
@@ -31,8 +38,14 @@ def delete_player(db: Session, player_id: int):
     if db_player:
         db.delete(db_player)
         db.commit()
+        changes.publish("player", player_id, "deleted")
     return db_player
 
+def get_player_rows(db: Session, columns: list, skip: int = 0, limit: int = 100):
+    """ORM 객체 대신 지정한 컬럼의 튜플 목록으로 선수 정보를 반환합니다."""
+    stmt = select(*[getattr(models.Player, col) for col in columns]).offset(skip).limit(limit)
+    return db.execute(stmt).all()
+
 # Game CRUD
 def get_games(db: Session, skip: int = 0, limit: int = 100):
     return db.query(models.Game).offset(skip).limit(limit).all()
@@ -40,13 +53,56 @@ def get_games(db: Session, skip: int = 0, limit: int = 100):
 def get_game(db: Session, game_id: int):
     return db.query(models.Game).filter(models.Game.id == game_id).first()
 
-def create_game(db: Session, game: schemas.GameCreate):
-    result = "DRAW"
-    if game.our_score > game.opponent_score:
-        result = "WIN"
-    elif game.our_score < game.opponent_score:
-        result = "LOSE"
-        
+def get_game_rows(db: Session, skip: int = 0, limit: int = 100):
+    """최신 경기 순(같은 날짜는 ID 순)으로 경기 정보를 튜플 목록으로 반환합니다.
+    get_game_event_rows와 같은 순서여야 JSON/컬럼 형식의 같은 페이지가 같은 경기를 담습니다."""
+    stmt = select(
+        models.Game.id, models.Game.game_date, models.Game.opponent_team,
+        models.Game.our_score, models.Game.opponent_score, models.Game.result
+    ).order_by(models.Game.game_date.desc(), models.Game.id).offset(skip).limit(limit)
+    return db.execute(stmt).all()
+
+def get_event_rows(db: Session, game_ids: list):
+    """주어진 경기들의 (game_id, event_type, 선수 이름) 튜플 목록을 반환합니다."""
+    if not game_ids:
+        return []
+    stmt = select(models.GameEvent.game_id, models.GameEvent.event_type, models.Player.name)\
+        .join(models.Player, models.GameEvent.player_id == models.Player.id)\
+        .where(models.GameEvent.game_id.in_(game_ids))\
+        .order_by(models.GameEvent.id)
+    return db.execute(stmt).all()
+
+def get_game_event_rows(db: Session, skip: int = 0, limit: int = 100):
+    """최신 경기 순으로 한 페이지의 경기 튜플 목록과, 그 경기들의 이벤트(선수 포함) 튜플 목록을 반환합니다.
+
+    이벤트 행은 (game_id, event_id, event_type, player_id, player_name)이며 경기 ID, 이벤트 ID 순으로 정렬됩니다.
+    """
+    page = select(
+        models.Game.id, models.Game.game_date, models.Game.opponent_team,
+        models.Game.our_score, models.Game.opponent_score, models.Game.result
+    ).order_by(models.Game.game_date.desc(), models.Game.id).offset(skip).limit(limit)
+    games = db.execute(page).all()
+
+    page_ids = page.with_only_columns(models.Game.id).subquery()
+    events = select(models.GameEvent.game_id, models.GameEvent.id, models.GameEvent.event_type,
+                    models.Player.id, models.Player.name)\
+        .join(page_ids, models.GameEvent.game_id == page_ids.c.id)\
+        .join(models.Player, models.GameEvent.player_id == models.Player.id)\
+        .order_by(models.GameEvent.game_id, models.GameEvent.id)
+    return games, db.execute(events).all()
+
+def game_result(our_score: int, opponent_score: int) -> str:
+    """점수로 경기 결과("WIN", "LOSE", "DRAW")를 계산합니다."""
+    if our_score > opponent_score:
+        return "WIN"
+    if our_score < opponent_score:
+        return "LOSE"
+    return "DRAW"
+
+def add_game(db: Session, game: schemas.GameCreate):
+    """경기와 득점/도움 이벤트를 세션에 추가합니다. 커밋과 변경 알림은 호출한 쪽에서 합니다."""
+    result = game_result(game.our_score, game.opponent_score)
+
     # game.dict()에서 scorers와 assisters를 제외하고 Game 객체 생성
     game_data = game.dict(exclude={"scorers", "assisters"})
     db_game = models.Game(**game_data, result=result)
@@ -60,9 +116,13 @@ def create_game(db: Session, game: schemas.GameCreate):
     # 도움(ASSIST) 이벤트 생성
     for player_id in game.assisters:
         db.add(models.GameEvent(game_id=db_game.id, player_id=player_id, event_type="ASSIST"))
+    return db_game
 
+def create_game(db: Session, game: schemas.GameCreate):
+    db_game = add_game(db, game)
     db.commit()
     db.refresh(db_game)
+    changes.publish("game", db_game.id, "created")
     return db_game
 
 def update_game(db: Session, game_id: int, game: schemas.GameUpdate):
@@ -73,15 +133,11 @@ def update_game(db: Session, game_id: int, game: schemas.GameUpdate):
             setattr(db_game, key, value)
         
         # 점수가 변경되었을 수 있으므로 결과 재계산
-        if db_game.our_score > db_game.opponent_score:
-            db_game.result = "WIN"
-        elif db_game.our_score < db_game.opponent_score:
-            db_game.result = "LOSE"
-        else:
-            db_game.result = "DRAW"
-            
+        db_game.result = game_result(db_game.our_score, db_game.opponent_score)
+
         db.commit()
         db.refresh(db_game)
+        changes.publish("game", game_id, "updated")
     return db_game
 
 def delete_game(db: Session, game_id: int):
@@ -89,30 +145,97 @@ def delete_game(db: Session, game_id: int):
     if db_game:
         db.delete(db_game)
         db.commit()
+        changes.publish("game", game_id, "deleted")
     return db_game
 
 # Stats CRUD
-def get_stats_by_opponent(db: Session):
+def filter_by_game_date(query, start_date: Optional[date] = None, end_date: Optional[date] = None):
+    """경기 날짜가 start_date ~ end_date(양 끝 포함) 범위인 경기만 남깁니다."""
+    if start_date:
+        query = query.filter(models.Game.game_date >= datetime.combine(start_date, time.min))
+    if end_date:
+        query = query.filter(models.Game.game_date < datetime.combine(end_date + timedelta(days=1), time.min))
+    return query
+
+def get_stats_by_opponent(db: Session, start_date: Optional[date] = None, end_date: Optional[date] = None):
     stats = db.query(
         models.Game.opponent_team,
         func.count(models.Game.id).label("total_games"),
         func.sum(case((models.Game.result == 'WIN', 1), else_=0)).label("wins"),
         func.sum(case((models.Game.result == 'LOSE', 1), else_=0)).label("losses"),
         func.sum(case((models.Game.result == 'DRAW', 1), else_=0)).label("draws")
-    ).group_by(models.Game.opponent_team).all()
+    )
+    stats = filter_by_game_date(stats, start_date, end_date)
     
-    return stats
+    return stats.group_by(models.Game.opponent_team).all()
 
 # --- 추가된 부분 ---
-def get_leaderboard_stats(db: Session):
+def get_leaderboard_stats(db: Session, start_date: Optional[date] = None, end_date: Optional[date] = None):
     """선수별 득점, 도움, 공격 포인트를 집계하여 반환합니다."""
+    events = models.GameEvent.__table__
+    if start_date or end_date:
+        # 기간 내 경기의 이벤트만 집계하되, 기록이 없는 선수도 0으로 포함되도록 outer join 합니다.
+        events = select(models.GameEvent.player_id, models.GameEvent.event_type)\
+            .join(models.Game, models.GameEvent.game_id == models.Game.id)
+        events = filter_by_game_date(events, start_date, end_date).subquery()
+
     stats = db.query(
         models.Player.id.label("player_id"),
         models.Player.name,
-        func.sum(case((models.GameEvent.event_type == 'GOAL', 1), else_=0)).label("goals"),
-        func.sum(case((models.GameEvent.event_type == 'ASSIST', 1), else_=0)).label("assists")
-    ).outerjoin(models.GameEvent, models.Player.id == models.GameEvent.player_id)\
+        func.sum(case((events.c.event_type == 'GOAL', 1), else_=0)).label("goals"),
+        func.sum(case((events.c.event_type == 'ASSIST', 1), else_=0)).label("assists")
+    ).outerjoin(events, models.Player.id == events.c.player_id)\
      .group_by(models.Player.id, models.Player.name)\
      .all()
     
     return stats
+
+# Upcoming match CRUD
+def get_upcoming_matches(db: Session, after: Optional[datetime] = None):
+    """after 이후(기본값: 지금)에 예정된 경기를 날짜순으로 반환합니다."""
+    after = after or datetime.now()
+    return db.query(models.UpcomingMatch).filter(models.UpcomingMatch.match_date >= after)\
+        .order_by(models.UpcomingMatch.match_date).all()
+
+def create_upcoming_match(db: Session, match: schemas.UpcomingMatchCreate):
+    db_match = models.UpcomingMatch(**match.dict())
+    db.add(db_match)
+    db.commit()
+    db.refresh(db_match)
+    return db_match
+
+def delete_upcoming_match(db: Session, match_id: int):
+    db_match = db.query(models.UpcomingMatch).filter(models.UpcomingMatch.id == match_id).first()
+    if db_match:
+        db.delete(db_match)
+        db.commit()
+    return db_match
+
+# AI report CRUD
+def get_ai_report(db: Session, kind: str, target_key: str):
+    return db.query(models.AIReport)\
+        .filter(models.AIReport.kind == kind, models.AIReport.target_key == target_key).first()
+
+def get_ai_reports(db: Session, kind: str, target_keys: list):
+    if not target_keys:
+        return []
+    return db.query(models.AIReport)\
+        .filter(models.AIReport.kind == kind, models.AIReport.target_key.in_(target_keys)).all()
+
+def add_ai_report(db: Session, kind: str, target_key: str, report: str, input_hash: str):
+    """분석 결과를 (kind, target_key)당 하나씩 세션에 추가합니다. 이미 있으면 덮어씁니다. 커밋은 호출한 쪽에서 합니다."""
+    db_report = get_ai_report(db, kind, target_key)
+    if db_report is None:
+        db_report = models.AIReport(kind=kind, target_key=target_key)
+        db.add(db_report)
+    db_report.report = report
+    db_report.input_hash = input_hash
+    db_report.created_at = datetime.now()
+    return db_report
+
+def save_ai_report(db: Session, kind: str, target_key: str, report: str, input_hash: str):
+    """분석 결과를 (kind, target_key)당 하나씩 저장합니다. 이미 있으면 덮어씁니다."""
+    db_report = add_ai_report(db, kind, target_key, report, input_hash)
+    db.commit()
+    db.refresh(db_report)
+    return db_report
@@ -0,0 +1,32 @@
+# backend/app/dashboard.py
+
+from sqlalchemy.orm import Session
+
+from . import columnar, crud
+
+ROSTER_COLUMNS = ["id", "name"]
+
+def roster_columns(db: Session) -> dict:
+    """선택 상자에 쓰이는 선수 ID/이름 목록입니다."""
+    return columnar.to_columns(ROSTER_COLUMNS, crud.get_player_rows(db, ROSTER_COLUMNS))
+
+# 섹션 이름별 데이터 생성 함수 (모두 columnar 형태를 반환합니다)
+SECTION_BUILDERS = {
+    "players": columnar.players_columns,
+    "roster": roster_columns,
+    "games": columnar.games_columns,
+    "opponent_stats": columnar.opponent_stats_columns,
+    "leaderboard": columnar.leaderboard_columns,
+}
+
+# 프론트엔드 페이지별로 한 번에 내려줄 섹션 목록
+DASHBOARD_PAGES = {
+    "players": ["players"],
+    "games": ["roster", "games"],
+    "analysis": ["opponent_stats"],
+    "leaderboard": ["leaderboard"],
+}
+
+def build_dashboard(db: Session, page: str) -> dict:
+    """하나의 DB 세션에서 페이지에 필요한 모든 섹션을 조회하여 묶어서 반환합니다."""
+    return {section: SECTION_BUILDERS[section](db) for section in DASHBOARD_PAGES[page]}
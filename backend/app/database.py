@@ -1,12 +1,39 @@
+import os
+
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./oracle_ai_manager.db"
+# 서버 DB를 쓸 때는 DATABASE_URL 환경 변수로 지정합니다. (예: postgresql://user:pw@host/db)
+SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./oracle_ai_manager.db")
+
+# 비동기 드라이버 (SQLite는 aiosqlite, PostgreSQL은 asyncpg)
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+def to_async_url(url: str) -> str:
+    """동기 DB URL을 같은 DB를 가리키는 비동기 드라이버 URL로 바꿉니다."""
+    scheme, sep, rest = url.partition("://")
+    dialect = scheme.split("+")[0]
+    if dialect not in ASYNC_DRIVERS:
+        raise ValueError(f"비동기 드라이버를 지원하지 않는 DB입니다: {dialect}")
+    return ASYNC_DRIVERS[dialect] + sep + rest
+
+connect_args = {"check_same_thread": False} if SQLALCHEMY_DATABASE_URL.startswith("sqlite") else {}
 
 engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+    SQLALCHEMY_DATABASE_URL, connect_args=connect_args
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# async def 엔드포인트용 엔진과 세션
+# 커밋 후에도 객체 속성을 응답에 쓸 수 있도록 expire_on_commit=False로 둡니다.
+async_engine = create_async_engine(to_async_url(SQLALCHEMY_DATABASE_URL))
+AsyncSessionLocal = sessionmaker(
+    async_engine, class_=AsyncSession, autocommit=False, autoflush=False, expire_on_commit=False
+)
+
 Base = declarative_base()
@@ -0,0 +1,183 @@
+# backend/app/export.py
+
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import Iterator, Optional
+
+from sqlalchemy import select
+
+from . import crud, models
+from .database import SessionLocal
+
+# Parquet 내보내기는 pyarrow가 설치된 경우에만 지원합니다.
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+PARQUET_AVAILABLE = pa is not None
+
+# 서버 측 커서에서 한 번에 가져올 행 수 (메모리 사용량의 상한)
+EXPORT_CHUNK_SIZE = 1000
+
+EXPORT_FORMATS = ("csv", "jsonl", "parquet")
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "jsonl": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+PLAYER_STAT_COLUMNS = [
+    "stamina", "speed", "shooting_accuracy", "dribbling", "passing",
+    "finishing", "crossing", "vision", "interceptions",
+    "tackling", "heading", "saving", "defense_coordination", "catching",
+]
+
+# 데이터셋별 컬럼 정의 (이름, Arrow 타입 이름)
+EXPORT_DATASETS = {
+    "games": [
+        ("id", "int"), ("game_date", "datetime"), ("opponent_team", "str"),
+        ("our_score", "int"), ("opponent_score", "int"), ("result", "str"),
+    ],
+    "events": [
+        ("id", "int"), ("game_id", "int"), ("game_date", "datetime"),
+        ("opponent_team", "str"), ("player_id", "int"), ("player_name", "str"),
+        ("event_type", "str"),
+    ],
+    "players": [
+        ("id", "int"), ("name", "str"), ("position", "str"), ("dominant_foot", "str"),
+    ] + [(col, "int") for col in PLAYER_STAT_COLUMNS],
+}
+
+def _filter_games(stmt, start_date: Optional[date], end_date: Optional[date], opponent: Optional[str]):
+    """경기 날짜 범위(양 끝 포함)와 상대 팀으로 쿼리를 필터링합니다."""
+    stmt = crud.filter_by_game_date(stmt, start_date, end_date)
+    if opponent:
+        stmt = stmt.where(models.Game.opponent_team == opponent)
+    return stmt
+
+def _build_query(dataset: str, start_date: Optional[date], end_date: Optional[date], opponent: Optional[str]):
+    """ORM 객체를 만들지 않도록 필요한 컬럼만 선택하는 쿼리를 생성합니다."""
+    if dataset == "games":
+        stmt = select(
+            models.Game.id, models.Game.game_date, models.Game.opponent_team,
+            models.Game.our_score, models.Game.opponent_score, models.Game.result,
+        )
+        return _filter_games(stmt, start_date, end_date, opponent).order_by(models.Game.id)
+
+    if dataset == "events":
+        # 중첩된 events를 경기 정보와 함께 평탄화하여 한 행으로 만듭니다.
+        stmt = select(
+            models.GameEvent.id, models.GameEvent.game_id, models.Game.game_date,
+            models.Game.opponent_team, models.GameEvent.player_id,
+            models.Player.name, models.GameEvent.event_type,
+        ).join(models.Game, models.GameEvent.game_id == models.Game.id)\
+         .outerjoin(models.Player, models.GameEvent.player_id == models.Player.id)
+        return _filter_games(stmt, start_date, end_date, opponent).order_by(models.GameEvent.id)
+
+    # 선수 데이터에는 날짜/상대 팀 필터가 적용되지 않습니다.
+    columns = [getattr(models.Player, name) for name, _ in EXPORT_DATASETS["players"]]
+    return select(*columns).order_by(models.Player.id)
+
+def iter_row_chunks(dataset: str, start_date: Optional[date] = None, end_date: Optional[date] = None,
+                    opponent: Optional[str] = None, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[list]:
+    """서버 측 커서로 결과를 chunk_size 행씩 나누어 반환합니다."""
+    stmt = _build_query(dataset, start_date, end_date, opponent)
+    # 스트리밍 응답은 요청 의존성보다 오래 살아있으므로 세션을 직접 관리합니다.
+    db = SessionLocal()
+    try:
+        result = db.execute(stmt.execution_options(stream_results=True, yield_per=chunk_size))
+        for partition in result.partitions(chunk_size):
+            yield [tuple(row) for row in partition]
+    finally:
+        db.close()
+
+def _to_text(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+def _iter_csv(columns: list, chunks: Iterator[list]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue()
+    for rows in chunks:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([[_to_text(v) for v in row] for row in rows])
+        yield buffer.getvalue()
+
+def _iter_jsonl(columns: list, chunks: Iterator[list]) -> Iterator[str]:
+    for rows in chunks:
+        yield "".join(
+            json.dumps(dict(zip(columns, [_to_text(v) for v in row])), ensure_ascii=False) + "\n"
+            for row in rows
+        )
+
+class _ChunkSink(io.RawIOBase):
+    """ParquetWriter가 쓴 바이트를 모아 두었다가 조금씩 내보내는 파일 객체입니다."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+def _arrow_schema(dataset: str):
+    arrow_types = {"int": pa.int64(), "str": pa.string(), "datetime": pa.timestamp("us")}
+    return pa.schema([(name, arrow_types[kind]) for name, kind in EXPORT_DATASETS[dataset]])
+
+def _iter_parquet(dataset: str, chunks: Iterator[list]) -> Iterator[bytes]:
+    """각 chunk를 하나의 row group으로 기록하고, 기록된 바이트를 바로 내보냅니다."""
+    schema = _arrow_schema(dataset)
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        for rows in chunks:
+            arrays = [pa.array(list(values), type=field.type) for field, values in zip(schema, zip(*rows))]
+            writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    yield sink.drain()
+
+def stream_export(dataset: str, fmt: str, start_date: Optional[date] = None, end_date: Optional[date] = None,
+                  opponent: Optional[str] = None) -> Iterator:
+    """데이터셋을 지정한 형식으로 직렬화하여 조각(chunk) 단위로 반환합니다."""
+    if dataset not in EXPORT_DATASETS:
+        raise ValueError(f"지원하지 않는 데이터셋입니다: {dataset}")
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"지원하지 않는 형식입니다: {fmt}")
+    if fmt == "parquet" and not PARQUET_AVAILABLE:
+        raise ValueError("Parquet 내보내기에는 pyarrow가 필요합니다.")
+
+    columns = [name for name, _ in EXPORT_DATASETS[dataset]]
+    chunks = iter_row_chunks(dataset, start_date, end_date, opponent)
+    if fmt == "csv":
+        return _iter_csv(columns, chunks)
+    if fmt == "jsonl":
+        return _iter_jsonl(columns, chunks)
+    return _iter_parquet(dataset, chunks)
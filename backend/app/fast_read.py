@@ -0,0 +1,105 @@
+# backend/app/fast_read.py
+
+import gzip
+import json
+from datetime import datetime
+
+from fastapi.responses import Response
+from sqlalchemy.orm import Session
+
+from . import crud
+from .export import PLAYER_STAT_COLUMNS
+
+# orjson, brotli는 설치된 경우에만 사용합니다. (없으면 표준 json, gzip으로 대체)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# 이보다 작은 응답은 압축하지 않습니다.
+COMPRESSION_MIN_SIZE = 1024
+GZIP_LEVEL = 5
+BROTLI_QUALITY = 4
+
+# schemas.Player와 같은 필드 순서
+PLAYER_FIELDS = ["name", "position", "dominant_foot"] + PLAYER_STAT_COLUMNS + ["id"]
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} 타입은 JSON으로 변환할 수 없습니다.")
+
+def dumps(payload) -> bytes:
+    """payload를 JSON 바이트로 직렬화합니다. datetime은 ISO 형식 문자열이 됩니다."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, default=_json_default, ensure_ascii=False).encode("utf-8")
+
+def players_payload(db: Session, skip: int = 0, limit: int = 100) -> list:
+    """ORM 객체 없이 /players/ 응답 목록을 만듭니다."""
+    rows = crud.get_player_rows(db, PLAYER_FIELDS, skip=skip, limit=limit)
+    return [dict(zip(PLAYER_FIELDS, row)) for row in rows]
+
+def games_payload(db: Session, skip: int = 0, limit: int = 100) -> list:
+    """경기 행과 평탄한 이벤트 행을 한 번씩 훑으면서 경기별 events를 묶어 /games/ 응답 목록을 만듭니다."""
+    game_rows, event_rows = crud.get_game_event_rows(db, skip=skip, limit=limit)
+    games = []
+    events_by_game = {}
+    for game_id, game_date, opponent_team, our_score, opponent_score, result in game_rows:
+        events = events_by_game[game_id] = []
+        games.append({
+            "opponent_team": opponent_team, "game_date": game_date,
+            "our_score": our_score, "opponent_score": opponent_score,
+            "id": game_id, "result": result, "events": events,
+        })
+    for game_id, event_id, event_type, player_id, player_name in event_rows:
+        events_by_game[game_id].append({
+            "id": event_id, "game_id": game_id, "event_type": event_type,
+            "player": {"id": player_id, "name": player_name},
+        })
+    return games
+
+def _accepted_encodings(accept_encoding: str) -> dict:
+    """Accept-Encoding 헤더를 {인코딩: q값} 으로 해석합니다."""
+    encodings = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        encodings[name.strip().lower()] = q
+    return encodings
+
+def negotiate_encoding(accept_encoding: str):
+    """클라이언트가 받을 수 있는 압축 방식 중 br, gzip 순으로 선택합니다. 없으면 None."""
+    encodings = _accepted_encodings(accept_encoding or "")
+    wildcard = encodings.get("*", 0)
+    if brotli is not None and encodings.get("br", wildcard) > 0:
+        return "br"
+    if encodings.get("gzip", wildcard) > 0:
+        return "gzip"
+    return None
+
+def json_response(payload, accept_encoding: str = "") -> Response:
+    """payload를 빠르게 직렬화하고, 응답이 크면 협상된 방식으로 압축하여 반환합니다."""
+    body = dumps(payload)
+    headers = {"Vary": "Accept-Encoding"}
+    encoding = negotiate_encoding(accept_encoding) if len(body) >= COMPRESSION_MIN_SIZE else None
+    if encoding == "br":
+        body = brotli.compress(body, quality=BROTLI_QUALITY)
+    elif encoding == "gzip":
+        body = gzip.compress(body, compresslevel=GZIP_LEVEL)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,353 @@
+# backend/app/live.py
+
+import logging
+import threading
+import uuid
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
+
+from . import changes, crud, models, schemas
+from .database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+LIVE_EVENT_TYPES = {"GOAL", "ASSIST", "OPP_GOAL", "YELLOW_CARD", "RED_CARD", "SUB_IN", "SUB_OUT"}
+# 선수 없이 기록할 수 있는 이벤트 (GOAL은 득점자를 모를 때도 점수에 반영합니다)
+PLAYERLESS_EVENT_TYPES = {"OPP_GOAL", "GOAL"}
+
+# 버퍼에 쌓인 이벤트를 DB에 묶어서 기록하는 주기(초)와, 즉시 기록을 시작하는 버퍼 크기
+FLUSH_INTERVAL = 0.5
+FLUSH_BATCH_SIZE = 500
+
+class LiveMatch:
+    """진행 중인 경기 하나의 점수, 선수별 기록, 아직 DB에 쓰지 않은 이벤트 버퍼를 메모리에 보관합니다."""
+
+    def __init__(self, match_id: str, opponent_team: str, game_date: datetime):
+        self.match_id = match_id
+        self.opponent_team = opponent_team
+        self.game_date = game_date
+        self.our_score = 0
+        self.opponent_score = 0
+        self.event_count = 0
+        self.tallies = defaultdict(Counter)
+        self.pending = []
+        self.closed = False
+        self.lock = threading.Lock()
+
+    def apply(self, event_type: str, player_id: Optional[int]):
+        """점수와 선수별 기록을 갱신합니다. (lock을 잡은 상태에서 호출)"""
+        if event_type == "GOAL":
+            self.our_score += 1
+        elif event_type == "OPP_GOAL":
+            self.opponent_score += 1
+        if player_id is not None:
+            self.tallies[player_id][event_type] += 1
+        self.event_count += 1
+
+    def unapply(self, event_type: str, player_id: Optional[int]):
+        """apply를 되돌립니다. DB에 기록할 수 없어 버리는 이벤트용 (lock을 잡은 상태에서 호출)"""
+        if event_type == "GOAL":
+            self.our_score -= 1
+        elif event_type == "OPP_GOAL":
+            self.opponent_score -= 1
+        if player_id is not None:
+            self.tallies[player_id][event_type] -= 1
+            if not +self.tallies[player_id]:
+                del self.tallies[player_id]
+        self.event_count -= 1
+
+    def record(self, events: list) -> Optional[int]:
+        """이벤트들을 점수판에 반영하고 버퍼에 추가한 뒤, 버퍼 길이를 반환합니다. 종료된 경기면 None."""
+        now = datetime.now()
+        with self.lock:
+            if self.closed:
+                return None
+            for event in events:
+                self.apply(event.event_type, event.player_id)
+                self.pending.append({
+                    "match_id": self.match_id, "player_id": event.player_id,
+                    "event_type": event.event_type, "minute": event.minute, "recorded_at": now,
+                })
+            return len(self.pending)
+
+    def take_pending(self) -> list:
+        with self.lock:
+            pending, self.pending = self.pending, []
+        return pending
+
+    def restore_pending(self, rows: list):
+        """DB 기록에 실패한 이벤트를 버퍼 앞쪽에 되돌려 놓습니다."""
+        with self.lock:
+            self.pending[:0] = rows
+
+    def discard(self, row: dict):
+        """DB 제약 조건을 어겨 기록할 수 없는 이벤트를 점수판에서도 뺍니다."""
+        with self.lock:
+            self.unapply(row["event_type"], row["player_id"])
+
+    def scoreboard(self) -> schemas.LiveScoreboard:
+        with self.lock:
+            players = {player_id: dict(counts) for player_id, counts in self.tallies.items()}
+            return schemas.LiveScoreboard(
+                match_id=self.match_id, opponent_team=self.opponent_team, game_date=self.game_date,
+                our_score=self.our_score, opponent_score=self.opponent_score,
+                event_count=self.event_count, players=players,
+            )
+
+    def to_game(self) -> schemas.GameCreate:
+        """최종 기록을 일반 경기(Game) 생성 요청으로 변환합니다."""
+        with self.lock:
+            scorers = [pid for pid, counts in self.tallies.items() for _ in range(counts["GOAL"])]
+            assisters = [pid for pid, counts in self.tallies.items() for _ in range(counts["ASSIST"])]
+            return schemas.GameCreate(
+                opponent_team=self.opponent_team, game_date=self.game_date,
+                our_score=self.our_score, opponent_score=self.opponent_score,
+                scorers=scorers, assisters=assisters,
+            )
+
+class LiveMatchManager:
+    """진행 중인 경기들을 관리하고, 백그라운드 스레드에서 이벤트를 묶어서(group commit) 기록합니다."""
+
+    def __init__(self, session_factory=SessionLocal):
+        self._session_factory = session_factory
+        self._matches = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._roster = set() # 존재를 확인한 선수 ID (이벤트 검증용)
+
+    def start(self):
+        """DB에 남아 있는 진행 중 경기를 복구하고 기록 스레드를 시작합니다."""
+        changes.broadcaster.add_listener(self.on_change)
+        self._recover()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="live-match-flusher", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _recover(self):
+        """서버 재시작 시 이미 기록된 이벤트를 다시 적용하여 점수판을 복원합니다."""
+        db = self._session_factory()
+        try:
+            for match in db.query(models.LiveMatch).filter(models.LiveMatch.status == "LIVE").all():
+                live_match = LiveMatch(match.id, match.opponent_team, match.game_date)
+                rows = db.query(models.LiveMatchEvent.event_type, models.LiveMatchEvent.player_id)\
+                    .filter(models.LiveMatchEvent.match_id == match.id)\
+                    .order_by(models.LiveMatchEvent.id).all()
+                for event_type, player_id in rows:
+                    live_match.apply(event_type, player_id)
+                with self._lock:
+                    self._matches.setdefault(match.id, live_match)
+        finally:
+            db.close()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wakeup.wait(FLUSH_INTERVAL)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("실시간 경기 이벤트 기록 중 오류가 발생했습니다.")
+
+    def open_match(self, match: schemas.LiveMatchCreate) -> LiveMatch:
+        live_match = LiveMatch(uuid.uuid4().hex, match.opponent_team, match.game_date or datetime.now())
+        db = self._session_factory()
+        try:
+            db.add(models.LiveMatch(id=live_match.match_id, opponent_team=live_match.opponent_team,
+                                    game_date=live_match.game_date, status="LIVE"))
+            db.commit()
+        finally:
+            db.close()
+        with self._lock:
+            self._matches[live_match.match_id] = live_match
+        return live_match
+
+    def get(self, match_id: str) -> Optional[LiveMatch]:
+        return self._matches.get(match_id)
+
+    def list_matches(self) -> list:
+        with self._lock:
+            return list(self._matches.values())
+
+    def on_change(self, event: dict):
+        """changes.py 리스너: 삭제된 선수는 다시 DB에서 확인하도록 명단에서 뺍니다."""
+        if event["entity"] == "player" and event["action"] == "deleted":
+            with self._lock:
+                self._roster.discard(event["id"])
+
+    def _check_players(self, player_ids: set):
+        """등록되지 않은 선수 ID가 있으면 ValueError. 처음 보는 ID만 DB에서 확인합니다."""
+        with self._lock:
+            unknown = player_ids - self._roster
+        if not unknown:
+            return
+        db = self._session_factory()
+        try:
+            found = set(db.execute(select(models.Player.id).where(models.Player.id.in_(unknown))).scalars())
+        finally:
+            db.close()
+        with self._lock:
+            self._roster |= found
+        missing = sorted(unknown - found)
+        if missing:
+            raise ValueError(f"등록되지 않은 선수입니다: {missing}")
+
+    def record_events(self, match_id: str, events: list) -> Optional[LiveMatch]:
+        """이벤트를 메모리 버퍼에 추가합니다. DB 기록은 백그라운드에서 묶어서 처리됩니다."""
+        for event in events:
+            if event.event_type not in LIVE_EVENT_TYPES:
+                raise ValueError(f"지원하지 않는 이벤트입니다: {event.event_type}")
+            if event.player_id is None and event.event_type not in PLAYERLESS_EVENT_TYPES:
+                raise ValueError(f"{event.event_type} 이벤트에는 player_id가 필요합니다.")
+        self._check_players({event.player_id for event in events if event.player_id is not None})
+
+        live_match = self.get(match_id)
+        if live_match is None:
+            return None
+        pending_count = live_match.record(events)
+        if pending_count is None:
+            return None
+        if pending_count >= FLUSH_BATCH_SIZE:
+            self._wakeup.set()
+        return live_match
+
+    def _insert_events(self, rows: list):
+        db = self._session_factory()
+        try:
+            db.execute(insert(models.LiveMatchEvent), rows)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _insert_match_events(self, live_match: LiveMatch, rows: list) -> int:
+        """경기 하나의 이벤트를 기록합니다. 제약 조건을 어기는 행(삭제된 선수 등)이 있으면 한 행씩 다시 기록하고
+        그 행만 버려, 잘못된 이벤트 하나가 버퍼 전체를 계속 막지 않게 합니다. 그 밖의 오류는 남은 행을 되돌려 놓고 발생시킵니다."""
+        try:
+            self._insert_events(rows)
+            return len(rows)
+        except IntegrityError:
+            pass
+        except Exception:
+            live_match.restore_pending(rows)
+            raise
+        written = 0
+        for index, row in enumerate(rows):
+            try:
+                self._insert_events([row])
+                written += 1
+            except IntegrityError:
+                logger.warning("기록할 수 없는 실시간 경기 이벤트를 버립니다: %s", row)
+                live_match.discard(row)
+            except Exception:
+                live_match.restore_pending(rows[index:])
+                raise
+        return written
+
+    def flush(self):
+        """모든 경기의 버퍼를 모아 한 번의 INSERT와 커밋으로 기록합니다.
+        실패하면 경기별로 나눠 다시 기록해, 한 경기의 잘못된 이벤트가 다른 경기의 기록을 막지 않게 합니다."""
+        with self._flush_lock:
+            batches = [(live_match, live_match.take_pending()) for live_match in self.list_matches()]
+            batches = [(live_match, pending) for live_match, pending in batches if pending]
+            rows = [row for _, pending in batches for row in pending]
+            if not rows:
+                return 0
+            try:
+                self._insert_events(rows)
+                return len(rows)
+            except IntegrityError:
+                logger.warning("실시간 경기 이벤트 묶음 기록에 실패해 경기별로 나눠 기록합니다.")
+            except Exception:
+                for live_match, pending in batches:
+                    live_match.restore_pending(pending)
+                raise
+
+            written = 0
+            for index, (live_match, pending) in enumerate(batches):
+                try:
+                    written += self._insert_match_events(live_match, pending)
+                except Exception:
+                    for later_match, later_pending in batches[index + 1:]:
+                        later_match.restore_pending(later_pending)
+                    raise
+            return written
+
+    def close_match(self, match_id: str) -> Optional[models.Game]:
+        """경기를 종료하고 최종 기록을 일반 경기(Game)로 저장합니다.
+
+        Game 생성과 LiveMatch 상태 변경은 한 번의 커밋으로 처리하므로, 실패해서 다시 시도해도 경기가 두 번 생기지 않습니다.
+        """
+        with self._lock:
+            live_match = self._matches.pop(match_id, None)
+        if live_match is None:
+            return None
+        with live_match.lock:
+            live_match.closed = True
+
+        try:
+            # 남은 이벤트를 먼저 기록합니다. (이 경기는 이미 목록에서 빠졌으므로 직접 처리)
+            with self._flush_lock:
+                rows = live_match.take_pending()
+                if rows:
+                    self._insert_match_events(live_match, rows)
+            game_id = self._save_game(match_id, live_match)
+        except Exception:
+            with live_match.lock:
+                live_match.closed = False
+            with self._lock:
+                self._matches[match_id] = live_match
+            raise
+
+        db = self._session_factory()
+        try:
+            # 세션을 닫은 뒤에도 응답 직렬화에 쓸 수 있도록 events와 선수를 함께 불러옵니다.
+            return db.query(models.Game)\
+                .options(selectinload(models.Game.events).joinedload(models.GameEvent.player))\
+                .filter(models.Game.id == game_id).one()
+        finally:
+            db.close()
+
+    def _save_game(self, match_id: str, live_match: LiveMatch) -> int:
+        """최종 기록으로 Game을 만들고 LiveMatch를 CLOSED로 바꾼 뒤 커밋합니다. 저장된 경기 ID를 반환합니다.
+        다른 요청이 이미 종료했으면 새 경기를 만들지 않고 그 경기 ID를 반환합니다."""
+        db = self._session_factory()
+        try:
+            db_game = crud.add_game(db, live_match.to_game())
+            closed = db.execute(
+                update(models.LiveMatch)
+                .where(models.LiveMatch.id == match_id, models.LiveMatch.status == "LIVE")
+                .values(status="CLOSED", game_id=db_game.id)
+            )
+            if closed.rowcount != 1:
+                db.rollback()
+                return db.execute(select(models.LiveMatch.game_id).where(models.LiveMatch.id == match_id)).scalar_one()
+            db.commit()
+            game_id = db_game.id
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+        changes.publish("game", game_id, "created")
+        return game_id
+
+# 프로세스 전체에서 하나만 사용하는 관리자
+manager = LiveMatchManager()
@@ -8,14 +8,26 @@ from fastapi.middleware.cors import CORSMiddleware
 dotenv_path = os.path.join(os.path.dirname(__file__), '..', '.env')
 load_dotenv(dotenv_path=dotenv_path)
 
-from fastapi import FastAPI, Depends, HTTPException
+import json
+import time
+from fastapi import FastAPI, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
-from . import crud, models, schemas, services
-from .database import SessionLocal, engine
+from datetime import date
+from typing import List, Optional
+from . import (
+    admission, ai_reports, analytics, async_crud, changes, columnar, crud, dashboard, export, fast_read, live,
+    migrations, precompute, prompts, ratings, schemas, services, simulation, squad_analysis, tracing,
+)
+from .database import AsyncSessionLocal, SessionLocal, async_engine, engine
+
+# DB 스키마를 최신 버전으로 맞춥니다. (app/migrations.py)
+migrations.upgrade(engine)
 
-# DB 테이블 생성
-models.Base.metadata.create_all(bind=engine)
+# 샘플링된 요청에서 실행되는 SQL 문마다 span을 기록합니다. (app/tracing.py)
+tracing.instrument_engine(engine)
+tracing.instrument_engine(async_engine.sync_engine)
 
 # ⭐️⭐️ Streamlit Cloud CORS 허용 목록 ⭐️⭐️
 # 이 목록에 Streamlit 앱의 실제 도메인을 포함해야 합니다.
@@ -40,6 +52,28 @@ app.add_middleware(
 
 app = FastAPI(title="Oracle AI Manager & Coach API")
 
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    """요청마다 루트 span을 만들고, 프론트엔드가 보낸 traceparent를 이어받습니다.
+
+    응답에는 이 요청의 traceparent와 서버 처리 시간(Server-Timing)을 넣어, 클라이언트가
+    네트워크 구간과 서버 구간을 나눠 볼 수 있게 합니다.
+    """
+    started = time.perf_counter()
+    with tracing.tracer.trace(
+        f"{request.method} {request.url.path}", request.headers.get("traceparent"),
+        **{"http.request.method": request.method, "url.path": request.url.path},
+    ) as span:
+        response = await call_next(request)
+        route = request.scope.get("route")
+        if span.sampled and route is not None:
+            span.name = f"{request.method} {route.path}"
+            span.set_attribute("http.route", route.path)
+        span.set_attribute("http.response.status_code", response.status_code)
+    response.headers["traceparent"] = span.traceparent
+    response.headers["Server-Timing"] = f"app;dur={(time.perf_counter() - started) * 1000:.1f}"
+    return response
+
 # DB 세션 의존성 주입
 def get_db():
     db = SessionLocal()
@@ -48,75 +82,153 @@ def get_db():
     finally:
         db.close()
 
+# async def 엔드포인트용 비동기 DB 세션 의존성 주입
+# DB를 기다리는 동안 스레드풀 슬롯을 점유하지 않으므로 동시 요청 수가 풀 크기에 묶이지 않습니다.
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+@app.on_event("startup")
+def start_background_workers():
+    live.manager.start()
+    analytics.engine.start()
+    ratings.engine.start()
+    simulation.simulator.start()
+    precompute.scheduler.start(services.generate_text_from_gemini)
+
+@app.on_event("shutdown")
+def stop_background_workers():
+    live.manager.stop()
+    precompute.scheduler.stop()
+
+@app.on_event("shutdown")
+async def close_async_engine():
+    await async_engine.dispose()
+
 @app.get("/")
 def read_root():
     return {"message": "Oracle AI Manager & Coach API에 오신 것을 환영합니다!"}
 
 # --- 선수(Player) API ---
 @app.post("/players/", response_model=schemas.Player)
-def create_player_api(player: schemas.PlayerCreate, db: Session = Depends(get_db)):
+async def create_player_api(player: schemas.PlayerCreate, db: AsyncSession = Depends(get_async_db)):
     # 중복된 이름이 있는지 확인
-    db_player = db.query(models.Player).filter(models.Player.name == player.name).first()
+    db_player = await async_crud.get_player_by_name(db, player.name)
     if db_player:
         raise HTTPException(status_code=400, detail="이미 등록된 선수 이름입니다.")
     
-    return crud.create_player(db=db, player=player)
+    return await async_crud.create_player(db=db, player=player)
 
 @app.get("/players/", response_model=List[schemas.Player])
-def read_players_api(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    players = crud.get_players(db, skip=skip, limit=limit)
-    return players
+async def read_players_api(request: Request, skip: int = 0, limit: int = 100, format: str = "json",
+                           db: AsyncSession = Depends(get_async_db)):
+    columnar.check_format(format)
+    if format != "json":
+        columns = await db.run_sync(columnar.players_columns, skip=skip, limit=limit)
+        return columnar.columnar_response(columns, format)
+    # ORM 객체와 Pydantic 검증을 거치지 않고 조회 결과 튜플을 바로 JSON으로 직렬화합니다.
+    players = await db.run_sync(fast_read.players_payload, skip=skip, limit=limit)
+    return fast_read.json_response(players, request.headers.get("accept-encoding", ""))
 
 @app.put("/players/{player_id}", response_model=schemas.Player)
-def update_player_api(player_id: int, player: schemas.PlayerUpdate, db: Session = Depends(get_db)):
-    db_player = crud.update_player(db, player_id=player_id, player=player)
+async def update_player_api(player_id: int, player: schemas.PlayerUpdate, db: AsyncSession = Depends(get_async_db)):
+    db_player = await async_crud.update_player(db, player_id=player_id, player=player)
     if db_player is None:
         raise HTTPException(status_code=404, detail="Player not found")
     return db_player
 
 @app.delete("/players/{player_id}", response_model=schemas.Player)
-def delete_player_api(player_id: int, db: Session = Depends(get_db)):
-    db_player = crud.delete_player(db, player_id=player_id)
+async def delete_player_api(player_id: int, db: AsyncSession = Depends(get_async_db)):
+    db_player = await async_crud.delete_player(db, player_id=player_id)
     if db_player is None:
         raise HTTPException(status_code=404, detail="Player not found")
     return db_player
 
 # --- 경기(Game) API ---
 @app.post("/games/", response_model=schemas.Game)
-def create_game_api(game: schemas.GameCreate, db: Session = Depends(get_db)):
-    return crud.create_game(db=db, game=game)
+async def create_game_api(game: schemas.GameCreate, db: AsyncSession = Depends(get_async_db)):
+    return await async_crud.create_game(db=db, game=game)
 
 @app.get("/games/", response_model=List[schemas.Game])
-def read_games_api(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    # events 관계를 함께 로드하기 위해 options 추가
-    from sqlalchemy.orm import joinedload, selectinload
-    games = db.query(models.Game).options(selectinload(models.Game.events).joinedload(models.GameEvent.player)).order_by(models.Game.game_date.desc()).offset(skip).limit(limit).all()
-    return games
+async def read_games_api(request: Request, skip: int = 0, limit: int = 100, format: str = "json",
+                         db: AsyncSession = Depends(get_async_db)):
+    columnar.check_format(format)
+    if format != "json":
+        columns = await db.run_sync(columnar.games_columns, skip=skip, limit=limit)
+        return columnar.columnar_response(columns, format)
+    # 경기 한 페이지와 그 경기들의 events(선수 포함)를 튜플로 읽어 ORM 객체 없이 응답을 만듭니다.
+    games = await db.run_sync(fast_read.games_payload, skip=skip, limit=limit)
+    return fast_read.json_response(games, request.headers.get("accept-encoding", ""))
 
 @app.put("/games/{game_id}", response_model=schemas.Game)
-def update_game_api(game_id: int, game: schemas.GameUpdate, db: Session = Depends(get_db)):
-    db_game = crud.update_game(db, game_id=game_id, game=game)
+async def update_game_api(game_id: int, game: schemas.GameUpdate, db: AsyncSession = Depends(get_async_db)):
+    db_game = await async_crud.update_game(db, game_id=game_id, game=game)
     if db_game is None:
         raise HTTPException(status_code=404, detail="Game not found")
     return db_game
 
 @app.delete("/games/{game_id}", response_model=schemas.Game)
-def delete_game_api(game_id: int, db: Session = Depends(get_db)):
-    db_game = crud.delete_game(db, game_id=game_id)
+async def delete_game_api(game_id: int, db: AsyncSession = Depends(get_async_db)):
+    db_game = await async_crud.delete_game(db, game_id=game_id)
     if db_game is None:
         raise HTTPException(status_code=404, detail="Game not found")
     return db_game
 
+# --- 실시간 경기(Live match) API ---
+@app.post("/live/matches", response_model=schemas.LiveScoreboard)
+def open_live_match_api(match: schemas.LiveMatchCreate):
+    """실시간 기록을 위한 경기를 시작합니다."""
+    return live.manager.open_match(match).scoreboard()
+
+@app.get("/live/matches", response_model=List[schemas.LiveScoreboard])
+def read_live_matches_api():
+    return [live_match.scoreboard() for live_match in live.manager.list_matches()]
+
+@app.get("/live/matches/{match_id}", response_model=schemas.LiveScoreboard)
+def read_live_match_api(match_id: str):
+    """메모리에 있는 실시간 점수판을 반환합니다. (DB 조회 없음)"""
+    live_match = live.manager.get(match_id)
+    if live_match is None:
+        raise HTTPException(status_code=404, detail="Live match not found")
+    return live_match.scoreboard()
+
+@app.post("/live/matches/{match_id}/events", response_model=schemas.LiveScoreboard)
+def record_live_events_api(match_id: str, events: List[schemas.LiveEventCreate]):
+    """경기 이벤트를 기록합니다. 여러 개를 한 번에 보낼 수 있으며, DB에는 묶어서 비동기로 기록됩니다."""
+    try:
+        live_match = live.manager.record_events(match_id, events)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if live_match is None:
+        raise HTTPException(status_code=404, detail="Live match not found")
+    return live_match.scoreboard()
+
+@app.post("/live/matches/{match_id}/close", response_model=schemas.Game)
+def close_live_match_api(match_id: str):
+    """경기를 종료하고 최종 기록을 일반 경기 기록(Game)으로 저장합니다."""
+    db_game = live.manager.close_match(match_id)
+    if db_game is None:
+        raise HTTPException(status_code=404, detail="Live match not found")
+    return db_game
+
 # --- 통계(Stats) API ---
 @app.get("/stats/opponents", response_model=List[schemas.OpponentStats])
-def read_opponent_stats(db: Session = Depends(get_db)):
-    stats = crud.get_stats_by_opponent(db=db)
-    return stats
+def read_opponent_stats(start_date: Optional[date] = None, end_date: Optional[date] = None,
+                        format: str = "json", db: Session = Depends(get_db)):
+    columnar.check_format(format)
+    if format != "json":
+        return columnar.columnar_response(columnar.opponent_stats_columns(db, start_date, end_date), format)
+    stats = analytics.get_stats_by_opponent(db, start_date, end_date)
+    return [schemas.OpponentStats(**stat._asdict()) for stat in stats]
 
 @app.get("/stats/leaderboard", response_model=List[schemas.PlayerStats])
-def read_leaderboard_stats(db: Session = Depends(get_db)):
+def read_leaderboard_stats(start_date: Optional[date] = None, end_date: Optional[date] = None,
+                           format: str = "json", db: Session = Depends(get_db)):
     """선수별 득점, 도움, 공격 포인트 순위를 반환합니다."""
-    raw_stats = crud.get_leaderboard_stats(db=db)
+    columnar.check_format(format)
+    if format != "json":
+        return columnar.columnar_response(columnar.leaderboard_columns(db, start_date, end_date), format)
+    raw_stats = analytics.get_leaderboard_stats(db, start_date, end_date)
     leaderboard = []
     for stat in raw_stats:
         goals = stat.goals or 0
@@ -130,8 +242,102 @@ def read_leaderboard_stats(db: Session = Depends(get_db)):
         ))
     return sorted(leaderboard, key=lambda x: x.points, reverse=True)
 
+@app.get("/stats/players/{player_id}", response_model=schemas.PlayerSummary)
+def read_player_stats(player_id: int, start_date: Optional[date] = None, end_date: Optional[date] = None):
+    """한 선수의 득점/도움 합계와 상대 팀별 기록을 반환합니다."""
+    if not analytics.engine.ready:
+        raise HTTPException(status_code=503, detail="통계 엔진을 준비 중입니다. 잠시 후 다시 시도하세요.")
+    analytics.engine.sync()
+    summary = analytics.engine.player_summary(player_id, start_date, end_date)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="Player not found")
+    return summary
+
+@app.get("/stats/ratings", response_model=List[schemas.TeamRating])
+def read_team_ratings(db: Session = Depends(get_db)):
+    """우리 팀과 상대 팀들의 현재 Elo 레이팅을 높은 순으로 반환합니다."""
+    return ratings.get_ratings(db)
+
+@app.get("/stats/ratings/history", response_model=List[schemas.RatingHistoryEntry])
+def read_rating_history(opponent: Optional[str] = None, limit: int = 50, db: Session = Depends(get_db)):
+    """최근 경기부터 경기별 레이팅 변화를 반환합니다."""
+    return ratings.get_history(db, opponent, limit)
+
+# --- 경기 시뮬레이션 API ---
+@app.get("/analysis/simulate", response_model=schemas.SimulationResult)
+def simulate_match_api(opponent: str, simulations: int = simulation.DEFAULT_SIMULATIONS, db: Session = Depends(get_db)):
+    """과거 경기 기록으로 추정한 득점/실점률로 상대와의 경기를 여러 번 시뮬레이션해 승/무/패 확률과 스코어 분포를 반환합니다."""
+    if not 1 <= simulations <= simulation.MAX_SIMULATIONS:
+        raise HTTPException(status_code=400, detail=f"simulations는 1 이상 {simulation.MAX_SIMULATIONS} 이하여야 합니다.")
+    rates = simulation.simulator.strengths(db).rates(opponent)
+    return {"opponent_team": opponent, **simulation.simulate(rates, simulations)}
+
+# --- 대시보드(Dashboard) API ---
+@app.get("/dashboard/{page}")
+def read_dashboard_api(page: str, request: Request, db: Session = Depends(get_db)):
+    """프론트엔드 페이지 하나를 그리는 데 필요한 데이터를 한 번의 요청으로 반환합니다."""
+    if page not in dashboard.DASHBOARD_PAGES:
+        raise HTTPException(status_code=404, detail=f"알 수 없는 페이지입니다: {page}")
+    payload = dashboard.build_dashboard(db, page)
+    payload["version"] = changes.broadcaster.version
+    return fast_read.json_response(payload, request.headers.get("accept-encoding", ""))
+
+# --- 변경 알림(Change feed) API ---
+@app.get("/changes/version")
+def read_data_version_api():
+    """현재 데이터 버전을 반환합니다. 버전이 바뀌었으면 클라이언트 캐시를 갱신해야 합니다."""
+    return {"version": changes.broadcaster.version}
+
+@app.get("/changes/stream")
+async def stream_changes_api():
+    """쓰기 작업이 커밋될 때마다 변경 이벤트를 Server-Sent Events로 전달합니다.
+
+    이벤트 예시: {"version": 12, "entity": "game", "id": 42, "action": "created"}
+    entity가 "*"이고 action이 "resync"이면 이벤트가 유실된 것이므로 전체를 다시 조회해야 합니다.
+    """
+    async def event_stream():
+        yield f"event: hello\ndata: {json.dumps({'version': changes.broadcaster.version})}\n\n"
+        async for event in changes.broadcaster.subscribe():
+            if event is None:
+                # 프록시가 연결을 끊지 않도록 주기적으로 주석 한 줄을 보냅니다.
+                yield ": keep-alive\n\n"
+                continue
+            yield f"id: {event['version']}\nevent: change\ndata: {json.dumps(event, default=str)}\n\n"
+
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=headers)
+
+# --- 데이터 내보내기(Export) API ---
+@app.get("/export/{dataset}")
+def export_data_api(dataset: str, format: str = "csv", start_date: Optional[date] = None,
+                    end_date: Optional[date] = None, opponent: Optional[str] = None):
+    """games, events, players 전체를 CSV/JSONL/Parquet 형식으로 스트리밍합니다."""
+    if dataset not in export.EXPORT_DATASETS:
+        raise HTTPException(status_code=404, detail=f"지원하지 않는 데이터셋입니다: {dataset}")
+    try:
+        content = export.stream_export(dataset, format, start_date=start_date, end_date=end_date, opponent=opponent)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    headers = {"Content-Disposition": f'attachment; filename="{dataset}.{format}"'}
+    return StreamingResponse(content, media_type=export.EXPORT_MEDIA_TYPES[format], headers=headers)
+
 # --- Gemini AI 분석 API ---
-@app.post("/analysis/report", response_model=schemas.AnalysisResponse)
+# Gemini 호출은 동시 실행 수가 제한되며, 대화형 요청이 배치 요청보다 먼저 실행됩니다.
+# 대기열이 가득 차면 429와 Retry-After 헤더를 반환합니다.
+interactive_slot = admission.admit(admission.INTERACTIVE)
+batch_slot = admission.admit(admission.BATCH)
+
+@app.get("/metrics/ai")
+def read_ai_metrics_api():
+    """모델별 EWMA 지연 시간, 오류율, 라우팅 결정 횟수, 등급별 대기열 상태/대기 시간과 사전 생성 현황을 반환합니다."""
+    return {
+        **services.router.metrics(),
+        "admission": admission.controller.metrics(),
+        "precompute": precompute.scheduler.status(),
+    }
+
+@app.post("/analysis/report", response_model=schemas.AnalysisResponse, dependencies=[Depends(interactive_slot)])
 def generate_generic_analysis_report(request: schemas.AnalysisRequest):
     """범용 프롬프트를 사용하여 Gemini 분석을 요청합니다."""
     try:
@@ -141,118 +347,182 @@ def generate_generic_analysis_report(request: schemas.AnalysisRequest):
         raise HTTPException(status_code=500, detail=f"Gemini API 호출 중 오류 발생: {str(e)}")
 
 @app.post("/games/{game_id}/report", response_model=schemas.AnalysisResponse)
-def generate_game_report_api(game_id: int, db: Session = Depends(get_db)):
-    """특정 경기 결과를 바탕으로 Gemini 경기 요약 리포트를 생성합니다."""
-    db_game = crud.get_game(db, game_id=game_id)
-    if not db_game:
-        raise HTTPException(status_code=404, detail="Game not found")
+def generate_game_report_api(game_id: int, refresh: bool = False, db: Session = Depends(get_db)):
+    """특정 경기 결과를 바탕으로 Gemini 경기 요약 리포트를 생성합니다.
 
-    # Gemini에게 전달할 프롬프트를 동적으로 생성
-    prompt = f"""
-    당신은 전문 축구 경기 분석가입니다. 아래 경기 결과를 바탕으로, 우리 팀 'Oracle'의 입장에서 흥미로운 뉴스 기사 스타일의 경기 요약 리포트를 작성해주세요.
+    미리 만들어 둔 리포트가 최신이면 실행 자리를 기다리지 않고 바로 반환합니다. (refresh=true면 항상 새로 생성)
+    """
+    prompt = ai_reports.game_report_prompt(db, game_id)
+    if prompt is None:
+        raise HTTPException(status_code=404, detail="Game not found")
+    if not refresh:
+        report_text = ai_reports.get_fresh(db, ai_reports.GAME_REPORT, str(game_id), prompt)
+        if report_text is not None:
+            return {"report": report_text}
+
+    # 자리를 기다리는 동안 다른 요청이 같은 리포트를 만들었을 수 있으므로 get_or_generate로 한 번 더 확인합니다.
+    with admission.admitted(admission.INTERACTIVE):
+        try:
+            report_text = ai_reports.get_or_generate(db, ai_reports.GAME_REPORT, str(game_id), prompt, "recap",
+                                                     services.generate_text_from_gemini, refresh=refresh)
+            return {"report": report_text}
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Gemini API 호출 중 오류 발생: {str(e)}")
+
+@app.get("/games/{game_id}/report", response_model=schemas.StoredAnalysis)
+def read_game_report_api(game_id: int, db: Session = Depends(get_db)):
+    """저장된(미리 생성된) 경기 리포트를 반환합니다. 리포트 이후 경기 정보가 바뀌었으면 stale이 true입니다."""
+    prompt = ai_reports.game_report_prompt(db, game_id)
+    if prompt is None:
+        raise HTTPException(status_code=404, detail="Game not found")
+    db_report, stale = ai_reports.get_stored(db, ai_reports.GAME_REPORT, str(game_id), prompt)
+    if db_report is None:
+        raise HTTPException(status_code=404, detail="저장된 리포트가 없습니다.")
+    return {"report": db_report.report, "created_at": db_report.created_at, "stale": stale}
 
-    - 경기 날짜: {db_game.game_date.strftime('%Y년 %m월 %d일')}
-    - 상대 팀: {db_game.opponent_team}
-    - 우리 팀 (Oracle) 득점: {db_game.our_score}
-    - 상대 팀 득점: {db_game.opponent_score}
-    - 경기 결과: {'승리' if db_game.result == 'WIN' else '패배' if db_game.result == 'LOSE' else '무승부'}
+@app.post("/players/{player_id}/analysis", response_model=schemas.AnalysisResponse,
+          dependencies=[Depends(interactive_slot)])
+def generate_player_analysis_api(player_id: int, db: Session = Depends(get_db)):
+    """특정 선수의 스탯을 기반으로 Gemini 강점/약점 분석 리포트를 생성하고 저장합니다."""
+    db_player = crud.get_player(db, player_id=player_id)
+    if not db_player:
+        raise HTTPException(status_code=404, detail="Player not found")
 
-    리포트에는 경기의 전반적인 흐름, 승패의 결정적인 요인, 그리고 마지막에 SNS 공유를 위한 재치있는 해시태그를 3개 이상 포함해주세요.
-    """
+    # Gemini에게 전달할 프롬프트를 동적으로 생성
+    prompt = prompts.player_analysis_prompt(db_player)
 
     try:
-        report_text = services.generate_text_from_gemini(prompt)
-        return {"report": report_text}
+        report_text = services.generate_text_from_gemini(prompt, task="player_analysis")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Gemini API 호출 중 오류 발생: {str(e)}")
+    crud.save_ai_report(db, squad_analysis.REPORT_KIND, str(player_id), report_text,
+                        prompts.input_hash(prompts.player_profile(db_player)))
+    return {"report": report_text}
 
-def _get_player_stats_string(player: models.Player) -> str:
-    """선수 객체로부터 유효한 모든 능력치 정보를 문자열로 만듭니다."""
-    stats_map = {
-        "체력": player.stamina, "속도": player.speed, "슈팅 정확도": player.shooting_accuracy,
-        "드리블": player.dribbling, "패스": player.passing, "골 결정력": player.finishing,
-        "크로스": player.crossing, "시야": player.vision, "가로채기": player.interceptions,
-        "태클": player.tackling, "헤딩": player.heading, "선방 능력": player.saving,
-        "수비 조율": player.defense_coordination, "캐칭": player.catching
-    }
-    
-    # 값이 있는 (None이 아닌) 능력치만 필터링하여 문자열로 만듭니다.
-    valid_stats = [f"- {name}: {value} / 100" for name, value in stats_map.items() if value is not None]
-    
-    if not valid_stats:
-        return "입력된 능력치 정보가 없습니다."
-        
-    return "\n".join(valid_stats)
-
-@app.post("/players/{player_id}/analysis", response_model=schemas.AnalysisResponse)
-def generate_player_analysis_api(player_id: int, db: Session = Depends(get_db)):
-    """특정 선수의 스탯을 기반으로 Gemini 강점/약점 분석 리포트를 생성합니다."""
+@app.get("/players/{player_id}/analysis", response_model=schemas.StoredAnalysis)
+def read_player_analysis_api(player_id: int, db: Session = Depends(get_db)):
+    """저장된 선수 분석을 반환합니다. 분석 이후 선수 정보가 바뀌었으면 stale이 true입니다."""
     db_player = crud.get_player(db, player_id=player_id)
     if not db_player:
         raise HTTPException(status_code=404, detail="Player not found")
+    db_report = crud.get_ai_report(db, squad_analysis.REPORT_KIND, str(player_id))
+    if not db_report:
+        raise HTTPException(status_code=404, detail="저장된 분석이 없습니다.")
+    stale = db_report.input_hash != prompts.input_hash(prompts.player_profile(db_player))
+    return {"report": db_report.report, "created_at": db_report.created_at, "stale": stale}
 
-    stats_info = _get_player_stats_string(db_player)
-
-    # Gemini에게 전달할 프롬프트를 동적으로 생성
-    prompt = f"""
-    당신은 경험 많은 축구 코치입니다. 아래 선수의 능력치를 바탕으로, 이 선수의 강점과 약점을 분석하고, 개선을 위한 구체적인 훈련 방법을 추천해주세요.
-    분석 내용은 선수가 직접 읽는다고 생각하고, 친근하고 동기부여가 되는 말투로 작성해주세요.
+@app.post("/analysis/squad", response_model=schemas.SquadAnalysisResponse, dependencies=[Depends(batch_slot)])
+def generate_squad_analysis_api(request: schemas.SquadAnalysisRequest, db: Session = Depends(get_db)):
+    """여러 선수를 토큰 예산에 맞게 묶어 한 번의 요청으로 분석하고, 선수별 결과를 각각 저장합니다.
 
-    - 선수 이름: {db_player.name}
-    - 포지션: {db_player.position}
-    - 주발: {db_player.dominant_foot}
-    {stats_info}
-
-    결과는 '강점', '약점', '추천 훈련법' 세 가지 항목으로 명확하게 구분해서 설명해줘.
+    형식이 맞지 않아 결과를 얻지 못한 선수만 다시 묶어 재요청합니다.
     """
-
-    try:
-        report_text = services.generate_text_from_gemini(prompt)
-        return {"report": report_text}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Gemini API 호출 중 오류 발생: {str(e)}")
+    if request.player_ids is not None:
+        players = crud.get_players_by_ids(db, request.player_ids)
+    else:
+        players = crud.get_players(db, limit=1000)
+    if not players:
+        raise HTTPException(status_code=404, detail="분석할 선수가 없습니다.")
+
+    result = squad_analysis.analyze_squad(db, players, services.generate_text_from_gemini)
+    names = {p.id: p.name for p in players}
+    return {
+        "reports": [
+            {"player_id": player_id, "name": names[player_id], "report": report}
+            for player_id, report in result["reports"].items()
+        ],
+        "failed_player_ids": result["failed"],
+        "llm_calls": result["calls"],
+    }
 
 @app.post("/analysis/formation", response_model=schemas.AnalysisResponse)
-def generate_formation_recommendation_api(request: schemas.FormationRequest, db: Session = Depends(get_db)):
-    """상대팀과 우리팀 선수 명단을 기반으로 최적 포메이션을 추천합니다."""
-    
-    # 1. 우리 팀 전체 선수 정보 가져오기
-    all_players = crud.get_players(db, limit=100)
-    if not all_players:
-        raise HTTPException(status_code=404, detail="등록된 선수가 없습니다.")
-
-    player_list_str = "\n".join([f"### {p.name}\n- 포지션: {p.position}\n{_get_player_stats_string(p)}\n" for p in all_players])
+def generate_formation_recommendation_api(request: schemas.FormationRequest, refresh: bool = False,
+                                          db: Session = Depends(get_db)):
+    """상대팀과 우리팀 선수 명단을 기반으로 최적 포메이션을 추천합니다.
 
-    # 2. 상대팀 정보 가져오기 (간단한 전적)
-    opponent_stats_list = crud.get_stats_by_opponent(db)
-    opponent_stat = next((s for s in opponent_stats_list if s.opponent_team == request.opponent_team), None)
-    
-    opponent_info_str = f"상대팀 '{request.opponent_team}'은(는) 우리와 총 {opponent_stat.total_games}번 붙어서 {opponent_stat.wins}승 {opponent_stat.draws}무 {opponent_stat.losses}패를 기록했습니다." if opponent_stat else f"상대팀 '{request.opponent_team}'과(와)는 첫 경기입니다."
-
-    # 사용자가 입력한 상대팀 전술 스타일 정보 추가
-    opponent_style_info = ""
-    if request.opponent_style:
-        opponent_style_info = f"3. **상대팀 예상 전술 스타일**: {request.opponent_style}"
-
-    # 3. Gemini에게 전달할 프롬프트 생성
-    prompt = f"""
-    당신은 펩 과르디올라와 같은 세계적인 축구 전술가입니다. 아마추어 축구팀 'Oracle'의 다음 경기를 위해 최적의 포메이션과 선발 라인업을 추천해주세요.
-
-    ## 분석 정보
-    1. **상대팀 정보**: {opponent_info_str}
-    {opponent_style_info}
-    2. **우리팀 선수 명단 및 능력치**:
-    {player_list_str}
-
-    ## 요청 사항
-    위 정보를 바탕으로, 다음 항목들을 추천해주세요.
-    1. **추천 포메이션**: (예: 4-3-3) 그 이유를 간단히 설명해주세요.
-    2. **선발 라인업**: 추천 포메이션에 맞춰 각 포지션에 어떤 선수를 배치할지 이름과 이유를 설명해주세요.
-    3. **핵심 전술**: 이 경기에서 우리 팀이 집중해야 할 핵심 전술 포인트를 2~3가지 짚어주세요.
+    예정된 경기로 등록된 상대는 미리 추천을 만들어 두므로, 입력이 같으면 실행 자리를 기다리거나 Gemini를 호출하지 않고 바로 반환합니다.
     """
+    opponent_style = request.opponent_style or None
+    prompt = ai_reports.formation_prompt(db, request.opponent_team, opponent_style)
+    if prompt is None:
+        raise HTTPException(status_code=404, detail="등록된 선수가 없습니다.")
 
-    try:
-        recommendation = services.generate_text_from_gemini(prompt)
-        return {"report": recommendation}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Gemini API 호출 중 오류 발생: {str(e)}")
+    key = ai_reports.formation_key(request.opponent_team, opponent_style)
+    if not refresh:
+        recommendation = ai_reports.get_fresh(db, ai_reports.FORMATION, key, prompt)
+        if recommendation is not None:
+            return {"report": recommendation}
+
+    with admission.admitted(admission.INTERACTIVE):
+        try:
+            recommendation = ai_reports.get_or_generate(db, ai_reports.FORMATION, key, prompt, "formation",
+                                                        services.generate_text_from_gemini, refresh=refresh)
+            return {"report": recommendation}
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Gemini API 호출 중 오류 발생: {str(e)}")
+
+@app.get("/analysis/formation", response_model=schemas.StoredAnalysis)
+def read_formation_recommendation_api(opponent_team: str, opponent_style: Optional[str] = None,
+                                      db: Session = Depends(get_db)):
+    """저장된(미리 생성된) 포메이션 추천을 반환합니다. 추천 이후 선수나 전적이 바뀌었으면 stale이 true입니다."""
+    opponent_style = opponent_style or None
+    prompt = ai_reports.formation_prompt(db, opponent_team, opponent_style)
+    if prompt is None:
+        raise HTTPException(status_code=404, detail="등록된 선수가 없습니다.")
+    db_report, stale = ai_reports.get_stored(
+        db, ai_reports.FORMATION, ai_reports.formation_key(opponent_team, opponent_style), prompt
+    )
+    if db_report is None:
+        raise HTTPException(status_code=404, detail="저장된 추천이 없습니다.")
+    return {"report": db_report.report, "created_at": db_report.created_at, "stale": stale}
+
+# --- 예정된 경기와 AI 결과 사전 생성 ---
+# 등록된 상대의 포메이션 추천과 새 경기의 리포트를 AI 요청이 없는 시간에 미리 만들어 둡니다.
+
+@app.post("/schedule/upcoming", response_model=schemas.UpcomingMatch)
+def create_upcoming_match_api(match: schemas.UpcomingMatchCreate, db: Session = Depends(get_db)):
+    db_match = crud.create_upcoming_match(db=db, match=match)
+    precompute.scheduler.enqueue("formation", (db_match.opponent_team, db_match.opponent_style or None))
+    return db_match
+
+@app.get("/schedule/upcoming", response_model=List[schemas.UpcomingMatchWithFormation])
+def read_upcoming_matches_api(db: Session = Depends(get_db)):
+    """예정된 경기와 각 경기의 미리 생성된 포메이션 추천을 함께 반환합니다. (경기마다 따로 조회하지 않도록)"""
+    matches = crud.get_upcoming_matches(db)
+    targets = {(m.opponent_team, m.opponent_style or None) for m in matches}
+    prompts_by_key = {
+        ai_reports.formation_key(*target): prompt
+        for target, prompt in ai_reports.formation_prompts(db, list(targets)).items()
+    }
+    stored = ai_reports.get_stored_many(db, ai_reports.FORMATION, prompts_by_key)
+
+    result = []
+    for match in matches:
+        formation = None
+        db_report, stale = stored.get(ai_reports.formation_key(match.opponent_team, match.opponent_style or None),
+                                      (None, False))
+        if db_report is not None:
+            formation = {"report": db_report.report, "created_at": db_report.created_at, "stale": stale}
+        result.append({
+            "id": match.id, "opponent_team": match.opponent_team, "match_date": match.match_date,
+            "opponent_style": match.opponent_style, "formation": formation,
+        })
+    return result
+
+@app.delete("/schedule/upcoming/{match_id}", response_model=schemas.UpcomingMatch)
+def delete_upcoming_match_api(match_id: int, db: Session = Depends(get_db)):
+    db_match = crud.delete_upcoming_match(db, match_id=match_id)
+    if db_match is None:
+        raise HTTPException(status_code=404, detail="Upcoming match not found")
+    return db_match
+
+@app.get("/precompute/status")
+def read_precompute_status_api():
+    """사전 생성 일정, 오늘 사용한 호출 수, 대기 작업 수와 처리 결과 횟수"""
+    return precompute.scheduler.status()
+
+@app.post("/precompute/run")
+def run_precompute_api():
+    """정기 일정을 기다리지 않고 예정된 상대와 최근 경기의 사전 생성을 바로 예약합니다."""
+    precompute.scheduler.enqueue("scan")
+    return precompute.scheduler.status()
@@ -0,0 +1,263 @@
+# backend/app/migrations.py
+
+# 버전별 스키마 변경(마이그레이션)을 순서대로 적용합니다.
+# 적용한 버전은 schema_version 테이블에 기록하므로, 서버를 시작할 때마다 아직 적용하지 않은 변경만 실행됩니다.
+# 스키마를 바꿀 때는 models.py를 고친 뒤, 바뀐 부분의 DDL을 이 파일에 적은 새 버전을 MIGRATIONS 끝에 추가하세요.
+# (이미 배포된 버전은 고치지 않습니다. tests/test_migrations.py가 마이그레이션 결과와 models.py를 비교합니다)
+#
+#   python -m app.migrations          # 대기 중인 마이그레이션 적용
+#   python -m app.migrations --status # 현재 버전과 대기 중인 마이그레이션 확인
+
+import logging
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import (
+    Column, Date, DateTime, Float, ForeignKey, Index, Integer, MetaData, String, Table, Text, UniqueConstraint, inspect,
+    insert, select, text,
+)
+from sqlalchemy.engine import Connection, Engine
+
+logger = logging.getLogger(__name__)
+
+_version_metadata = MetaData()
+schema_version = Table(
+    "schema_version", _version_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String, nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+# 각 버전의 스키마는 적용 당시 그대로 여기에 고정해 둡니다. models.py나 다른 모듈이 나중에 바뀌어도
+# 이미 배포된 마이그레이션의 결과가 달라지지 않도록, 마이그레이션에서는 app의 다른 모듈을 import하지 않습니다.
+
+# --- 버전 1: 마이그레이션 도입 전부터 있던 테이블 (이전에는 create_all로 만들었습니다) ---
+_v1 = MetaData()
+_v1_players = Table(
+    "players", _v1,
+    Column("id", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("position", String),
+    Column("dominant_foot", String),
+    *(Column(name, Integer) for name in (
+        "stamina", "speed", "shooting_accuracy", "dribbling", "passing", "finishing", "crossing",
+        "vision", "interceptions", "tackling", "heading", "saving", "defense_coordination", "catching",
+    )),
+    Index("ix_players_id", "id"),
+    Index("ix_players_name", "name", unique=True),
+)
+_v1_games = Table(
+    "games", _v1,
+    Column("id", Integer, primary_key=True),
+    Column("opponent_team", String, nullable=False),
+    Column("game_date", DateTime, nullable=False),
+    Column("our_score", Integer),
+    Column("opponent_score", Integer),
+    Column("result", String),
+    Index("ix_games_id", "id"),
+)
+Table(
+    "game_events", _v1,
+    Column("id", Integer, primary_key=True),
+    Column("game_id", Integer, ForeignKey("games.id"), nullable=False),
+    Column("player_id", Integer, ForeignKey("players.id"), nullable=False),
+    Column("event_type", String, nullable=False),
+    Index("ix_game_events_id", "id"),
+)
+Table(
+    "live_matches", _v1,
+    Column("id", String, primary_key=True),
+    Column("opponent_team", String, nullable=False),
+    Column("game_date", DateTime, nullable=False),
+    Column("status", String, nullable=False),
+    Column("game_id", Integer, ForeignKey("games.id"), nullable=True),
+)
+Table(
+    "live_match_events", _v1,
+    Column("id", Integer, primary_key=True),
+    Column("match_id", String, ForeignKey("live_matches.id"), nullable=False),
+    Column("player_id", Integer, ForeignKey("players.id"), nullable=True),
+    Column("event_type", String, nullable=False),
+    Column("minute", Integer, nullable=True),
+    Column("recorded_at", DateTime, nullable=False),
+    Index("ix_live_match_events_id", "id"),
+    Index("ix_live_match_events_match_id", "match_id"),
+)
+Table(
+    "upcoming_matches", _v1,
+    Column("id", Integer, primary_key=True),
+    Column("opponent_team", String, nullable=False),
+    Column("match_date", DateTime, nullable=False),
+    Column("opponent_style", String, nullable=True),
+    Index("ix_upcoming_matches_id", "id"),
+)
+Table(
+    "ai_reports", _v1,
+    Column("id", Integer, primary_key=True),
+    Column("kind", String, nullable=False),
+    Column("target_key", String, nullable=False),
+    Column("input_hash", String, nullable=False),
+    Column("report", Text, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    UniqueConstraint("kind", "target_key"),
+    Index("ix_ai_reports_id", "id"),
+)
+
+def _create_baseline_tables(conn: Connection):
+    _v1.create_all(conn)
+
+# --- 버전 2: 자주 실행되는 조회(리더보드, 상대별 전적, 최신 경기 목록, 경기별 이벤트/삭제)용 인덱스 ---
+# 버전 2 이전 코드가 버전 1에서 이 인덱스까지 만들었을 수 있으므로 IF NOT EXISTS로 만듭니다.
+HOT_PATH_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS ix_games_opponent_team_game_date ON games (opponent_team, game_date, result)",
+    "CREATE INDEX IF NOT EXISTS ix_games_game_date_desc ON games (game_date DESC, id)",
+    "CREATE INDEX IF NOT EXISTS ix_game_events_game_id_event_type ON game_events (game_id, event_type, player_id)",
+    "CREATE INDEX IF NOT EXISTS ix_game_events_player_id_event_type ON game_events (player_id, event_type)",
+)
+
+def _create_hot_path_indexes(conn: Connection):
+    for statement in HOT_PATH_INDEXES:
+        conn.execute(text(statement))
+
+# --- 버전 3: 팀 레이팅 테이블과 기존 경기로 계산한 초기 레이팅 ---
+_v3 = MetaData()
+_v3_team_ratings = Table(
+    "team_ratings", _v3,
+    Column("team", String, primary_key=True),
+    Column("rating", Float, nullable=False),
+    Column("games", Integer, nullable=False),
+)
+_v3_rating_history = Table(
+    "rating_history", _v3,
+    Column("id", Integer, primary_key=True),
+    Column("game_id", Integer, nullable=False, unique=True),
+    Column("game_date", DateTime, nullable=False),
+    Column("opponent_team", String, nullable=False),
+    Column("our_rating", Float, nullable=False),
+    Column("opponent_rating", Float, nullable=False),
+    Column("expected_score", Float, nullable=False),
+    Column("rating_change", Float, nullable=False),
+    Index("ix_rating_history_game_date_game_id", "game_date", "game_id"),
+    Index("ix_rating_history_opponent_team_game_date", "opponent_team", "game_date"),
+)
+
+# 버전 3 당시 ratings.py의 Elo 계산. 이후 계산 방식이 바뀌면 서버 시작 시 레이팅 엔진이 다시 계산합니다.
+_V3_OUR_TEAM = "Oracle"
+_V3_INITIAL_RATING = 1500.0
+_V3_K_FACTOR = 30.0
+
+def _v3_rate_games(games) -> tuple:
+    """(rating_history 행 목록, 팀 -> 레이팅, 팀 -> 경기 수)"""
+    ratings, games_played, rows = {}, {}, []
+    for game_id, game_date, opponent_team, our_score, opponent_score in games:
+        our_score, opponent_score = our_score or 0, opponent_score or 0
+        ours = ratings.setdefault(_V3_OUR_TEAM, _V3_INITIAL_RATING)
+        theirs = ratings.setdefault(opponent_team, _V3_INITIAL_RATING)
+        expected = 1.0 / (1.0 + 10 ** ((theirs - ours) / 400))
+        actual = 1.0 if our_score > opponent_score else 0.0 if our_score < opponent_score else 0.5
+        margin = abs(our_score - opponent_score)
+        multiplier = 1.0 if margin <= 1 else 1.5 if margin == 2 else (11 + margin) / 8
+        change = _V3_K_FACTOR * multiplier * (actual - expected)
+        ratings[_V3_OUR_TEAM] = ours + change
+        ratings[opponent_team] = theirs - change
+        for team in (_V3_OUR_TEAM, opponent_team):
+            games_played[team] = games_played.get(team, 0) + 1
+        rows.append({
+            "game_id": game_id, "game_date": game_date, "opponent_team": opponent_team,
+            "our_rating": ours, "opponent_rating": theirs, "expected_score": expected, "rating_change": change,
+        })
+    return rows, ratings, games_played
+
+def _create_rating_tables(conn: Connection):
+    _v3.create_all(conn)
+    games = _v1_games.c
+    rows, ratings, games_played = _v3_rate_games(conn.execute(
+        select(games.id, games.game_date, games.opponent_team, games.our_score, games.opponent_score)
+        .order_by(games.game_date, games.id)
+    ).all())
+    if rows:
+        conn.execute(insert(_v3_rating_history), rows)
+        conn.execute(insert(_v3_team_ratings), [
+            {"team": team, "rating": rating, "games": games_played[team]} for team, rating in ratings.items()
+        ])
+
+# --- 버전 4: 레이팅 기록에 반영한 경기의 점수 추가 (경기 기록과 비교해 다시 계산이 필요한지 판단) ---
+RATING_SCORE_STATEMENTS = (
+    "ALTER TABLE rating_history ADD COLUMN our_score INTEGER",
+    "ALTER TABLE rating_history ADD COLUMN opponent_score INTEGER",
+    "UPDATE rating_history SET"
+    " our_score = (SELECT games.our_score FROM games WHERE games.id = rating_history.game_id),"
+    " opponent_score = (SELECT games.opponent_score FROM games WHERE games.id = rating_history.game_id)",
+)
+
+def _add_rating_scores(conn: Connection):
+    for statement in RATING_SCORE_STATEMENTS:
+        conn.execute(text(statement))
+
+# --- 버전 5: 날짜별 사전 생성 LLM 호출 수 (재시작해도 하루 한도 유지) ---
+_v5 = MetaData()
+Table(
+    "precompute_usage", _v5,
+    Column("day", Date, primary_key=True),
+    Column("calls", Integer, nullable=False),
+)
+
+def _create_precompute_usage_table(conn: Connection):
+    _v5.create_all(conn)
+
+# (버전, 설명, 적용 함수). 각 마이그레이션은 하나의 트랜잭션에서 실행됩니다.
+MIGRATIONS = [
+    (1, "기본 테이블 생성", _create_baseline_tables),
+    (2, "조회 경로 인덱스 추가", _create_hot_path_indexes),
+    (3, "팀 레이팅 테이블 추가", _create_rating_tables),
+    (4, "레이팅 기록에 경기 점수 추가", _add_rating_scores),
+    (5, "사전 생성 호출 수 테이블 추가", _create_precompute_usage_table),
+]
+
+def current_version(conn: Connection) -> int:
+    """적용된 마지막 마이그레이션 버전. 아무것도 적용하지 않았으면 0"""
+    if not inspect(conn).has_table(schema_version.name):
+        return 0
+    versions = conn.execute(select(schema_version.c.version)).scalars().all()
+    return max(versions, default=0)
+
+def pending(conn: Connection) -> list:
+    version = current_version(conn)
+    return [migration for migration in MIGRATIONS if migration[0] > version]
+
+def upgrade(engine: Engine, target: Optional[int] = None) -> list:
+    """대기 중인 마이그레이션을 target 버전(기본값: 마지막)까지 순서대로 적용하고, 적용한 버전 목록을 반환합니다."""
+    with engine.begin() as conn:
+        _version_metadata.create_all(conn)
+    applied = []
+    for version, description, apply in MIGRATIONS:
+        if target is not None and version > target:
+            break
+        with engine.begin() as conn:
+            if version <= current_version(conn):
+                continue
+            logger.info("스키마 마이그레이션 %d 적용: %s", version, description)
+            apply(conn)
+            conn.execute(schema_version.insert().values(
+                version=version, description=description, applied_at=datetime.now()
+            ))
+        applied.append(version)
+    return applied
+
+if __name__ == "__main__":
+    import argparse
+
+    from .database import engine
+
+    parser = argparse.ArgumentParser(description="DB 스키마 마이그레이션")
+    parser.add_argument("--status", action="store_true", help="적용하지 않고 현재 버전과 대기 중인 마이그레이션만 출력")
+    args = parser.parse_args()
+
+    if args.status:
+        with engine.connect() as conn:
+            print(f"현재 버전: {current_version(conn)}")
+            for version, description, _ in pending(conn):
+                print(f"  대기 중: {version} {description}")
+    else:
+        applied = upgrade(engine)
+        print(f"적용한 마이그레이션: {applied or '없음'}")
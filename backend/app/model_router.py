@@ -0,0 +1,221 @@
+# backend/app/model_router.py
+
+import logging
+import random
+import threading
+import time
+from collections import Counter, deque
+from typing import Callable, Dict, List, Optional
+
+from . import tracing
+
+logger = logging.getLogger(__name__)
+
+FAST_MODEL = "gemini-flash-lite-latest"
+DEFAULT_MODEL = "gemini-flash-latest"
+LARGE_MODEL = "gemini-pro-latest"
+MODEL_NAMES = [FAST_MODEL, DEFAULT_MODEL, LARGE_MODEL]
+
+# 작업 종류별 모델 우선순위 (앞의 모델이 기본, 뒤의 모델이 대체 모델)
+TASK_ROUTES = {
+    "recap": [FAST_MODEL, DEFAULT_MODEL],             # 경기 요약, SNS 문구
+    "player_analysis": [DEFAULT_MODEL, FAST_MODEL],   # 선수 1명 분석
+    "formation": [LARGE_MODEL, DEFAULT_MODEL],        # 전체 명단을 보는 포메이션 추천
+    "squad_analysis": [DEFAULT_MODEL, LARGE_MODEL],   # 여러 선수를 묶은 분석
+    "generic": [DEFAULT_MODEL, FAST_MODEL],
+    "large_prompt": [LARGE_MODEL, DEFAULT_MODEL],     # 작업 종류와 관계없이 긴 프롬프트
+}
+
+# 이보다 긴 프롬프트는 "large_prompt" 경로로 보냅니다.
+LARGE_PROMPT_CHARS = 8000
+
+# 경로별 지연 시간 목표(초). 모델의 EWMA 지연 시간이 이를 넘으면 잠시 뒤로 미룹니다.
+LATENCY_SLO = {
+    "recap": 8.0, "player_analysis": 15.0, "formation": 40.0, "squad_analysis": 60.0,
+    "generic": 15.0, "large_prompt": 60.0,
+}
+
+EWMA_ALPHA = 0.3
+# 최근 ERROR_WINDOW번의 호출 중 ERROR_BUDGET 비율을 넘게 실패하면 잠시 뒤로 미룹니다.
+ERROR_WINDOW = 20
+ERROR_BUDGET = 0.25
+# 뒤로 미룬 모델을 다시 기본 순서로 돌려놓기까지의 시간(초)
+DEMOTION_SECONDS = 60.0
+
+class ModelStats:
+    """(경로, 모델) 하나의 관측 지연 시간과 최근 성공/실패 기록"""
+
+    def __init__(self):
+        self.ewma_latency = None
+        self.calls = 0
+        self.errors = 0
+        self.slo_misses = 0
+        self.recent = deque(maxlen=ERROR_WINDOW) # True = 성공
+        self.demoted_until = 0.0
+
+    def observe(self, latency: float, ok: bool):
+        self.calls += 1
+        self.recent.append(ok)
+        if not ok:
+            self.errors += 1
+            return
+        if self.ewma_latency is None:
+            self.ewma_latency = latency
+        else:
+            self.ewma_latency = EWMA_ALPHA * latency + (1 - EWMA_ALPHA) * self.ewma_latency
+
+    @property
+    def error_rate(self) -> float:
+        if not self.recent:
+            return 0.0
+        return self.recent.count(False) / len(self.recent)
+
+    def to_dict(self, now: float) -> dict:
+        return {
+            "ewma_latency_ms": round(self.ewma_latency * 1000, 1) if self.ewma_latency is not None else None,
+            "calls": self.calls, "errors": self.errors, "slo_misses": self.slo_misses,
+            "error_rate": round(self.error_rate, 3), "demoted": self.demoted_until > now,
+        }
+
+class ModelRouter:
+    """작업 종류와 프롬프트 크기에 따라 모델을 고르고, 느리거나 자주 실패하는 모델은 대체 모델로 넘깁니다.
+
+    backends는 {모델 이름: prompt -> text 함수} 입니다. 실제 Gemini 모델 대신 FakeModel을 넣어
+    API 키 없이도 라우팅 동작을 확인할 수 있습니다.
+    """
+
+    def __init__(self, backends: Dict[str, Callable[[str], str]], routes: Optional[dict] = None,
+                 slo: Optional[dict] = None, demotion_seconds: float = DEMOTION_SECONDS, clock=time.monotonic):
+        self.backends = backends
+        self.routes = routes or TASK_ROUTES
+        self.slo = slo or LATENCY_SLO
+        self.demotion_seconds = demotion_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._decisions = Counter()
+        self._recent_decisions = deque(maxlen=50)
+
+    def _get_stats(self, route_key: str, model_name: str) -> ModelStats:
+        key = (route_key, model_name)
+        if key not in self._stats:
+            self._stats[key] = ModelStats()
+        return self._stats[key]
+
+    def route_key(self, task: str, prompt: str) -> str:
+        """지연 시간 통계와 SLO를 공유하는 경로 이름 (긴 프롬프트는 작업 종류와 관계없이 "large_prompt")"""
+        if len(prompt) > LARGE_PROMPT_CHARS:
+            return "large_prompt"
+        return task if task in self.routes else "generic"
+
+    def route(self, route_key: str) -> List[str]:
+        """시도할 모델 이름을 순서대로 반환합니다. 뒤로 미뤄진 모델은 건강한 모델 뒤에 둡니다."""
+        candidates = [name for name in self.routes[route_key] if name in self.backends]
+        if not candidates:
+            raise ValueError(f"'{route_key}' 경로에 사용할 수 있는 모델이 없습니다.")
+        now = self._clock()
+        with self._lock:
+            demoted = [name for name in candidates if self._get_stats(route_key, name).demoted_until > now]
+        return [name for name in candidates if name not in demoted] + demoted
+
+    def generate(self, prompt: str, task: str = "generic") -> str:
+        """선택된 순서대로 모델을 호출하고, 실패하면 다음 모델로 넘어갑니다. 모두 실패하면 마지막 예외를 다시 던집니다."""
+        route_key = self.route_key(task, prompt)
+        slo = self.slo[route_key]
+        attempts = []
+        last_error = None
+        for name in self.route(route_key):
+            attempts.append(name)
+            started = self._clock()
+            try:
+                with tracing.span("gemini.model", tracing.CLIENT, **{"gen_ai.request.model": name, "route": route_key}):
+                    text = self.backends[name](prompt)
+            except Exception as e:
+                self._record(route_key, name, self._clock() - started, slo, ok=False)
+                last_error = e
+                logger.warning("모델 %s 호출 실패 (%s): %s", name, route_key, e)
+                continue
+            self._record(route_key, name, self._clock() - started, slo, ok=True)
+            self._record_decision(task, route_key, len(prompt), attempts, name)
+            return text
+        self._record_decision(task, route_key, len(prompt), attempts, None)
+        raise last_error
+
+    def _record(self, route_key: str, name: str, latency: float, slo: float, ok: bool):
+        now = self._clock()
+        with self._lock:
+            stats = self._get_stats(route_key, name)
+            if ok and 0 < stats.demoted_until <= now:
+                # 미뤄둔 기간이 끝난 뒤 첫 성공이면 예전 기록 대신 새 관측값부터 다시 셉니다.
+                stats.ewma_latency = None
+                stats.recent.clear()
+                stats.demoted_until = 0.0
+            stats.observe(latency, ok)
+            if ok and latency > slo:
+                stats.slo_misses += 1
+            slow = stats.ewma_latency is not None and stats.ewma_latency > slo
+            if slow or stats.error_rate > ERROR_BUDGET:
+                stats.demoted_until = now + self.demotion_seconds
+
+    def _record_decision(self, task: str, route_key: str, prompt_chars: int, attempts: list, served_by: Optional[str]):
+        # 시도 횟수를 먼저 봅니다. 기본 모델이 뒤로 밀려 있다가 앞 모델 실패 후 응답한 경우도
+        # 이번 호출에서 실패가 있었으므로 "primary"가 아닌 "fallback_error"입니다.
+        primary = next(name for name in self.routes[route_key] if name in self.backends)
+        if served_by is None:
+            reason = "all_failed"
+        elif len(attempts) > 1:
+            reason = "fallback_error"    # 앞선 모델이 이번 호출에서 실패함
+        elif served_by == primary:
+            reason = "primary"
+        else:
+            reason = "fallback_demoted"  # 기본 모델이 SLO/오류 예산 초과로 뒤로 밀려 있었음
+        with self._lock:
+            self._decisions[(route_key, served_by, reason)] += 1
+            self._recent_decisions.append({
+                "time": time.time(), "task": task, "route": route_key, "prompt_chars": prompt_chars,
+                "attempts": attempts, "served_by": served_by, "reason": reason,
+            })
+
+    def metrics(self) -> dict:
+        """모델별 지연 시간/오류 통계와 라우팅 결정 횟수, 최근 결정 목록"""
+        now = self._clock()
+        with self._lock:
+            return {
+                "models": [
+                    {"route": route_key, "model": name, **stats.to_dict(now)}
+                    for (route_key, name), stats in sorted(self._stats.items())
+                ],
+                "decisions": [
+                    {"route": route_key, "served_by": served_by, "reason": reason, "count": count}
+                    for (route_key, served_by, reason), count in sorted(self._decisions.items(), key=str)
+                ],
+                "recent": list(self._recent_decisions),
+            }
+
+class FakeModel:
+    """지연 시간과 실패 확률을 흉내 내는 로컬 모델. (API 키 없이 라우팅을 시험할 때 사용)"""
+
+    def __init__(self, name: str, latency: float, jitter: float = 0.0, error_rate: float = 0.0,
+                 responder: Optional[Callable[[str], str]] = None, seed: Optional[int] = None):
+        self.name = name
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.responder = responder
+        self._rng = random.Random(seed)
+
+    def __call__(self, prompt: str) -> str:
+        time.sleep(max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter)))
+        if self._rng.random() < self.error_rate:
+            raise RuntimeError(f"{self.name}: 가짜 모델 오류")
+        if self.responder is not None:
+            return self.responder(prompt)
+        return f"[{self.name}] 가짜 응답 ({len(prompt)}자 프롬프트)"
+
+def fake_backends(responder: Optional[Callable[[str], str]] = None) -> Dict[str, FakeModel]:
+    """작은 모델일수록 빠른 가짜 모델 세트. responder를 주면 모든 모델이 그 함수로 응답합니다."""
+    return {
+        FAST_MODEL: FakeModel(FAST_MODEL, latency=0.2, jitter=0.05, responder=responder),
+        DEFAULT_MODEL: FakeModel(DEFAULT_MODEL, latency=0.6, jitter=0.1, responder=responder),
+        LARGE_MODEL: FakeModel(LARGE_MODEL, latency=1.5, jitter=0.3, responder=responder),
+    }
@@ -1,6 +1,6 @@
 # backend/app/models.py
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, ForeignKey, Index, Text, UniqueConstraint, text
 from sqlalchemy.orm import relationship
 from .database import Base
 
@@ -38,6 +38,12 @@ class Player(Base):
     
 class Game(Base):
     __tablename__ = "games"
+    __table_args__ = (
+        # 상대별 전적 집계(GROUP BY opponent_team)와 상대+기간 필터. result까지 넣어 테이블을 읽지 않습니다.
+        Index("ix_games_opponent_team_game_date", "opponent_team", "game_date", "result"),
+        # 최신 경기 순 목록(ORDER BY game_date DESC, id)과 기간 필터
+        Index("ix_games_game_date_desc", text("game_date DESC"), "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     opponent_team = Column(String, nullable=False)
@@ -51,6 +57,12 @@ class Game(Base):
 
 class GameEvent(Base):
     __tablename__ = "game_events"
+    __table_args__ = (
+        # 경기별 이벤트 조회와 경기 삭제 시 cascade 삭제
+        Index("ix_game_events_game_id_event_type", "game_id", "event_type", "player_id"),
+        # 선수별 득점/도움 집계(리더보드)
+        Index("ix_game_events_player_id_event_type", "player_id", "event_type"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     game_id = Column(Integer, ForeignKey("games.id"), nullable=False)
@@ -59,3 +71,81 @@ class GameEvent(Base):
 
     game = relationship("Game", back_populates="events")
     player = relationship("Player")
+
+# --- 실시간 경기(Live match) ---
+class LiveMatch(Base):
+    __tablename__ = "live_matches"
+
+    id = Column(String, primary_key=True) # uuid hex
+    opponent_team = Column(String, nullable=False)
+    game_date = Column(DateTime, nullable=False)
+    status = Column(String, nullable=False, default="LIVE") # "LIVE" 또는 "CLOSED"
+    game_id = Column(Integer, ForeignKey("games.id"), nullable=True) # 종료 후 생성된 경기
+
+class LiveMatchEvent(Base):
+    __tablename__ = "live_match_events"
+
+    id = Column(Integer, primary_key=True, index=True)
+    match_id = Column(String, ForeignKey("live_matches.id"), nullable=False, index=True)
+    player_id = Column(Integer, ForeignKey("players.id"), nullable=True) # 상대 득점 등은 선수 없음
+    event_type = Column(String, nullable=False) # GOAL, ASSIST, OPP_GOAL, YELLOW_CARD, RED_CARD, SUB_IN, SUB_OUT
+    minute = Column(Integer, nullable=True) # 경기 시간(분)
+    recorded_at = Column(DateTime, nullable=False)
+
+# --- 예정된 경기 (AI 분석 사전 생성 대상) ---
+class UpcomingMatch(Base):
+    __tablename__ = "upcoming_matches"
+
+    id = Column(Integer, primary_key=True, index=True)
+    opponent_team = Column(String, nullable=False)
+    match_date = Column(DateTime, nullable=False)
+    opponent_style = Column(String, nullable=True) # 포메이션 추천에 쓸 상대 전술 스타일
+
+# --- 저장된 AI 분석 결과 ---
+class AIReport(Base):
+    __tablename__ = "ai_reports"
+    __table_args__ = (UniqueConstraint("kind", "target_key"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, nullable=False) # "player_analysis", "game_report", "formation"
+    target_key = Column(String, nullable=False) # 선수 ID, 경기 ID, 상대 팀 등 분석 대상
+    input_hash = Column(String, nullable=False) # 프롬프트 입력의 해시 (입력이 바뀌면 오래된 결과)
+    report = Column(Text, nullable=False)
+    created_at = Column(DateTime, nullable=False)
+
+# --- 날짜별 사전 생성 LLM 호출 수 (precompute.DailyBudget) ---
+class PrecomputeUsage(Base):
+    __tablename__ = "precompute_usage"
+
+    day = Column(Date, primary_key=True)
+    calls = Column(Integer, nullable=False, default=0)
+
+# --- 팀 레이팅 (Elo) ---
+class TeamRating(Base):
+    __tablename__ = "team_ratings"
+
+    team = Column(String, primary_key=True) # 상대 팀 이름 (우리 팀은 schemas.OUR_TEAM)
+    rating = Column(Float, nullable=False)
+    games = Column(Integer, nullable=False, default=0) # 레이팅에 반영된 경기 수
+
+class RatingHistory(Base):
+    __tablename__ = "rating_history"
+    __table_args__ = (
+        # 경기 순서(날짜, ID)대로 읽기 / 특정 경기 이후 기록 되돌리기
+        Index("ix_rating_history_game_date_game_id", "game_date", "game_id"),
+        # 상대별 레이팅 변화 조회
+        Index("ix_rating_history_opponent_team_game_date", "opponent_team", "game_date"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    # 경기가 삭제된 뒤에도 되돌릴 위치(날짜)를 찾을 수 있도록 외래 키를 두지 않습니다.
+    game_id = Column(Integer, nullable=False, unique=True)
+    game_date = Column(DateTime, nullable=False)
+    opponent_team = Column(String, nullable=False)
+    our_rating = Column(Float, nullable=False) # 경기 전 우리 팀 레이팅
+    opponent_rating = Column(Float, nullable=False) # 경기 전 상대 팀 레이팅
+    expected_score = Column(Float, nullable=False) # 우리 팀 기대 승점 (승 1, 무 0.5, 패 0)
+    rating_change = Column(Float, nullable=False) # 우리 팀 레이팅 변화량 (상대 팀은 반대로 변함)
+    # 반영한 경기의 점수 (ratings.in_sync가 경기 기록과 비교)
+    our_score = Column(Integer)
+    opponent_score = Column(Integer)
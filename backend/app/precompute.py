@@ -0,0 +1,271 @@
+# backend/app/precompute.py
+
+import itertools
+import logging
+import os
+import queue
+import threading
+from datetime import date, datetime, timedelta
+from typing import Callable, Optional
+
+from sqlalchemy import update
+
+from . import admission, ai_reports, changes, crud, models, tracing
+from .database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# 정기 사전 생성 일정 (cron 형식: 분 시 일 월 요일). 기본값은 매일 06:00
+PRECOMPUTE_CRON = os.getenv("PRECOMPUTE_CRON", "0 6 * * *")
+# 하루에 사전 생성에 쓸 수 있는 최대 LLM 호출 수 (대화형 요청은 포함하지 않음)
+DAILY_LLM_BUDGET = int(os.getenv("PRECOMPUTE_DAILY_BUDGET", "30"))
+# 며칠 안에 예정된 경기의 포메이션 추천을 미리 만들지
+UPCOMING_LOOKAHEAD_DAYS = 14
+# 정기 실행 때 리포트가 없으면 만들어 둘 최근 경기의 범위(일)
+RECENT_GAME_DAYS = 7
+# 다른 AI 요청이 처리 중이면 이 간격(초)으로 한가해질 때까지 기다립니다.
+IDLE_POLL_SECONDS = 2.0
+
+# 작업 우선순위 (작을수록 먼저)
+_PRIORITY = {"game_report": 0, "formation": 1, "upcoming": 2, "scan": 2}
+
+class CronSchedule:
+    """"분 시 일 월 요일" 다섯 필드의 간단한 cron 표현식 (*, 숫자, 쉼표 목록, a-b 범위, */n 간격 지원)"""
+
+    _RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 6)]
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"cron 표현식은 다섯 필드여야 합니다: {expression!r}")
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, self.weekdays = [
+            self._parse(field, low, high) for field, (low, high) in zip(fields, self._RANGES)
+        ]
+        # 일과 요일이 모두 지정되면 cron처럼 둘 중 하나만 맞아도 실행합니다.
+        self._day_or_weekday = fields[2] != "*" and fields[4] != "*"
+
+    @staticmethod
+    def _parse(field: str, low: int, high: int) -> set:
+        values = set()
+        for part in field.split(","):
+            spec, _, step = part.partition("/")
+            if spec == "*":
+                start, end = low, high
+            elif "-" in spec:
+                start, end = (int(v) for v in spec.split("-"))
+            else:
+                start = end = int(spec)
+            if start < low or end > high:
+                raise ValueError(f"cron 필드 값이 범위({low}-{high})를 벗어났습니다: {field!r}")
+            values.update(range(start, end + 1, int(step) if step else 1))
+        return values
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day_ok = moment.day in self.days
+        weekday_ok = (moment.weekday() + 1) % 7 in self.weekdays # cron은 일요일이 0
+        return (day_ok or weekday_ok) if self._day_or_weekday else (day_ok and weekday_ok)
+
+    def next_after(self, moment: datetime) -> datetime:
+        """moment 이후 처음으로 일정에 맞는 시각(분 단위)"""
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=366 * 5)
+        while candidate < limit:
+            if candidate.month not in self.months or not self._day_matches(candidate):
+                candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+            elif candidate.hour not in self.hours:
+                candidate = (candidate + timedelta(hours=1)).replace(minute=0)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"실행 시각을 찾을 수 없는 cron 표현식입니다: {self.expression!r}")
+
+class DailyBudget:
+    """날짜가 바뀌면 초기화되는 하루 호출 수 한도
+
+    사용량은 precompute_usage 테이블에 날짜별로 저장하므로, 서버를 다시 시작해도 같은 날에는 한도가 이어집니다.
+    """
+
+    def __init__(self, limit: int, session_factory=SessionLocal):
+        self.limit = limit
+        self._session_factory = session_factory
+
+    def used_today(self) -> int:
+        db = self._session_factory()
+        try:
+            usage = db.get(models.PrecomputeUsage, date.today())
+            return usage.calls if usage else 0
+        finally:
+            db.close()
+
+    def exhausted(self) -> bool:
+        return self.used_today() >= self.limit
+
+    def try_spend(self) -> bool:
+        """한도가 남아 있으면 오늘 사용량을 하나 늘리고 True. 한도 확인과 증가를 UPDATE 한 번으로 처리합니다."""
+        if self.limit <= 0:
+            return False
+        today = date.today()
+        usage = models.PrecomputeUsage
+        db = self._session_factory()
+        try:
+            spent = db.execute(
+                update(usage).where(usage.day == today, usage.calls < self.limit).values(calls=usage.calls + 1)
+            ).rowcount
+            if not spent and db.get(usage, today) is None:
+                db.add(usage(day=today, calls=1))
+                spent = 1
+            db.commit()
+            return bool(spent)
+        finally:
+            db.close()
+
+class Precomputer:
+    """경기 기록 직후와 정기 일정에 맞춰, 다른 AI 요청이 없을 때 경기 리포트와 포메이션 추천을 미리 만들어 둡니다.
+
+    - 경기가 생성되면(changes 이벤트) 그 경기의 리포트와 예정된 상대들의 포메이션 추천을 갱신합니다.
+    - cron 일정마다 예정된 상대와 최근 경기를 훑어 없거나 오래된 결과를 다시 만듭니다.
+    - 저장된 결과의 입력 해시가 같으면 LLM을 호출하지 않으며, 하루 호출 수 한도를 넘지 않습니다.
+    """
+
+    def __init__(self, session_factory=SessionLocal, schedule: Optional[str] = PRECOMPUTE_CRON,
+                 daily_budget: int = DAILY_LLM_BUDGET, controller: admission.AdmissionController = None):
+        self._session_factory = session_factory
+        self.schedule = CronSchedule(schedule) if schedule else None
+        self.budget = DailyBudget(daily_budget, session_factory)
+        self._controller = controller or admission.controller
+        self._generate = None
+        self._queue = queue.PriorityQueue()
+        self._queued = set()
+        self._queued_lock = threading.Lock()
+        self._sequence = itertools.count()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._listening = False
+        self.next_scan = None
+        self.counts = {"generated": 0, "skipped_fresh": 0, "skipped_budget": 0, "failed": 0}
+
+    def start(self, generate: Callable[..., str]):
+        """generate는 services.generate_text_from_gemini와 같은 (prompt, task) -> text 함수입니다."""
+        self._generate = generate
+        if not self._listening:
+            changes.broadcaster.add_listener(self.on_change)
+            self._listening = True
+        if self._thread is None:
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="ai-precompute", daemon=True)
+            self._thread.start()
+        # 서버가 꺼져 있던 동안 빠진 결과를 채웁니다. (이미 최신인 결과는 LLM을 호출하지 않습니다)
+        self.enqueue("scan")
+
+    def stop(self):
+        self._stopped.set()
+        self._queue.put((-1, -1, "stop", None))
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def enqueue(self, kind: str, payload=None):
+        with self._queued_lock:
+            if (kind, payload) in self._queued:
+                return
+            self._queued.add((kind, payload))
+        self._queue.put((_PRIORITY[kind], next(self._sequence), kind, payload))
+
+    def on_change(self, event: dict):
+        """변경 리스너: 경기가 생성/수정되면 그 경기의 리포트와 예정된 상대의 포메이션 추천을 예약합니다."""
+        if event["entity"] == "game" and event["action"] in ("created", "updated"):
+            self.enqueue("game_report", event["id"])
+            self.enqueue("upcoming")
+
+    def status(self) -> dict:
+        return {
+            "schedule": self.schedule.expression if self.schedule else None,
+            "next_scan": self.next_scan,
+            "daily_budget": self.budget.limit,
+            "budget_used_today": self.budget.used_today(),
+            "pending": self._queue.qsize(),
+            **self.counts,
+        }
+
+    def _run(self):
+        if self.schedule:
+            self.next_scan = self.schedule.next_after(datetime.now())
+        while not self._stopped.is_set():
+            timeout = 60.0
+            if self.next_scan:
+                now = datetime.now()
+                if now >= self.next_scan:
+                    self.enqueue("scan")
+                    self.next_scan = self.schedule.next_after(now)
+                timeout = min(timeout, max(0.1, (self.next_scan - now).total_seconds()))
+            try:
+                _, _, kind, payload = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                continue
+            if kind == "stop":
+                break
+            with self._queued_lock:
+                self._queued.discard((kind, payload))
+            try:
+                with tracing.tracer.trace(f"precompute {kind}", kind=tracing.INTERNAL, **{"precompute.payload": repr(payload)}):
+                    self._run_job(kind, payload)
+            except Exception:
+                self.counts["failed"] += 1
+                logger.exception("AI 결과 사전 생성 실패: %s %s", kind, payload)
+
+    def _run_job(self, kind: str, payload):
+        db = self._session_factory()
+        try:
+            if kind == "scan":
+                since = date.today() - timedelta(days=RECENT_GAME_DAYS)
+                for game in crud.filter_by_game_date(db.query(models.Game), start_date=since):
+                    self.enqueue("game_report", game.id)
+                self._enqueue_upcoming(db)
+            elif kind == "upcoming":
+                self._enqueue_upcoming(db)
+            elif kind == "game_report":
+                prompt = ai_reports.game_report_prompt(db, payload)
+                if prompt is not None:
+                    self._precompute(db, ai_reports.GAME_REPORT, str(payload), prompt, "recap")
+            elif kind == "formation":
+                opponent_team, opponent_style = payload
+                prompt = ai_reports.formation_prompt(db, opponent_team, opponent_style)
+                if prompt is not None:
+                    key = ai_reports.formation_key(opponent_team, opponent_style)
+                    self._precompute(db, ai_reports.FORMATION, key, prompt, "formation")
+        finally:
+            db.close()
+
+    def _enqueue_upcoming(self, db):
+        until = datetime.now() + timedelta(days=UPCOMING_LOOKAHEAD_DAYS)
+        for match in crud.get_upcoming_matches(db):
+            if match.match_date <= until:
+                self.enqueue("formation", (match.opponent_team, match.opponent_style or None))
+
+    def _precompute(self, db, kind: str, target_key: str, prompt: ai_reports.Prompt, task: str):
+        db_report, stale = ai_reports.get_stored(db, kind, target_key, prompt)
+        if db_report is not None and not stale:
+            self.counts["skipped_fresh"] += 1
+            return
+        if self.budget.exhausted():
+            self._skip_budget(kind, target_key)
+            return
+        # 대화형 요청이 처리 중이거나 대기 중이면 끝날 때까지 기다립니다.
+        while not self._controller.idle():
+            if self._stopped.wait(IDLE_POLL_SECONDS):
+                return
+        with self._controller.slot(admission.BATCH):
+            # 기다리는 동안 중지되거나 자리를 얻지 못한 작업이 한도를 쓰지 않도록, 호출 직전에 차감합니다.
+            if not self.budget.try_spend():
+                self._skip_budget(kind, target_key)
+                return
+            ai_reports.generate_and_store(db, kind, target_key, prompt, task, self._generate)
+        self.counts["generated"] += 1
+
+    def _skip_budget(self, kind: str, target_key: str):
+        self.counts["skipped_budget"] += 1
+        logger.info("하루 사전 생성 한도(%d회)를 모두 사용하여 건너뜁니다: %s %s", self.budget.limit, kind, target_key)
+
+scheduler = Precomputer()
@@ -0,0 +1,126 @@
+# backend/app/prompts.py
+
+import hashlib
+from typing import Optional
+
+from . import models, tracing
+
+# 선수 분석 프롬프트의 공통 코칭 지시문
+PLAYER_ANALYSIS_INSTRUCTIONS = """당신은 경험 많은 축구 코치입니다. 아래 선수의 능력치를 바탕으로, 이 선수의 강점과 약점을 분석하고, 개선을 위한 구체적인 훈련 방법을 추천해주세요.
+    분석 내용은 선수가 직접 읽는다고 생각하고, 친근하고 동기부여가 되는 말투로 작성해주세요."""
+
+PLAYER_ANALYSIS_SECTIONS = ("강점", "약점", "추천 훈련법")
+
+# 스쿼드 분석 응답에서 선수별 구간을 나누는 표시
+SQUAD_SECTION_START = "<<<PLAYER {player_id}>>>"
+SQUAD_SECTION_END = "<<<END {player_id}>>>"
+
+def input_hash(text: str) -> str:
+    """프롬프트 입력이 바뀌었는지 확인하기 위한 해시"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def player_stats_string(player: models.Player) -> str:
+    """선수 객체로부터 유효한 모든 능력치 정보를 문자열로 만듭니다."""
+    stats_map = {
+        "체력": player.stamina, "속도": player.speed, "슈팅 정확도": player.shooting_accuracy,
+        "드리블": player.dribbling, "패스": player.passing, "골 결정력": player.finishing,
+        "크로스": player.crossing, "시야": player.vision, "가로채기": player.interceptions,
+        "태클": player.tackling, "헤딩": player.heading, "선방 능력": player.saving,
+        "수비 조율": player.defense_coordination, "캐칭": player.catching
+    }
+
+    # 값이 있는 (None이 아닌) 능력치만 필터링하여 문자열로 만듭니다.
+    valid_stats = [f"- {name}: {value} / 100" for name, value in stats_map.items() if value is not None]
+
+    if not valid_stats:
+        return "입력된 능력치 정보가 없습니다."
+
+    return "\n".join(valid_stats)
+
+def player_profile(player: models.Player) -> str:
+    """선수 분석에 들어가는 선수 한 명의 정보 (저장된 분석이 최신인지 비교할 때도 사용)"""
+    return f"""- 선수 이름: {player.name}
+    - 포지션: {player.position}
+    - 주발: {player.dominant_foot}
+    {player_stats_string(player)}"""
+
+@tracing.traced("prompt.player_analysis")
+def player_analysis_prompt(player: models.Player) -> str:
+    return f"""
+    {PLAYER_ANALYSIS_INSTRUCTIONS}
+
+    {player_profile(player)}
+
+    결과는 '강점', '약점', '추천 훈련법' 세 가지 항목으로 명확하게 구분해서 설명해줘.
+    """
+
+@tracing.traced("prompt.squad_analysis")
+def squad_analysis_prompt(players: list) -> str:
+    """여러 선수의 분석을 한 번에 요청하고, 선수별 결과를 표시 줄 사이에 쓰도록 지시합니다."""
+    example_start = SQUAD_SECTION_START.format(player_id=7)
+    example_end = SQUAD_SECTION_END.format(player_id=7)
+    player_blocks = "\n\n".join(f"    ### [ID {player.id}]\n    {player_profile(player)}" for player in players)
+    return f"""
+    {PLAYER_ANALYSIS_INSTRUCTIONS.replace("아래 선수의", f"아래 {len(players)}명의 선수 각각의")}
+    각 선수의 결과는 '강점', '약점', '추천 훈련법' 세 가지 항목으로 명확하게 구분해서 설명해줘.
+
+    ## 출력 형식 (반드시 지켜주세요)
+    선수마다 아래처럼 시작 줄과 끝 줄 사이에 분석을 작성하고, 표시 줄의 숫자는 선수 ID를 그대로 쓰세요.
+    표시 줄 밖에는 아무것도 쓰지 마세요.
+    {example_start}
+    (ID 7 선수의 강점, 약점, 추천 훈련법)
+    {example_end}
+
+    ## 선수 목록
+{player_blocks}
+    """
+
+@tracing.traced("prompt.game_report")
+def game_report_prompt(game: models.Game) -> str:
+    return f"""
+    당신은 전문 축구 경기 분석가입니다. 아래 경기 결과를 바탕으로, 우리 팀 'Oracle'의 입장에서 흥미로운 뉴스 기사 스타일의 경기 요약 리포트를 작성해주세요.
+
+    - 경기 날짜: {game.game_date.strftime('%Y년 %m월 %d일')}
+    - 상대 팀: {game.opponent_team}
+    - 우리 팀 (Oracle) 득점: {game.our_score}
+    - 상대 팀 득점: {game.opponent_score}
+    - 경기 결과: {'승리' if game.result == 'WIN' else '패배' if game.result == 'LOSE' else '무승부'}
+
+    리포트에는 경기의 전반적인 흐름, 승패의 결정적인 요인, 그리고 마지막에 SNS 공유를 위한 재치있는 해시태그를 3개 이상 포함해주세요.
+    """
+
+@tracing.traced("prompt.formation")
+def formation_prompt(players: list, opponent_team: str, opponent_stat=None, opponent_style: Optional[str] = None,
+                     matchup=None) -> str:
+    """opponent_stat은 상대 팀 전적(OpponentStats와 같은 필드)이며, 첫 경기면 None입니다.
+    matchup은 현재 팀 레이팅(ratings.Matchup)이며, 없으면 레이팅 정보를 넣지 않습니다."""
+    player_list_str = "\n".join([f"### {p.name}\n- 포지션: {p.position}\n{player_stats_string(p)}\n" for p in players])
+
+    opponent_info_str = f"상대팀 '{opponent_team}'은(는) 우리와 총 {opponent_stat.total_games}번 붙어서 {opponent_stat.wins}승 {opponent_stat.draws}무 {opponent_stat.losses}패를 기록했습니다." if opponent_stat else f"상대팀 '{opponent_team}'과(와)는 첫 경기입니다."
+    if matchup is not None and matchup.opponent_games:
+        # 레이팅은 다른 상대와의 경기로도 바뀌므로 저장된 추천의 입력 해시에는 넣지 않습니다. (ai_reports.Prompt)
+        opponent_info_str += (
+            f" 최근 경기 결과와 점수 차를 반영한 현재 Elo 레이팅은 우리 팀 {matchup.our_rating:.0f}, "
+            f"상대팀 {matchup.opponent_rating:.0f}으로, 우리 팀의 기대 승점(승 1, 무 0.5, 패 0)은 {matchup.expected_score:.2f}입니다."
+        )
+
+    # 사용자가 입력한 상대팀 전술 스타일 정보 추가
+    opponent_style_info = ""
+    if opponent_style:
+        opponent_style_info = f"3. **상대팀 예상 전술 스타일**: {opponent_style}"
+
+    return f"""
+    당신은 펩 과르디올라와 같은 세계적인 축구 전술가입니다. 아마추어 축구팀 'Oracle'의 다음 경기를 위해 최적의 포메이션과 선발 라인업을 추천해주세요.
+
+    ## 분석 정보
+    1. **상대팀 정보**: {opponent_info_str}
+    {opponent_style_info}
+    2. **우리팀 선수 명단 및 능력치**:
+    {player_list_str}
+
+    ## 요청 사항
+    위 정보를 바탕으로, 다음 항목들을 추천해주세요.
+    1. **추천 포메이션**: (예: 4-3-3) 그 이유를 간단히 설명해주세요.
+    2. **선발 라인업**: 추천 포메이션에 맞춰 각 포지션에 어떤 선수를 배치할지 이름과 이유를 설명해주세요.
+    3. **핵심 전술**: 이 경기에서 우리 팀이 집중해야 할 핵심 전술 포인트를 2~3가지 짚어주세요.
+    """
@@ -0,0 +1,301 @@
+# backend/app/ratings.py
+
+# 우리 팀(Oracle)과 상대 팀들의 Elo 레이팅을 경기 순서(날짜, ID)대로 계산해
+# team_ratings(현재 레이팅)와 rating_history(경기별 변화) 테이블에 저장합니다.
+# - crud.py가 발행하는 변경 이벤트를 받아 바뀐 경기부터만 다시 계산합니다.
+#   가장 최근 경기가 추가되면 그 경기 하나만 반영하고(O(1)), 과거 날짜의 경기가 추가/수정/삭제되면
+#   그 경기 이후의 기록만 되돌린 뒤 다시 계산합니다.
+# - 조회(/stats/ratings, 포메이션 추천 프롬프트)는 저장된 값을 읽기만 합니다.
+#
+#   python -m app.ratings --rebuild   # 모든 경기로 레이팅을 처음부터 다시 계산
+
+import logging
+import threading
+from collections import namedtuple
+from itertools import zip_longest
+from typing import Optional
+
+from sqlalchemy import and_, delete, insert, or_, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from . import changes, models, schemas
+from .database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# 우리 팀은 상대 팀과 같은 테이블에 이 이름으로 저장합니다. (이 이름의 상대 팀 경기는 schemas.py에서 받지 않습니다)
+OUR_TEAM = schemas.OUR_TEAM
+INITIAL_RATING = 1500.0
+# 한 경기에서 움직일 수 있는 기본 레이팅 (점수 차에 따라 margin_multiplier배)
+K_FACTOR = 30.0
+REBUILD_CHUNK_SIZE = 10000
+
+Matchup = namedtuple("Matchup", ["our_rating", "opponent_rating", "expected_score", "opponent_games"])
+
+def expected_score(rating: float, opponent_rating: float) -> float:
+    """rating 팀이 얻을 것으로 기대되는 승점 (승 1, 무 0.5, 패 0)"""
+    return 1.0 / (1.0 + 10 ** ((opponent_rating - rating) / 400))
+
+def margin_multiplier(goal_difference: int) -> float:
+    """점수 차가 클수록 레이팅 변화를 키웁니다. (World Football Elo 방식)"""
+    margin = abs(goal_difference)
+    if margin <= 1:
+        return 1.0
+    if margin == 2:
+        return 1.5
+    return (11 + margin) / 8
+
+def rating_change(our_rating: float, opponent_rating: float, our_score: int, opponent_score: int) -> tuple:
+    """(우리 팀 기대 승점, 우리 팀 레이팅 변화량). 상대 팀은 같은 양만큼 반대로 변합니다."""
+    expected = expected_score(our_rating, opponent_rating)
+    actual = 1.0 if our_score > opponent_score else 0.0 if our_score < opponent_score else 0.5
+    return expected, K_FACTOR * margin_multiplier(our_score - opponent_score) * (actual - expected)
+
+def _rate_games(games, ratings: dict, games_played: dict) -> list:
+    """games를 순서대로 반영해 ratings/games_played를 갱신하고, rating_history에 넣을 행 목록을 반환합니다."""
+    rows = []
+    for game_id, game_date, opponent_team, our_score, opponent_score in games:
+        # in_sync가 경기 기록과 비교할 수 있도록 점수는 경기 기록의 값 그대로 저장합니다.
+        history_scores = {"our_score": our_score, "opponent_score": opponent_score}
+        our_score, opponent_score = our_score or 0, opponent_score or 0
+        ours = ratings.setdefault(OUR_TEAM, INITIAL_RATING)
+        theirs = ratings.setdefault(opponent_team, INITIAL_RATING)
+        expected, change = rating_change(ours, theirs, our_score, opponent_score)
+        ratings[OUR_TEAM] = ours + change
+        ratings[opponent_team] = theirs - change
+        for team in (OUR_TEAM, opponent_team):
+            games_played[team] = games_played.get(team, 0) + 1
+        rows.append({
+            "game_id": game_id, "game_date": game_date, "opponent_team": opponent_team,
+            "our_rating": ours, "opponent_rating": theirs, "expected_score": expected, "rating_change": change,
+            **history_scores,
+        })
+    return rows
+
+def _save_ratings(conn: Connection, ratings: dict, games_played: dict):
+    """ratings에 있는 팀의 현재 레이팅을 덮어씁니다. 반영된 경기가 없어진 팀은 삭제합니다."""
+    conn.execute(delete(models.TeamRating).where(models.TeamRating.team.in_(list(ratings))))
+    rows = [
+        {"team": team, "rating": rating, "games": games_played[team]}
+        for team, rating in ratings.items() if games_played.get(team, 0) > 0
+    ]
+    if rows:
+        conn.execute(insert(models.TeamRating), rows)
+
+def _game_columns():
+    return (models.Game.id, models.Game.game_date, models.Game.opponent_team,
+            models.Game.our_score, models.Game.opponent_score)
+
+def _on_or_after(date_column, id_column, game_date, game_id):
+    """(날짜, ID) 순서에서 (game_date, game_id)와 같거나 뒤인 행.
+    앞의 날짜 범위 조건이 있어야 SQLite가 OR 조건에서도 날짜 인덱스를 범위 검색합니다."""
+    return and_(date_column >= game_date, or_(date_column > game_date, id_column >= game_id))
+
+def _replay_from(conn: Connection, game_date, game_id) -> int:
+    """(game_date, game_id) 이후의 레이팅 기록을 되돌리고, 그 이후 경기를 다시 반영합니다. 반영한 경기 수를 반환합니다."""
+    history = models.RatingHistory
+    after = _on_or_after(history.game_date, history.game_id, game_date, game_id)
+
+    # 되돌릴 기록에서 팀별로 가장 이른 행의 "경기 전" 레이팅이 기준 시점의 레이팅입니다.
+    ratings, rolled_back = {}, {}
+    for opponent_team, our_rating, opponent_rating in conn.execute(
+        select(history.opponent_team, history.our_rating, history.opponent_rating)
+        .where(after).order_by(history.game_date, history.game_id)
+    ):
+        ratings.setdefault(OUR_TEAM, our_rating)
+        ratings.setdefault(opponent_team, opponent_rating)
+        for team in (OUR_TEAM, opponent_team):
+            rolled_back[team] = rolled_back.get(team, 0) + 1
+    conn.execute(delete(history).where(after))
+
+    games = conn.execute(
+        select(*_game_columns())
+        .where(_on_or_after(models.Game.game_date, models.Game.id, game_date, game_id))
+        .order_by(models.Game.game_date, models.Game.id)
+    ).all()
+
+    # 되돌린 기록이 없는 팀은 저장된 현재 레이팅이 기준 시점의 레이팅입니다.
+    teams = {OUR_TEAM, *ratings, *(game.opponent_team for game in games)}
+    stored = {
+        team: (rating, played) for team, rating, played in conn.execute(
+            select(models.TeamRating.team, models.TeamRating.rating, models.TeamRating.games)
+            .where(models.TeamRating.team.in_(list(teams)))
+        )
+    }
+    games_played = {}
+    for team in teams:
+        rating, played = stored.get(team, (INITIAL_RATING, 0))
+        ratings.setdefault(team, rating)
+        games_played[team] = played - rolled_back.get(team, 0)
+
+    rows = _rate_games(games, ratings, games_played)
+    if rows:
+        conn.execute(insert(history), rows)
+    _save_ratings(conn, ratings, games_played)
+    return len(games)
+
+def apply_game_change(conn: Connection, game_id: int) -> int:
+    """경기 하나가 추가/수정/삭제된 뒤 레이팅을 맞춥니다. 그 경기의 이전/현재 위치 중 앞선 쪽부터 다시 계산합니다."""
+    positions = []
+    previous = conn.execute(
+        select(models.RatingHistory.game_date, models.RatingHistory.game_id)
+        .where(models.RatingHistory.game_id == game_id)
+    ).first()
+    if previous is not None:
+        positions.append(tuple(previous))
+    current = conn.execute(
+        select(models.Game.game_date, models.Game.id).where(models.Game.id == game_id)
+    ).first()
+    if current is not None:
+        positions.append(tuple(current))
+    if not positions:
+        return 0
+    return _replay_from(conn, *min(positions))
+
+def rebuild(conn: Connection) -> int:
+    """모든 경기로 레이팅을 처음부터 다시 계산합니다. 반영한 경기 수를 반환합니다."""
+    conn.execute(delete(models.RatingHistory))
+    conn.execute(delete(models.TeamRating))
+    # 읽는 도중 같은 커넥션에 쓰지 않도록 경기 목록을 먼저 모두 읽습니다.
+    games = conn.execute(select(*_game_columns()).order_by(models.Game.game_date, models.Game.id)).all()
+    ratings, games_played = {}, {}
+    for start in range(0, len(games), REBUILD_CHUNK_SIZE):
+        conn.execute(insert(models.RatingHistory),
+                     _rate_games(games[start:start + REBUILD_CHUNK_SIZE], ratings, games_played))
+    _save_ratings(conn, ratings, games_played)
+    return len(games)
+
+def in_sync(conn: Connection) -> bool:
+    """레이팅 기록이 지금의 경기 기록(경기 ID, 점수, 날짜)을 모두 반영하고 있는지 두 테이블을 ID 순서로 비교합니다."""
+    games = models.Game
+    history = models.RatingHistory
+    game_rows = conn.execute(
+        select(games.id, games.our_score, games.opponent_score, games.game_date).order_by(games.id)
+    )
+    history_rows = conn.execute(
+        select(history.game_id, history.our_score, history.opponent_score, history.game_date).order_by(history.game_id)
+    )
+    return all(game is not None and rated is not None and tuple(game) == tuple(rated)
+               for game, rated in zip_longest(game_rows, history_rows))
+
+class RatingEngine:
+    """변경 이벤트를 받아 레이팅 테이블을 갱신하는 리스너
+
+    갱신에 실패하면 dirty 상태가 되어 전체 재계산을 시도하며, 재계산이 성공할 때까지 applied_version을
+    올리지 않습니다. (sync()로 기다리는 조회는 timeout 뒤 그때까지의 값을 읽습니다)
+    """
+
+    def __init__(self, session_factory=SessionLocal):
+        self._session_factory = session_factory
+        self._applied = threading.Condition()
+        self.applied_version = 0
+        self.dirty = False
+
+    def start(self):
+        """변경 이벤트 리스너를 등록하고, 서버가 꺼져 있는 동안 경기 기록이 바뀌었으면 다시 계산합니다."""
+        changes.broadcaster.add_listener(self.on_change)
+        db = self._session_factory()
+        try:
+            conn = db.connection()
+            if not in_sync(conn):
+                rebuild(conn)
+                db.commit()
+        finally:
+            db.close()
+
+    def on_change(self, event: dict):
+        """changes.py 리스너: 바뀐 경기부터 레이팅을 다시 계산합니다."""
+        if event["entity"] == "game" and not self.dirty:
+            try:
+                self._update(apply_game_change, event["id"])
+            except Exception:
+                logger.exception("레이팅 갱신 실패 (경기 %s). 전체를 다시 계산합니다.", event["id"])
+                self.dirty = True
+        if self.dirty:
+            try:
+                self._update(rebuild)
+            except Exception:
+                logger.exception("레이팅 전체 재계산 실패. 다음 변경 때 다시 시도합니다.")
+                return
+            self.dirty = False
+        with self._applied:
+            self.applied_version = max(self.applied_version, event["version"])
+            self._applied.notify_all()
+
+    def _update(self, update, *args):
+        db = self._session_factory()
+        try:
+            update(db.connection(), *args)
+            db.commit()
+        finally:
+            db.close()
+
+    def sync(self, timeout: float = 1.0):
+        """지금까지 커밋된 변경이 반영될 때까지 잠시 기다립니다. (쓰기 직후 조회 일관성)"""
+        target = changes.broadcaster.version
+        with self._applied:
+            self._applied.wait_for(lambda: self.applied_version >= target, timeout)
+
+# 프로세스 전체에서 하나만 사용하는 레이팅 엔진
+engine = RatingEngine()
+
+def get_ratings(db: Session) -> list:
+    """모든 팀의 현재 레이팅 (높은 순). 상대 팀은 우리 팀의 기대 승점도 함께 반환합니다."""
+    engine.sync()
+    rows = db.execute(select(models.TeamRating).order_by(models.TeamRating.rating.desc())).scalars().all()
+    ours = next((row.rating for row in rows if row.team == OUR_TEAM), INITIAL_RATING)
+    return [
+        {"team": row.team, "rating": row.rating, "games": row.games,
+         "expected_score": None if row.team == OUR_TEAM else expected_score(ours, row.rating)}
+        for row in rows
+    ]
+
+def get_matchups(db: Session, opponent_teams) -> dict:
+    """여러 상대 팀의 Matchup을 한 번의 조회로 반환합니다. (상대 팀 이름 -> Matchup)"""
+    engine.sync()
+    opponent_teams = set(opponent_teams)
+    stored = {
+        team: (rating, played) for team, rating, played in db.execute(
+            select(models.TeamRating.team, models.TeamRating.rating, models.TeamRating.games)
+            .where(models.TeamRating.team.in_([OUR_TEAM, *opponent_teams]))
+        )
+    }
+    ours = stored.get(OUR_TEAM, (INITIAL_RATING, 0))[0]
+    matchups = {}
+    for opponent_team in opponent_teams:
+        theirs, played = stored.get(opponent_team, (INITIAL_RATING, 0))
+        matchups[opponent_team] = Matchup(ours, theirs, expected_score(ours, theirs), played)
+    return matchups
+
+def get_matchup(db: Session, opponent_team: str) -> Matchup:
+    """우리 팀과 상대 팀의 현재 레이팅. 처음 만나는 상대는 초기 레이팅으로 봅니다."""
+    return get_matchups(db, [opponent_team])[opponent_team]
+
+def get_history(db: Session, opponent_team: Optional[str] = None, limit: int = 50) -> list:
+    """최근 경기부터 레이팅 변화 기록. opponent_team을 주면 그 상대와의 경기만 반환합니다."""
+    engine.sync()
+    query = select(models.RatingHistory)
+    if opponent_team is not None:
+        query = query.where(models.RatingHistory.opponent_team == opponent_team)
+    query = query.order_by(models.RatingHistory.game_date.desc(), models.RatingHistory.game_id.desc()).limit(limit)
+    return db.execute(query).scalars().all()
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    from .database import engine as database_engine
+
+    parser = argparse.ArgumentParser(description="팀 레이팅 관리")
+    parser.add_argument("--rebuild", action="store_true", help="모든 경기로 레이팅을 처음부터 다시 계산")
+    args = parser.parse_args()
+
+    if args.rebuild:
+        started = time.perf_counter()
+        with database_engine.begin() as conn:
+            count = rebuild(conn)
+        print(f"경기 {count}개로 레이팅을 다시 계산했습니다. ({time.perf_counter() - started:.2f}초)")
+    else:
+        with database_engine.connect() as conn:
+            print(f"레이팅 기록이 경기 기록과 {'일치합니다' if in_sync(conn) else '다릅니다 (--rebuild로 다시 계산하세요)'}.")
@@ -1,8 +1,17 @@
 # backend/app/schemas.py
 
-from pydantic import BaseModel
+from pydantic import BaseModel, validator
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional
+
+# 우리 팀 이름. 레이팅(ratings.py)은 우리 팀과 상대 팀을 같은 이름 공간에 저장합니다.
+OUR_TEAM = "Oracle"
+
+def not_our_team(opponent_team: str) -> str:
+    """레이팅은 우리 팀과 상대 팀을 같은 이름 공간에 저장하므로, 우리 팀 이름을 상대 팀으로 받지 않습니다."""
+    if opponent_team == OUR_TEAM:
+        raise ValueError(f"상대 팀 이름으로 우리 팀 이름('{OUR_TEAM}')을 쓸 수 없습니다.")
+    return opponent_team
 
 # Player 관련 스키마
 class PlayerBase(BaseModel):
@@ -83,8 +92,10 @@ class GameCreate(GameBase):
     scorers: list[int] = [] # 득점 선수 ID 리스트
     assisters: list[int] = [] # 도움 선수 ID 리스트
 
+    _check_opponent_team = validator("opponent_team", allow_reuse=True)(not_our_team)
+
 class GameUpdate(GameBase):
-    pass
+    _check_opponent_team = validator("opponent_team", allow_reuse=True)(not_our_team)
 
 class Game(GameBase):
     id: int
@@ -101,6 +112,38 @@ class AnalysisRequest(BaseModel):
 class AnalysisResponse(BaseModel):
     report: str
 
+class StoredAnalysis(BaseModel):
+    report: str
+    created_at: datetime
+    stale: bool # 분석 이후 입력(선수 능력치 등)이 바뀌었는지 여부
+
+class UpcomingMatchCreate(BaseModel):
+    opponent_team: str
+    match_date: datetime
+    opponent_style: Optional[str] = None
+
+class UpcomingMatch(UpcomingMatchCreate):
+    id: int
+
+    class Config:
+        orm_mode = True
+
+class UpcomingMatchWithFormation(UpcomingMatch):
+    formation: Optional[StoredAnalysis] = None # 미리 생성된 포메이션 추천 (아직 없으면 None)
+
+class SquadAnalysisRequest(BaseModel):
+    player_ids: Optional[list[int]] = None # 비어 있으면 전체 선수
+
+class PlayerAnalysis(BaseModel):
+    player_id: int
+    name: str
+    report: str
+
+class SquadAnalysisResponse(BaseModel):
+    reports: list[PlayerAnalysis]
+    failed_player_ids: list[int] # 재시도 후에도 결과를 얻지 못한 선수
+    llm_calls: int
+
 # --- 수정된 부분 ---
 class FormationRequest(BaseModel):
     opponent_team: str
@@ -120,4 +163,70 @@ class PlayerStats(BaseModel):
     name: str
     goals: int
     assists: int
-    points: int # 공격 포인트 (득점 + 도움)
\ No newline at end of file
+    points: int # 공격 포인트 (득점 + 도움)
+
+class PlayerOpponentStats(BaseModel):
+    opponent_team: str
+    goals: int
+    assists: int
+
+class PlayerSummary(PlayerStats):
+    games: int # 득점/도움을 기록한 경기 수
+    by_opponent: list[PlayerOpponentStats] = []
+
+# --- 팀 레이팅 스키마 ---
+class TeamRating(BaseModel):
+    team: str
+    rating: float
+    games: int
+    expected_score: Optional[float] = None # 우리 팀이 이 팀을 상대로 기대하는 승점 (우리 팀 행은 None)
+
+class RatingHistoryEntry(BaseModel):
+    game_id: int
+    game_date: datetime
+    opponent_team: str
+    our_rating: float # 경기 전
+    opponent_rating: float # 경기 전
+    expected_score: float
+    rating_change: float
+
+    class Config:
+        orm_mode = True
+
+# --- 경기 시뮬레이션 스키마 ---
+class Scoreline(BaseModel):
+    our_score: int
+    opponent_score: int
+    probability: float
+
+class SimulationResult(BaseModel):
+    opponent_team: str
+    simulations: int
+    games_played: int # 추정에 쓴 상대와의 경기 수 (0이면 팀 평균으로 시뮬레이션)
+    expected_goals_for: float
+    expected_goals_against: float
+    win: float
+    draw: float
+    loss: float
+    scorelines: list[Scoreline] = [] # 확률이 높은 순
+
+# --- 실시간 경기(Live match) 스키마 ---
+class LiveMatchCreate(BaseModel):
+    opponent_team: str
+    game_date: Optional[datetime] = None # 생략하면 현재 시각
+
+    _check_opponent_team = validator("opponent_team", allow_reuse=True)(not_our_team)
+
+class LiveEventCreate(BaseModel):
+    event_type: str # GOAL, ASSIST, OPP_GOAL, YELLOW_CARD, RED_CARD, SUB_IN, SUB_OUT
+    player_id: Optional[int] = None
+    minute: Optional[int] = None
+
+class LiveScoreboard(BaseModel):
+    match_id: str
+    opponent_team: str
+    game_date: datetime
+    our_score: int
+    opponent_score: int
+    event_count: int
+    players: Dict[int, Dict[str, int]] # 선수 ID별 이벤트 종류별 횟수
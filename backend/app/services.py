@@ -1,20 +1,39 @@
 import os
 import google.generativeai as genai
 
+from . import model_router, squad_analysis, tracing
+
 # .env 파일에서 환경 변수 로드
 # main.py에서 uvicorn으로 실행될 때의 현재 작업 디렉토리는 backend/ 입니다.
 
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
-if not GEMINI_API_KEY:
-    raise ValueError("GEMINI_API_KEY가 설정되지 않았습니다. .env 파일을 확인하세요.")
+# GEMINI_FAKE_MODELS=1 이면 API 키 없이 지연 시간만 흉내 내는 가짜 모델로 동작합니다. (로컬 테스트용)
+USE_FAKE_MODELS = os.getenv("GEMINI_FAKE_MODELS") == "1"
+
+def _gemini_backend(model_name: str):
+    model = genai.GenerativeModel(model_name)
+
+    def generate(prompt: str) -> str:
+        response = model.generate_content(prompt)
+        return response.text
+    return generate
 
-genai.configure(api_key=GEMINI_API_KEY)
+if USE_FAKE_MODELS:
+    # 스쿼드 분석 프롬프트에도 형식에 맞게 답하도록 squad_analysis의 가짜 응답을 넣어 줍니다.
+    backends = model_router.fake_backends(responder=squad_analysis.fake_response)
+else:
+    if not GEMINI_API_KEY:
+        raise ValueError("GEMINI_API_KEY가 설정되지 않았습니다. .env 파일을 확인하세요.")
+    genai.configure(api_key=GEMINI_API_KEY)
+    backends = {name: _gemini_backend(name) for name in model_router.MODEL_NAMES}
 
-# 사용 가능한 모델 리스트에 있는 'gemini-flash-latest' 모델로 변경합니다.
-model = genai.GenerativeModel('gemini-flash-latest')
+# 작업 종류와 프롬프트 크기, 관측된 지연 시간에 따라 모델을 고릅니다.
+router = model_router.ModelRouter(backends)
 
-def generate_text_from_gemini(prompt: str) -> str:
-    """Gemini API를 호출하여 텍스트를 생성합니다."""
-    response = model.generate_content(prompt)
-    return response.text
\ No newline at end of file
+def generate_text_from_gemini(prompt: str, task: str = "generic") -> str:
+    """Gemini API를 호출하여 텍스트를 생성합니다. task는 model_router.TASK_ROUTES의 작업 종류입니다."""
+    with tracing.span("gemini.generate", **{"gen_ai.system": "gemini", "gen_ai.task": task, "prompt.chars": len(prompt)}) as span:
+        text = router.generate(prompt, task=task)
+        span.set_attribute("response.chars", len(text))
+        return text
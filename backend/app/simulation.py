@@ -0,0 +1,125 @@
+# backend/app/simulation.py
+
+import threading
+from collections import namedtuple
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from . import analytics, changes, models
+
+# 상대별 득점/실점률을 팀 평균 쪽으로 당기는 정도. 가상의 "평균 경기"를 이만큼 더한 것처럼 계산합니다.
+# (감마-포아송 사후 평균: 경기가 적은 상대일수록 팀 평균에 가깝게 추정됩니다)
+PRIOR_GAMES = 5.0
+# 기록이 하나도 없을 때 쓰는 경기당 득점/실점
+DEFAULT_GOALS_PER_GAME = 1.5
+
+DEFAULT_SIMULATIONS = 200_000
+MAX_SIMULATIONS = 1_000_000
+# 스코어 분포에서 이 점수 이상은 하나로 묶습니다. (승/무/패 확률은 묶기 전 점수로 계산)
+MAX_GOALS = 10
+# 응답에 넣을 가장 가능성 높은 스코어 수
+TOP_SCORELINES = 10
+
+OpponentRates = namedtuple("OpponentRates", ["games", "goals_for", "goals_against"])
+
+class TeamStrengths:
+    """상대 팀별 경기당 기대 득점(goals_for)과 기대 실점(goals_against)"""
+
+    def __init__(self, team_goals_for: float, team_goals_against: float, opponents: dict):
+        self.team_goals_for = team_goals_for
+        self.team_goals_against = team_goals_against
+        self.opponents = opponents # 상대 팀 이름 -> OpponentRates
+
+    def rates(self, opponent_team: str) -> OpponentRates:
+        """처음 만나는 상대는 팀 평균을 사용합니다."""
+        return self.opponents.get(opponent_team, OpponentRates(0, self.team_goals_for, self.team_goals_against))
+
+def fit(names: list, opponents: np.ndarray, our_scores: np.ndarray, opponent_scores: np.ndarray,
+        prior_games: float = PRIOR_GAMES) -> TeamStrengths:
+    """경기별 (상대 코드, 우리 득점, 상대 득점) 배열로 상대별 포아송 득점/실점률을 추정합니다."""
+    total_games = len(opponents)
+    if total_games:
+        team_for = float(our_scores.sum()) / total_games
+        team_against = float(opponent_scores.sum()) / total_games
+    else:
+        team_for = team_against = DEFAULT_GOALS_PER_GAME
+
+    size = len(names)
+    games = np.bincount(opponents, minlength=size)
+    goals_for = np.bincount(opponents, weights=our_scores, minlength=size)
+    goals_against = np.bincount(opponents, weights=opponent_scores, minlength=size)
+    shrunk_for = (goals_for + prior_games * team_for) / (games + prior_games)
+    shrunk_against = (goals_against + prior_games * team_against) / (games + prior_games)
+
+    return TeamStrengths(team_for, team_against, {
+        names[code]: OpponentRates(int(games[code]), float(shrunk_for[code]), float(shrunk_against[code]))
+        for code in np.flatnonzero(games)
+    })
+
+def simulate(rates: OpponentRates, simulations: int = DEFAULT_SIMULATIONS, seed: Optional[int] = None) -> dict:
+    """두 팀의 득점을 독립 포아송 분포로 한 번에 simulations 경기만큼 뽑아 결과 확률과 스코어 분포를 계산합니다."""
+    rng = np.random.default_rng(seed)
+    ours = rng.poisson(rates.goals_for, simulations)
+    theirs = rng.poisson(rates.goals_against, simulations)
+
+    wins = int(np.count_nonzero(ours > theirs))
+    losses = int(np.count_nonzero(ours < theirs))
+    codes = np.minimum(ours, MAX_GOALS) * (MAX_GOALS + 1) + np.minimum(theirs, MAX_GOALS)
+    scorelines = np.bincount(codes, minlength=(MAX_GOALS + 1) ** 2) / simulations
+    top = np.argsort(scorelines)[::-1][:TOP_SCORELINES]
+
+    return {
+        "simulations": simulations,
+        "games_played": rates.games,
+        "expected_goals_for": round(rates.goals_for, 3),
+        "expected_goals_against": round(rates.goals_against, 3),
+        "win": wins / simulations,
+        "draw": (simulations - wins - losses) / simulations,
+        "loss": losses / simulations,
+        "scorelines": [
+            {"our_score": int(code // (MAX_GOALS + 1)), "opponent_score": int(code % (MAX_GOALS + 1)),
+             "probability": float(scorelines[code])}
+            for code in top if scorelines[code] > 0
+        ],
+    }
+
+class Simulator:
+    """추정한 득점/실점률을 캐시해 두고, 경기가 추가/수정/삭제되면 다음 요청 때 다시 추정합니다."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._strengths = None
+
+    def start(self):
+        changes.broadcaster.add_listener(self.on_change)
+
+    def on_change(self, event: dict):
+        if event["entity"] == "game":
+            with self._lock:
+                self._strengths = None
+
+    def strengths(self, db: Session) -> TeamStrengths:
+        with self._lock:
+            if self._strengths is None:
+                self._strengths = self._fit(db)
+            return self._strengths
+
+    def _fit(self, db: Session) -> TeamStrengths:
+        """통계 엔진이 준비되어 있으면 메모리 배열에서, 아니면 SQL로 경기 점수를 읽어 추정합니다."""
+        if analytics.engine.ready:
+            analytics.engine.sync()
+            return fit(*analytics.engine.score_columns())
+        rows = db.execute(select(models.Game.opponent_team, models.Game.our_score, models.Game.opponent_score)).all()
+        names = sorted({row.opponent_team for row in rows})
+        codes = {name: code for code, name in enumerate(names)}
+        return fit(
+            names,
+            np.array([codes[row.opponent_team] for row in rows], dtype=np.int32),
+            np.array([row.our_score or 0 for row in rows], dtype=np.int32),
+            np.array([row.opponent_score or 0 for row in rows], dtype=np.int32),
+        )
+
+simulator = Simulator()
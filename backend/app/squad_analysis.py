@@ -0,0 +1,111 @@
+# backend/app/squad_analysis.py
+
+import logging
+import re
+from typing import Callable, Dict, List
+
+from sqlalchemy.orm import Session
+
+from . import crud, models, prompts
+
+logger = logging.getLogger(__name__)
+
+REPORT_KIND = "player_analysis"
+
+# 한 번의 호출에 넣을 프롬프트 토큰 수(추정)와 선수 수의 상한
+# 선수 수 상한은 응답 길이(출력 토큰 제한) 때문에 둡니다.
+SQUAD_TOKEN_BUDGET = 4000
+MAX_PLAYERS_PER_CALL = 10
+# 구간 파싱에 실패한 선수만 모아 다시 요청하는 횟수
+MAX_RETRIES = 2
+
+_SECTION_PATTERN = re.compile(r"<<<PLAYER (\d+)>>>(.*?)<<<END \1>>>", re.DOTALL)
+
+# 스쿼드 분석 프롬프트(prompts.squad_analysis_prompt)의 선수 머리줄
+_PLAYER_HEADER_PATTERN = re.compile(r"### \[ID (\d+)\]")
+
+def fake_response(prompt: str) -> str:
+    """가짜 모델(GEMINI_FAKE_MODELS=1)용 응답. 스쿼드 분석 프롬프트에는 선수별 구간 형식을 지켜 답해
+    API 키 없이도 파싱/저장 경로가 동작하게 합니다."""
+    player_ids = _PLAYER_HEADER_PATTERN.findall(prompt)
+    if not player_ids:
+        return f"가짜 응답 ({len(prompt)}자 프롬프트)"
+    body = "\n".join(f"{heading}: 가짜 분석" for heading in prompts.PLAYER_ANALYSIS_SECTIONS)
+    return "\n".join(
+        f"{prompts.SQUAD_SECTION_START.format(player_id=player_id)}\n{body}\n"
+        f"{prompts.SQUAD_SECTION_END.format(player_id=player_id)}"
+        for player_id in player_ids
+    )
+
+def estimate_tokens(text: str) -> int:
+    """대략적인 토큰 수 (한글은 1~2자당 1토큰 정도)"""
+    return len(text) // 2 + 1
+
+def chunk_players(players: list, token_budget: int = SQUAD_TOKEN_BUDGET,
+                  max_players: int = MAX_PLAYERS_PER_CALL) -> List[list]:
+    """공통 지시문과 선수 정보를 합친 프롬프트가 token_budget을 넘지 않도록 선수들을 나눕니다."""
+    base_tokens = estimate_tokens(prompts.squad_analysis_prompt([]))
+    chunks, current, used = [], [], base_tokens
+    for player in players:
+        tokens = estimate_tokens(prompts.player_profile(player)) + 8 # ID 머리줄
+        if current and (used + tokens > token_budget or len(current) >= max_players):
+            chunks.append(current)
+            current, used = [], base_tokens
+        current.append(player)
+        used += tokens
+    if current:
+        chunks.append(current)
+    return chunks
+
+def parse_sections(text: str, player_ids: list) -> Dict[int, str]:
+    """응답에서 선수별 구간을 찾아 {선수 ID: 분석} 으로 반환합니다. 형식이 맞지 않는 구간은 빠집니다."""
+    wanted = set(player_ids)
+    sections = {}
+    for match in _SECTION_PATTERN.finditer(text):
+        player_id = int(match.group(1))
+        body = match.group(2).strip()
+        if player_id not in wanted or player_id in sections:
+            continue
+        if all(heading in body for heading in prompts.PLAYER_ANALYSIS_SECTIONS):
+            sections[player_id] = body
+    return sections
+
+def analyze_squad(db: Session, players: List[models.Player], generate: Callable[..., str]) -> dict:
+    """여러 선수를 묶어 분석을 요청하고, 선수별 결과를 각각 저장합니다.
+
+    generate는 services.generate_text_from_gemini와 같은 (prompt, task) -> text 함수입니다.
+    반환값: {"reports": {선수 ID: 분석}, "failed": [선수 ID], "calls": 호출 횟수}
+    """
+    hashes = {player.id: prompts.input_hash(prompts.player_profile(player)) for player in players}
+    reports = {}
+    calls = 0
+    pending = list(players)
+    # 묶음마다 커밋해도 선수 객체가 만료되지 않게 해, 다음 묶음의 프롬프트를 만들 때 선수를 다시 읽지 않습니다.
+    # (이 함수는 선수 정보를 바꾸지 않습니다)
+    expire_on_commit, db.expire_on_commit = db.expire_on_commit, False
+    try:
+        for _ in range(MAX_RETRIES + 1):
+            if not pending:
+                break
+            failed = []
+            for chunk in chunk_players(pending):
+                calls += 1
+                try:
+                    text = generate(prompts.squad_analysis_prompt(chunk), task="squad_analysis")
+                except Exception as e:
+                    logger.warning("스쿼드 분석 호출 실패 (%d명): %s", len(chunk), e)
+                    failed.extend(chunk)
+                    continue
+                sections = parse_sections(text, [player.id for player in chunk])
+                for player in chunk:
+                    if player.id not in sections:
+                        failed.append(player)
+                        continue
+                    reports[player.id] = sections[player.id]
+                    crud.add_ai_report(db, REPORT_KIND, str(player.id), sections[player.id], hashes[player.id])
+                # 묶음 하나의 결과를 한 번에 커밋합니다.
+                db.commit()
+            pending = failed
+    finally:
+        db.expire_on_commit = expire_on_commit
+    return {"reports": reports, "failed": [player.id for player in pending], "calls": calls}
@@ -0,0 +1,268 @@
+# backend/app/tracing.py
+
+# 요청 하나가 프론트엔드 → API → DB/프롬프트 생성 → Gemini를 거치는 동안 각 구간에 걸린 시간을 기록합니다.
+#
+# - 프론트엔드가 보낸 W3C traceparent 헤더의 trace ID와 샘플링 여부를 이어받습니다.
+# - 샘플링된 요청만 span을 기록하고, 요청(루트 span)이 끝나면 그 요청의 span을 한 줄의
+#   OTLP/JSON(ExportTraceServiceRequest)으로 내보냅니다. OpenTelemetry Collector의
+#   otlpjsonfile 수신기나 Jaeger/Tempo 가져오기 도구로 그대로 읽을 수 있습니다.
+# - 샘플링되지 않은 요청은 ID만 전달하고 span 객체를 만들지 않으므로 추가 비용이 거의 없습니다.
+#
+# 환경 변수
+#   TRACE_EXPORTER      none(기본값) | console | file
+#   TRACE_FILE          file 내보내기 경로 (기본값: traces.jsonl)
+#   TRACE_SAMPLE_RATIO  부모(traceparent)가 없는 요청을 샘플링할 비율 (기본값: 0.1)
+
+import functools
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+TRACE_EXPORTER = os.getenv("TRACE_EXPORTER", "none")
+TRACE_FILE = os.getenv("TRACE_FILE", "traces.jsonl")
+TRACE_SAMPLE_RATIO = float(os.getenv("TRACE_SAMPLE_RATIO", "0.1"))
+SERVICE_NAME = "oracle-ai-manager-api"
+
+# span 종류 (OTLP SpanKind 값)
+INTERNAL, SERVER, CLIENT = 1, 2, 3
+# span 상태 (OTLP StatusCode 값)
+STATUS_UNSET, STATUS_OK, STATUS_ERROR = 0, 1, 2
+
+# 긴 SQL/프롬프트가 트레이스 파일을 키우지 않도록 속성 문자열 길이를 제한합니다.
+MAX_ATTRIBUTE_CHARS = 1000
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+class Span:
+    sampled = True
+
+    def __init__(self, name: str, trace_id: str, parent_span_id: Optional[str], kind: int, spans: list):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_span_id = parent_span_id
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.attributes = {}
+        self.status_code = STATUS_UNSET
+        self.status_message = ""
+        self._spans = spans # 같은 요청의 span 목록 (루트 span이 끝날 때 함께 내보냄)
+
+    def set_attribute(self, key: str, value):
+        self.attributes[key] = value
+
+    def set_error(self, error: BaseException):
+        self.status_code = STATUS_ERROR
+        self.status_message = f"{type(error).__name__}: {error}"[:MAX_ATTRIBUTE_CHARS]
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_otlp(self) -> dict:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [_otlp_attribute(key, value) for key, value in self.attributes.items()],
+            "status": {"code": self.status_code, **({"message": self.status_message} if self.status_message else {})},
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        return span
+
+class _UnsampledSpan:
+    """샘플링되지 않은 요청: trace ID만 이어받아 응답 헤더와 하위 호출에 전달합니다."""
+
+    sampled = False
+
+    def __init__(self, trace_id: str):
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+
+    def set_attribute(self, key: str, value):
+        pass
+
+    def set_error(self, error: BaseException):
+        pass
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-00"
+
+_NOOP = _UnsampledSpan("0" * 32)
+_current: ContextVar = ContextVar("current_span", default=None)
+
+def _otlp_attribute(key: str, value) -> dict:
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)[:MAX_ATTRIBUTE_CHARS]}
+    return {"key": key, "value": typed}
+
+class Exporter:
+    """완료된 요청의 span 목록을 OTLP/JSON 한 줄로 내보냅니다. stream이 None이면 path 파일에 덧붙입니다."""
+
+    def __init__(self, stream=None, path: Optional[str] = None):
+        self._stream = stream
+        self._path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: list):
+        line = json.dumps({
+            "resourceSpans": [{
+                "resource": {"attributes": [_otlp_attribute("service.name", SERVICE_NAME)]},
+                "scopeSpans": [{"scope": {"name": __name__}, "spans": [span.to_otlp() for span in spans]}],
+            }]
+        }, ensure_ascii=False)
+        with self._lock:
+            if self._stream is not None:
+                self._stream.write(line + "\n")
+                self._stream.flush()
+            else:
+                with open(self._path, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+
+def _configured_exporter() -> Optional[Exporter]:
+    if TRACE_EXPORTER == "console":
+        return Exporter(stream=sys.stdout)
+    if TRACE_EXPORTER == "file":
+        return Exporter(path=TRACE_FILE)
+    return None
+
+class Tracer:
+    def __init__(self, exporter: Optional[Exporter] = None, sample_ratio: float = TRACE_SAMPLE_RATIO):
+        self.exporter = exporter
+        self.sample_ratio = sample_ratio
+
+    def _should_sample(self, parent_flags: Optional[str]) -> bool:
+        if self.exporter is None:
+            return False
+        if parent_flags is not None:
+            return int(parent_flags, 16) & 1 == 1 # 부모의 샘플링 결정을 따름
+        return random.random() < self.sample_ratio
+
+    @contextmanager
+    def trace(self, name: str, traceparent: Optional[str] = None, kind: int = SERVER, **attributes):
+        """요청이나 백그라운드 작업 하나의 루트 span. traceparent가 유효하면 그 trace를 이어갑니다."""
+        match = _TRACEPARENT.match(traceparent or "")
+        if match:
+            trace_id, parent_span_id, flags = match.groups()
+        else:
+            trace_id, parent_span_id, flags = os.urandom(16).hex(), None, None
+
+        if not self._should_sample(flags):
+            span = _UnsampledSpan(trace_id)
+            token = _current.set(span)
+            try:
+                yield span
+            finally:
+                _current.reset(token)
+            return
+
+        spans = []
+        span = Span(name, trace_id, parent_span_id, kind, spans)
+        span.attributes.update(attributes)
+        token = _current.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.set_error(e)
+            raise
+        finally:
+            _current.reset(token)
+            span.end_ns = time.time_ns()
+            spans.append(span)
+            self.exporter.export(spans)
+
+tracer = Tracer(_configured_exporter())
+
+def current_span():
+    return _current.get()
+
+def start_span(name: str, kind: int = INTERNAL, **attributes):
+    """현재 span의 자식 span을 시작합니다. 샘플링 중이 아니면 None (end_span에 그대로 넘기면 됩니다)"""
+    parent = _current.get()
+    if parent is None or not parent.sampled:
+        return None
+    span = Span(name, parent.trace_id, parent.span_id, kind, parent._spans)
+    span.attributes.update(attributes)
+    return span
+
+def end_span(span: Optional[Span], error: Optional[BaseException] = None):
+    if span is None:
+        return
+    if error is not None:
+        span.set_error(error)
+    span.end_ns = time.time_ns()
+    span._spans.append(span)
+
+@contextmanager
+def span(name: str, kind: int = INTERNAL, **attributes):
+    """with 블록을 현재 span의 자식 span으로 기록합니다. 샘플링 중이 아니면 아무것도 하지 않습니다."""
+    child = start_span(name, kind, **attributes)
+    if child is None:
+        yield _NOOP
+        return
+    token = _current.set(child)
+    try:
+        yield child
+    except BaseException as e:
+        child.set_error(e)
+        raise
+    finally:
+        _current.reset(token)
+        end_span(child)
+
+def traced(name: str):
+    """함수 호출을 span으로 기록하는 데코레이터. 반환값이 문자열이면 길이(result.chars)도 남깁니다."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name) as current:
+                result = func(*args, **kwargs)
+                if current.sampled and isinstance(result, str):
+                    current.set_attribute("result.chars", len(result))
+                return result
+        return wrapper
+    return decorator
+
+def instrument_engine(engine):
+    """SQLAlchemy 엔진(비동기 엔진은 .sync_engine)이 실행하는 SQL 문마다 span을 기록합니다."""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._trace_span = start_span(
+                f"db {statement.lstrip().split(' ', 1)[0].upper()}", CLIENT,
+                **{"db.system": engine.dialect.name, "db.statement": statement},
+            )
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            end_span(getattr(context, "_trace_span", None))
+            context._trace_span = None
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        context = exception_context.execution_context
+        if context is not None:
+            end_span(getattr(context, "_trace_span", None), exception_context.original_exception)
+            context._trace_span = None
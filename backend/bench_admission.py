@@ -0,0 +1,69 @@
+import argparse
+import statistics
+import threading
+import time
+
+from app.admission import BATCH, INTERACTIVE, AdmissionController, AdmissionRejected
+
+# 사용 예시 (backend/ 폴더에서 실행):
+#   python bench_admission.py --batch 30 --interactive 10
+# 배치 요청이 몰린 직후 대화형 요청이 들어오는 상황을 가짜 AI 호출(고정 지연)로 재현하여,
+# 등급 구분 없이 도착 순서대로 처리할 때와 우선순위 스케줄링을 할 때의 대화형 요청 지연 시간을 비교합니다.
+
+def run_burst(controller: AdmissionController, batch: int, interactive: int, call_seconds: float, priority_classes: bool):
+    latencies = {INTERACTIVE: [], BATCH: []}
+    rejected = {INTERACTIVE: 0, BATCH: 0}
+    lock = threading.Lock()
+
+    def request(kind: str):
+        started = time.perf_counter()
+        try:
+            with controller.slot(kind if priority_classes else BATCH):
+                time.sleep(call_seconds)
+        except AdmissionRejected:
+            with lock:
+                rejected[kind] += 1
+            return
+        with lock:
+            latencies[kind].append(time.perf_counter() - started)
+
+    threads = [threading.Thread(target=request, args=(BATCH,)) for _ in range(batch)]
+    for thread in threads:
+        thread.start()
+    time.sleep(call_seconds / 2)  # 배치 요청이 먼저 자리를 차지한 뒤 대화형 요청이 도착합니다.
+    interactive_threads = [threading.Thread(target=request, args=(INTERACTIVE,)) for _ in range(interactive)]
+    for thread in interactive_threads:
+        thread.start()
+    for thread in threads + interactive_threads:
+        thread.join()
+    return latencies, rejected
+
+def summarize(values: list) -> str:
+    if not values:
+        return f"{'-':>8}{'-':>8}"
+    ordered = sorted(values)
+    return f"{statistics.median(ordered):>8.2f}{ordered[int(len(ordered) * 0.95) - 1 if len(ordered) > 1 else 0]:>8.2f}"
+
+def main():
+    parser = argparse.ArgumentParser(description="AI 요청 우선순위 스케줄링의 효과를 비교합니다.")
+    parser.add_argument("--batch", type=int, default=30)
+    parser.add_argument("--interactive", type=int, default=10)
+    parser.add_argument("--call-seconds", type=float, default=0.2)
+    args = parser.parse_args()
+
+    print(f"{'방식':<14}{'대화형 p50':>10}{'p95':>8}{'배치 p50':>10}{'p95':>8}{'거절(대화/배치)':>16}")
+    for name, priority_classes in (("도착 순서", False), ("우선순위", True)):
+        # 도착 순서 방식은 모든 요청이 같은 등급(같은 대기열, 같은 실행 한도)을 씁니다.
+        limits = {INTERACTIVE: 4, BATCH: 2} if priority_classes else {INTERACTIVE: 4, BATCH: 4}
+        queues = {INTERACTIVE: 16, BATCH: 8} if priority_classes else {INTERACTIVE: 16, BATCH: 64}
+        controller = AdmissionController(max_in_flight=4, in_flight_limits=limits, queue_limits=queues,
+                                         queue_timeouts={INTERACTIVE: 60.0, BATCH: 60.0})
+        latencies, rejected = run_burst(controller, args.batch, args.interactive, args.call_seconds, priority_classes)
+        print(f"{name:<14}{summarize(latencies[INTERACTIVE])}  {summarize(latencies[BATCH])}"
+              f"{rejected[INTERACTIVE]:>10} / {rejected[BATCH]}")
+        if priority_classes:
+            waits = controller.metrics()["classes"]
+            print(f"  대기 시간 p95 (ms): 대화형 {waits[INTERACTIVE]['wait_p95_ms']}, 배치 {waits[BATCH]['wait_p95_ms']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app import crud, models
+from app.analytics import AnalyticsEngine
+
+# 사용 예시 (backend/ 폴더에서 실행):
+#   python bench_analytics.py --games 20000 --events-per-game 50
+# 임시 SQLite 파일에 가상의 데이터를 만든 뒤, SQL 집계와 NumPy 엔진의 결과와 속도를 비교합니다.
+
+def build_database(url: str, players: int, games: int, events_per_game: int, seed: int = 42):
+    rng = random.Random(seed)
+    engine = create_engine(url)
+    models.Base.metadata.create_all(bind=engine)
+    opponents = [f"상대팀{i:02d}" for i in range(30)]
+    start = datetime(2015, 1, 1)
+
+    with engine.begin() as conn:
+        conn.execute(insert(models.Player), [{"name": f"선수{i:03d}"} for i in range(1, players + 1)])
+        game_rows = []
+        for game_id in range(1, games + 1):
+            our, their = rng.randint(0, 5), rng.randint(0, 5)
+            game_rows.append({
+                "id": game_id, "opponent_team": rng.choice(opponents),
+                "game_date": start + timedelta(days=rng.randint(0, 3650)),
+                "our_score": our, "opponent_score": their,
+                "result": "WIN" if our > their else "LOSE" if our < their else "DRAW",
+            })
+        conn.execute(insert(models.Game), game_rows)
+
+        batch = []
+        for game_id in range(1, games + 1):
+            for _ in range(events_per_game):
+                batch.append({"game_id": game_id, "player_id": rng.randint(1, players),
+                              "event_type": rng.choice(("GOAL", "ASSIST"))})
+            if len(batch) >= 100000:
+                conn.execute(insert(models.GameEvent), batch)
+                batch = []
+        if batch:
+            conn.execute(insert(models.GameEvent), batch)
+    return engine
+
+def timed(func, repeat: int) -> float:
+    """func를 repeat번 실행한 평균 시간(ms)을 반환합니다."""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) * 1000 / repeat
+
+def main():
+    parser = argparse.ArgumentParser(description="SQL 집계와 NumPy 통계 엔진을 비교합니다.")
+    parser.add_argument("--players", type=int, default=100)
+    parser.add_argument("--games", type=int, default=20000)
+    parser.add_argument("--events-per-game", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        print(f"데이터 생성 중: 경기 {args.games:,}개, 이벤트 {args.games * args.events_per_game:,}개")
+        db_engine = build_database(url, args.players, args.games, args.events_per_game)
+        Session = sessionmaker(bind=db_engine)
+
+        analytics_engine = AnalyticsEngine(session_factory=Session)
+        db = Session()
+        try:
+            started = time.perf_counter()
+            analytics_engine.load(db)
+            print(f"엔진 적재: {(time.perf_counter() - started) * 1000:.0f} ms")
+
+            window = (date(2018, 1, 1), date(2019, 12, 31))
+            mismatches = analytics_engine.verify_against_sql(db) + analytics_engine.verify_against_sql(db, *window)
+            print("일치 여부:", "OK" if not mismatches else f"{len(mismatches)}건 불일치")
+            for line in mismatches[:10]:
+                print("  ", line)
+
+            cases = [
+                ("리더보드", lambda: crud.get_leaderboard_stats(db), lambda: analytics_engine.leaderboard()),
+                ("상대 팀별 전적", lambda: crud.get_stats_by_opponent(db), lambda: analytics_engine.opponent_stats()),
+                ("리더보드 (2년 기간)", lambda: crud.get_leaderboard_stats(db, *window), lambda: analytics_engine.leaderboard(*window)),
+                ("상대 팀별 전적 (2년 기간)", lambda: crud.get_stats_by_opponent(db, *window), lambda: analytics_engine.opponent_stats(*window)),
+                ("선수 1명 요약", None, lambda: analytics_engine.player_summary(1)),
+            ]
+            print(f"{'집계':<24}{'SQL (ms)':>12}{'NumPy (ms)':>12}{'배속':>10}")
+            for name, sql_func, engine_func in cases:
+                engine_ms = timed(engine_func, args.repeat)
+                if sql_func is None:
+                    print(f"{name:<24}{'-':>12}{engine_ms:>12.2f}{'-':>10}")
+                    continue
+                sql_ms = timed(sql_func, args.repeat)
+                print(f"{name:<24}{sql_ms:>12.2f}{engine_ms:>12.2f}{sql_ms / engine_ms:>9.1f}x")
+        finally:
+            db.close()
+            db_engine.dispose()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import create_engine, event, insert, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app import async_crud, crud, models, schemas
+from app.database import to_async_url
+
+# 사용 예시 (backend/ 폴더에서 실행):
+#   python bench_async_db.py --concurrency 10 50 200 --requests 2000
+# 같은 조회(경기 1개 + events + 선수)를 동기 엔드포인트(def + Session)와
+# 비동기 엔드포인트(async def + AsyncSession)로 만들어 동시 요청을 보내고 처리량과 지연 시간 분포를 비교합니다.
+# 동기 엔드포인트는 FastAPI 스레드풀(기본 40개)에서, 비동기 엔드포인트는 이벤트 루프에서 실행됩니다.
+# 커넥션 풀이 스레드풀보다 작으면 동기 쪽은 세션 정리(스레드풀에서 실행)가 밀려 풀 대기 시간 초과가 날 수 있으므로
+# 두 엔진 모두 --pool-size 크기의 풀을 사용하고, 풀 대기 시간 초과는 실패 건수로 집계합니다.
+# --db-latency를 주면 요청마다 DB 쪽에서 그만큼 기다리는 쿼리를 한 번 더 실행해 서버 DB의 왕복 지연을 흉내 냅니다.
+
+def build_database(url: str, games: int, events_per_game: int, players: int = 30, seed: int = 3):
+    rng = random.Random(seed)
+    engine = create_engine(url)
+    models.Base.metadata.create_all(bind=engine)
+    start = datetime(2015, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(models.Player), [{"name": f"선수{i:03d}"} for i in range(1, players + 1)])
+        conn.execute(insert(models.Game), [
+            {"id": game_id, "opponent_team": f"상대팀{rng.randint(1, 20):02d}",
+             "game_date": start + timedelta(days=game_id), "our_score": 1, "opponent_score": 1, "result": "DRAW"}
+            for game_id in range(1, games + 1)
+        ])
+        conn.execute(insert(models.GameEvent), [
+            {"game_id": game_id, "player_id": rng.randint(1, players), "event_type": rng.choice(("GOAL", "ASSIST"))}
+            for game_id in range(1, games + 1) for _ in range(events_per_game)
+        ])
+    engine.dispose()
+
+def add_latency_function(engine):
+    """DB 드라이버 스레드에서 ms만큼 잠드는 SQL 함수 bench_sleep(ms)를 등록합니다."""
+    @event.listens_for(engine, "connect")
+    def register(dbapi_connection, _):
+        dbapi_connection.create_function("bench_sleep", 1, lambda ms: time.sleep(ms / 1000) or 0)
+
+def build_app(sync_engine, async_engine, db_latency: float) -> FastAPI:
+    SyncSession = sessionmaker(bind=sync_engine)
+    AsyncSessionFactory = sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+    bench_app = FastAPI()
+
+    def get_db():
+        with SyncSession() as db:
+            yield db
+
+    async def get_async_db():
+        async with AsyncSessionFactory() as db:
+            yield db
+
+    @bench_app.get("/sync/games/{game_id}", response_model=schemas.Game)
+    def read_game_sync(game_id: int, db: Session = Depends(get_db)):
+        if db_latency:
+            db.execute(text("SELECT bench_sleep(:ms)"), {"ms": db_latency})
+        return crud.get_game(db, game_id)
+
+    @bench_app.get("/async/games/{game_id}", response_model=schemas.Game)
+    async def read_game_async(game_id: int, db: AsyncSession = Depends(get_async_db)):
+        if db_latency:
+            await db.execute(text("SELECT bench_sleep(:ms)"), {"ms": db_latency})
+        return await async_crud.get_game(db, game_id)
+
+    return bench_app
+
+async def run_load(client: httpx.AsyncClient, path: str, games: int, concurrency: int, total: int, seed: int = 11):
+    """concurrency개의 작업자가 total개의 요청을 나누어 보내고 (성공한 요청의 지연 시간 목록, 실패 수, 전체 시간)을 반환합니다."""
+    rng = random.Random(seed)
+    game_ids = [rng.randint(1, games) for _ in range(total)]
+    latencies = []
+    failures = 0
+
+    async def worker(ids):
+        nonlocal failures
+        for game_id in ids:
+            started = time.perf_counter()
+            response = await client.get(f"{path}/{game_id}")
+            if response.status_code != 200:
+                failures += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(game_ids[i::concurrency]) for i in range(concurrency)))
+    return latencies, failures, time.perf_counter() - started
+
+def percentile(values: list, pct: float) -> float:
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+async def bench(args, url: str):
+    build_database(url, args.games, args.events_per_game)
+    sync_engine = create_engine(url, pool_size=args.pool_size, max_overflow=0, pool_timeout=args.pool_timeout,
+                                connect_args={"check_same_thread": False})
+    async_engine = create_async_engine(to_async_url(url), pool_size=args.pool_size, max_overflow=0,
+                                       pool_timeout=args.pool_timeout)
+    add_latency_function(sync_engine)
+    add_latency_function(async_engine.sync_engine)
+    # 앱 내부 예외는 500 응답으로 받아 실패 건수로 셉니다.
+    transport = httpx.ASGITransport(app=build_app(sync_engine, async_engine, args.db_latency), raise_app_exceptions=False)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            print(f"{'방식':<8}{'동시 요청':>10}{'처리량 (req/s)':>16}{'p50 (ms)':>10}{'p95 (ms)':>10}{'p99 (ms)':>10}{'실패':>8}")
+            for concurrency in args.concurrency:
+                for name, path in (("sync", "/sync/games"), ("async", "/async/games")):
+                    await run_load(client, path, args.games, concurrency, min(200, args.requests))  # 워밍업
+                    latencies, failures, elapsed = await run_load(client, path, args.games, concurrency, args.requests)
+                    p50 = statistics.median(latencies) if latencies else float("nan")
+                    print(f"{name:<8}{concurrency:>10}{len(latencies) / elapsed:>16.0f}{p50 * 1000:>10.1f}"
+                          f"{percentile(latencies, 95) * 1000:>10.1f}{percentile(latencies, 99) * 1000:>10.1f}{failures:>8}")
+    finally:
+        await async_engine.dispose()
+        sync_engine.dispose()
+
+def main():
+    parser = argparse.ArgumentParser(description="동기/비동기 DB 엔드포인트의 동시 처리 성능을 비교합니다.")
+    parser.add_argument("--games", type=int, default=5000)
+    parser.add_argument("--events-per-game", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--pool-size", type=int, default=40)
+    parser.add_argument("--pool-timeout", type=float, default=5.0, help="커넥션 풀 대기 시간 상한(초)")
+    parser.add_argument("--db-latency", type=float, default=0.0, help="요청마다 추가할 DB 지연(ms)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(bench(args, f"sqlite:///{os.path.join(tmp, 'bench.db')}"))
+
+if __name__ == "__main__":
+    main()
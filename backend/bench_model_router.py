@@ -0,0 +1,72 @@
+import argparse
+import logging
+import statistics
+import time
+from collections import Counter
+
+from app.model_router import DEFAULT_MODEL, FAST_MODEL, LARGE_MODEL, LATENCY_SLO, FakeModel, ModelRouter
+
+# 사용 예시 (backend/ 폴더에서 실행):
+#   python bench_model_router.py --calls 40
+# API 키 없이 지연 시간이 다른 가짜 모델로 라우터를 돌려, 기본 모델이 느려지거나 실패할 때
+# 대체 모델로 넘어갔다가 회복 후 돌아오는 과정을 단계별로 보여줍니다. (시간 단위는 실제의 1/100)
+
+SCALE = 0.01
+
+def build_router(demotion_seconds: float):
+    models = {
+        FAST_MODEL: FakeModel(FAST_MODEL, latency=2.0 * SCALE, jitter=0.5 * SCALE, seed=1),
+        DEFAULT_MODEL: FakeModel(DEFAULT_MODEL, latency=5.0 * SCALE, jitter=1.0 * SCALE, seed=2),
+        LARGE_MODEL: FakeModel(LARGE_MODEL, latency=15.0 * SCALE, jitter=3.0 * SCALE, seed=3),
+    }
+    slo = {key: seconds * SCALE for key, seconds in LATENCY_SLO.items()}
+    return models, ModelRouter(models, slo=slo, demotion_seconds=demotion_seconds)
+
+def run_phase(router: ModelRouter, name: str, task: str, calls: int, prompt: str = "경기 요약"):
+    served = Counter()
+    latencies = []
+    failures = 0
+    for _ in range(calls):
+        started = time.perf_counter()
+        try:
+            text = router.generate(prompt, task=task)
+        except Exception:
+            failures += 1
+            continue
+        latencies.append(time.perf_counter() - started)
+        served[text.split("]")[0].lstrip("[")] += 1
+    p95 = sorted(latencies)[int(len(latencies) * 0.95) - 1] if latencies else float("nan")
+    p50 = statistics.median(latencies) if latencies else float("nan")
+    print(f"{name:<28}{p50 / SCALE:>8.1f}{p95 / SCALE:>8.1f}{failures:>6}  " + ", ".join(f"{m}={n}" for m, n in served.most_common()))
+
+def main():
+    parser = argparse.ArgumentParser(description="가짜 모델로 지연 시간 기반 모델 라우팅을 시연합니다.")
+    parser.add_argument("--calls", type=int, default=40)
+    args = parser.parse_args()
+    logging.getLogger("app.model_router").setLevel(logging.ERROR)
+
+    # 한 단계(calls번 호출)보다 길게 미뤄 두고, 단계 사이에는 이 시간만큼 기다립니다.
+    demotion = args.calls * 10.0 * SCALE
+    models, router = build_router(demotion)
+    print(f"{'단계 (recap 작업)':<28}{'p50(s)':>8}{'p95(s)':>8}{'실패':>6}  처리한 모델")
+    run_phase(router, "1. 정상", "recap", args.calls)
+
+    models[FAST_MODEL].latency = 20.0 * SCALE
+    run_phase(router, "2. 기본 모델 지연 (20s)", "recap", args.calls)
+
+    time.sleep(demotion)
+    models[FAST_MODEL].latency = 2.0 * SCALE
+    models[FAST_MODEL].error_rate = 1.0
+    run_phase(router, "3. 기본 모델 오류 100%", "recap", args.calls)
+
+    time.sleep(demotion)
+    models[FAST_MODEL].error_rate = 0.0
+    run_phase(router, "4. 회복", "recap", args.calls)
+    run_phase(router, "5. 긴 프롬프트 (9000자)", "recap", args.calls // 4, prompt="가" * 9000)
+
+    print("\n라우팅 결정 횟수")
+    for row in router.metrics()["decisions"]:
+        print(f"  {row['route']:<14}{str(row['served_by']):<28}{row['reason']:<18}{row['count']:>5}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, insert, select, update
+
+from app import crud, migrations, models, ratings
+
+# 사용 예시 (backend/ 폴더에서 실행):
+#   python bench_ratings.py --games 100000
+# 임시 SQLite 파일에 가상의 경기 기록을 만든 뒤, 레이팅 전체 재계산과 경기 하나를 반영하는 증분 갱신
+# (최근 경기 추가, 과거 경기 수정/삭제) 시간을 재고, 증분 갱신 결과가 전체 재계산과 같은지 확인합니다.
+
+def build_database(url: str, games: int, opponents: int = 30, seed: int = 42):
+    rng = random.Random(seed)
+    engine = create_engine(url)
+    migrations.upgrade(engine)
+    names = [f"상대팀{i:02d}" for i in range(opponents)]
+    start = datetime(2000, 1, 1)
+    rows = []
+    for game_id in range(1, games + 1):
+        our, their = rng.randint(0, 5), rng.randint(0, 5)
+        rows.append({
+            "id": game_id, "opponent_team": rng.choice(names),
+            "game_date": start + timedelta(hours=rng.randint(0, games * 24)),
+            "our_score": our, "opponent_score": their, "result": crud.game_result(our, their),
+        })
+    with engine.begin() as conn:
+        conn.execute(insert(models.Game), rows)
+    return engine
+
+def current_ratings(conn) -> dict:
+    return dict(conn.execute(select(models.TeamRating.team, models.TeamRating.rating)).all())
+
+def timed_ms(func):
+    started = time.perf_counter()
+    result = func()
+    return (time.perf_counter() - started) * 1000, result
+
+def main():
+    parser = argparse.ArgumentParser(description="팀 레이팅 전체 재계산과 증분 갱신 시간을 비교합니다.")
+    parser.add_argument("--games", type=int, default=100000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = build_database(f"sqlite:///{os.path.join(tmp, 'ratings.db')}", args.games)
+        print(f"경기 {args.games}개")
+
+        with engine.begin() as conn:
+            elapsed, count = timed_ms(lambda: ratings.rebuild(conn))
+        print(f"  전체 재계산: {elapsed:9.1f} ms ({count}경기)")
+
+        with engine.begin() as conn:
+            latest = conn.execute(select(models.Game.game_date).order_by(models.Game.game_date.desc())).scalar()
+            conn.execute(insert(models.Game).values(
+                id=args.games + 1, opponent_team="새상대팀", game_date=latest + timedelta(days=1),
+                our_score=3, opponent_score=1, result="WIN",
+            ))
+            elapsed, replayed = timed_ms(lambda: ratings.apply_game_change(conn, args.games + 1))
+        print(f"  최근 경기 추가: {elapsed:7.2f} ms (다시 계산한 경기 {replayed}개)")
+
+        # 날짜 순서로 90% 지점의 경기를 수정하고, 50% 지점의 경기를 삭제합니다.
+        with engine.connect() as conn:
+            ordered = conn.execute(select(models.Game.id).order_by(models.Game.game_date, models.Game.id)).scalars().all()
+        for label, position, change in (("과거 경기 수정 (90%)", 0.9, "update"), ("과거 경기 삭제 (50%)", 0.5, "delete")):
+            game_id = ordered[int(len(ordered) * position)]
+            with engine.begin() as conn:
+                if change == "update":
+                    conn.execute(update(models.Game).where(models.Game.id == game_id)
+                                 .values(our_score=0, opponent_score=4, result="LOSE"))
+                else:
+                    conn.execute(models.Game.__table__.delete().where(models.Game.id == game_id))
+                elapsed, replayed = timed_ms(lambda: ratings.apply_game_change(conn, game_id))
+            print(f"  {label}: {elapsed:9.1f} ms (다시 계산한 경기 {replayed}개)")
+
+        with engine.begin() as conn:
+            incremental = current_ratings(conn)
+            ratings.rebuild(conn)
+            rebuilt = current_ratings(conn)
+            synced = ratings.in_sync(conn)
+        worst = max(abs(incremental.get(team, 0) - rebuilt.get(team, 0)) for team in set(incremental) | set(rebuilt))
+        print(f"\n증분 갱신과 전체 재계산의 최대 레이팅 차이: {worst:.9f} (경기 기록과 일치: {synced})")
+        engine.dispose()
+
+if __name__ == "__main__":
+    main()
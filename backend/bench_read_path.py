@@ -0,0 +1,93 @@
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import selectinload, sessionmaker
+
+from app import fast_read, models, schemas
+
+# 사용 예시 (backend/ 폴더에서 실행):
+#   python bench_read_path.py --sizes 100 10000 100000
+# 기존 /games/ 경로(ORM 로딩 + response_model 검증 + JSON 인코딩)와 튜플 기반 경로의 처리 시간을
+# 같은 FastAPI 파이프라인(TestClient) 위에서 비교합니다.
+
+def build_database(url: str, games: int, events_per_game: int, players: int = 30, seed: int = 7):
+    rng = random.Random(seed)
+    engine = create_engine(url)
+    models.Base.metadata.create_all(bind=engine)
+    start = datetime(2015, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(models.Player), [{"name": f"선수{i:03d}"} for i in range(1, players + 1)])
+        conn.execute(insert(models.Game), [
+            {"id": game_id, "opponent_team": f"상대팀{rng.randint(1, 20):02d}",
+             "game_date": start + timedelta(hours=game_id), "our_score": 2, "opponent_score": 1, "result": "WIN"}
+            for game_id in range(1, games + 1)
+        ])
+        conn.execute(insert(models.GameEvent), [
+            {"game_id": game_id, "player_id": rng.randint(1, players), "event_type": rng.choice(("GOAL", "ASSIST"))}
+            for game_id in range(1, games + 1) for _ in range(events_per_game)
+        ])
+    return engine
+
+def build_app(Session) -> FastAPI:
+    bench_app = FastAPI()
+
+    @bench_app.get("/orm", response_model=List[schemas.Game])
+    def orm_path(limit: int):
+        """변경 전 read_games_api와 같은 방식"""
+        with Session() as db:
+            return db.query(models.Game)\
+                .options(selectinload(models.Game.events).joinedload(models.GameEvent.player))\
+                .order_by(models.Game.game_date.desc()).offset(0).limit(limit).all()
+
+    @bench_app.get("/fast", response_model=List[schemas.Game])
+    def fast_path(limit: int):
+        with Session() as db:
+            return fast_read.json_response(fast_read.games_payload(db, skip=0, limit=limit))
+
+    return bench_app
+
+def timed(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="/games/ 조회 경로(ORM vs 튜플)를 비교합니다.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 10000, 100000])
+    parser.add_argument("--events-per-game", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        engine = build_database(url, max(args.sizes), args.events_per_game)
+        client = TestClient(build_app(sessionmaker(bind=engine)))
+
+        print(f"{'경기 수':>10}{'ORM (ms)':>12}{'튜플 (ms)':>12}{'배속':>8}{'JSON':>10}{'gzip':>10}{'br':>10}")
+        for size in args.sizes:
+            # 압축 비용은 제외하고 조회 + 직렬화 시간만 비교합니다.
+            headers = {"Accept-Encoding": "identity"}
+            orm_ms = timed(lambda: client.get("/orm", params={"limit": size}, headers=headers), args.repeat)
+            fast_ms = timed(lambda: client.get("/fast", params={"limit": size}, headers=headers), args.repeat)
+            body = client.get("/fast", params={"limit": size}, headers=headers).content
+            assert json.loads(body) == client.get("/orm", params={"limit": size}, headers=headers).json()
+            gzip_size = len(fast_read.json_response(json.loads(body), "gzip").body)
+            br_size = len(fast_read.json_response(json.loads(body), "br").body) if fast_read.brotli else 0
+            print(f"{size:>10,}{orm_ms:>12.1f}{fast_ms:>12.1f}{orm_ms / fast_ms:>7.1f}x"
+                  f"{len(body) // 1024:>8}KB{gzip_size // 1024:>8}KB{br_size // 1024:>8}KB")
+        engine.dispose()
+
+if __name__ == "__main__":
+    main()
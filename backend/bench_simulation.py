@@ -0,0 +1,68 @@
+import argparse
+import math
+import time
+
+import numpy as np
+
+from app import simulation
+
+# 사용 예시 (backend/ 폴더에서 실행):
+#   python bench_simulation.py --games 5000 --simulations 200000
+# 상대 팀마다 정해 둔 득점/실점률로 가상의 경기 기록을 만든 뒤, 득점/실점률 추정과 시뮬레이션 시간을 재고
+# 시뮬레이션 결과가 포아송 분포로 직접 계산한 승/무/패 확률과 맞는지 확인합니다.
+
+def synthetic_games(games: int, opponents: int, seed: int = 42):
+    rng = np.random.default_rng(seed)
+    names = [f"상대팀{i:02d}" for i in range(opponents)]
+    true_for = rng.uniform(0.6, 2.6, opponents)
+    true_against = rng.uniform(0.6, 2.6, opponents)
+    codes = rng.integers(0, opponents, games).astype(np.int32)
+    return (
+        names, true_for, true_against, codes,
+        rng.poisson(true_for[codes]).astype(np.int32), rng.poisson(true_against[codes]).astype(np.int32),
+    )
+
+def exact_outcomes(goals_for: float, goals_against: float, max_goals: int = 30):
+    """두 포아송 분포에서 직접 계산한 (승, 무, 패) 확률"""
+    def pmf(rate):
+        return np.array([math.exp(-rate) * rate ** k / math.factorial(k) for k in range(max_goals + 1)])
+    joint = np.outer(pmf(goals_for), pmf(goals_against))
+    return float(np.tril(joint, -1).sum()), float(np.trace(joint)), float(np.triu(joint, 1).sum())
+
+def timed(func, repeat: int) -> float:
+    """func를 repeat번 실행한 평균 시간(ms)을 반환합니다."""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) * 1000 / repeat
+
+def main():
+    parser = argparse.ArgumentParser(description="포아송 경기 시뮬레이션 속도와 정확도를 확인합니다.")
+    parser.add_argument("--games", type=int, default=5000)
+    parser.add_argument("--opponents", type=int, default=30)
+    parser.add_argument("--simulations", type=int, default=simulation.DEFAULT_SIMULATIONS)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    names, true_for, true_against, codes, ours, theirs = synthetic_games(args.games, args.opponents)
+    strengths = simulation.fit(names, codes, ours, theirs)
+    print(f"경기 {args.games}개, 상대 {args.opponents}팀")
+    print(f"  득점/실점률 추정: {timed(lambda: simulation.fit(names, codes, ours, theirs), args.repeat):.2f} ms")
+
+    errors = [abs(strengths.rates(name).goals_for - true_for[code]) for code, name in enumerate(names)]
+    print(f"  추정 득점률 평균 오차: {np.mean(errors):.3f} (실제 득점률 범위 0.6 ~ 2.6)")
+
+    for simulations in sorted({10_000, 100_000, args.simulations, simulation.MAX_SIMULATIONS}):
+        rates = strengths.rates(names[0])
+        print(f"  시뮬레이션 {simulations:>9,}경기: {timed(lambda: simulation.simulate(rates, simulations), args.repeat):7.2f} ms")
+
+    worst = 0.0
+    for name in names:
+        rates = strengths.rates(name)
+        result = simulation.simulate(rates, args.simulations, seed=7)
+        exact = exact_outcomes(rates.goals_for, rates.goals_against)
+        worst = max(worst, *(abs(a - b) for a, b in zip((result["win"], result["draw"], result["loss"]), exact)))
+    print(f"\n시뮬레이션 {args.simulations:,}경기와 포아송 계산값의 최대 확률 차이: {worst:.4f}")
+
+if __name__ == "__main__":
+    main()
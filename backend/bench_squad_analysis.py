@@ -0,0 +1,80 @@
+import argparse
+import os
+import random
+import re
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import models, prompts, squad_analysis
+from app.model_router import FakeModel
+
+# 사용 예시 (backend/ 폴더에서 실행):
+#   python bench_squad_analysis.py --players 25 --drop-rate 0.1
+# API 키 없이 가짜 모델로 선수별 개별 호출과 스쿼드 일괄 호출의 호출 수와 소요 시간을 비교합니다.
+# 가짜 모델은 호출마다 고정 지연 + 선수 수에 비례한 생성 시간이 걸리고, drop-rate 확률로 선수 구간을 빠뜨립니다.
+
+CALL_OVERHEAD = 0.8       # 호출당 고정 지연(초, 실제의 1/10로 축소)
+SECONDS_PER_PLAYER = 0.3  # 선수 한 명 분석을 생성하는 시간
+
+SAMPLE_REPORT = "강점: 빠른 발\n약점: 체력\n추천 훈련법: 인터벌 달리기"
+
+def squad_responder(drop_rate: float, rng: random.Random):
+    def respond(prompt: str) -> str:
+        player_ids = re.findall(r"### \[ID (\d+)\]", prompt)
+        time.sleep(SECONDS_PER_PLAYER * max(1, len(player_ids)) / 10)
+        sections = []
+        for player_id in player_ids:
+            if rng.random() < drop_rate:
+                continue  # 형식을 지키지 않은 응답을 흉내 냅니다.
+            sections.append(f"<<<PLAYER {player_id}>>>\n{SAMPLE_REPORT}\n<<<END {player_id}>>>")
+        return "\n".join(sections) or SAMPLE_REPORT
+    return respond
+
+def main():
+    parser = argparse.ArgumentParser(description="선수별 개별 분석과 스쿼드 일괄 분석을 비교합니다.")
+    parser.add_argument("--players", type=int, default=25)
+    parser.add_argument("--drop-rate", type=float, default=0.1)
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    model = FakeModel("fake", latency=CALL_OVERHEAD / 10, responder=squad_responder(args.drop_rate, rng))
+
+    def generate(prompt: str, task: str = "generic") -> str:
+        return model(prompt)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        models.Base.metadata.create_all(bind=engine)
+        db = sessionmaker(bind=engine)()
+        try:
+            players = [models.Player(name=f"선수{i:02d}", position="CM", dominant_foot="Right",
+                                     stamina=rng.randint(40, 90), speed=rng.randint(40, 90), passing=rng.randint(40, 90))
+                       for i in range(1, args.players + 1)]
+            db.add_all(players)
+            db.commit()
+            chunks = squad_analysis.chunk_players(players)
+
+            started = time.perf_counter()
+            for player in players:
+                generate(prompts.player_analysis_prompt(player), task="player_analysis")
+            single_seconds = time.perf_counter() - started
+
+            started = time.perf_counter()
+            result = squad_analysis.analyze_squad(db, players, generate)
+            squad_seconds = time.perf_counter() - started
+            stored = db.query(models.AIReport).count()
+        finally:
+            db.close()
+            engine.dispose()
+
+    print(f"선수 {args.players}명, 첫 요청의 묶음 크기: {[len(chunk) for chunk in chunks]}")
+    print(f"{'방식':<10}{'호출 수':>8}{'시간 (s)':>10}")
+    print(f"{'개별 호출':<10}{args.players:>8}{single_seconds:>10.2f}")
+    print(f"{'스쿼드':<10}{result['calls']:>8}{squad_seconds:>10.2f}")
+    print(f"저장된 분석: {stored}개, 재시도 후 실패: {result['failed']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+import argparse
+import sys
+from datetime import date
+
+from app import export
+
+# 사용 예시 (backend/ 폴더에서 실행):
+#   python export_data.py events --format parquet --start 2024-01-01 --output events.parquet
+#   python export_data.py games --format csv --opponent FC서울 > games.csv
+
+def main():
+    parser = argparse.ArgumentParser(description="Oracle 경기/이벤트/선수 데이터를 파일로 내보냅니다.")
+    parser.add_argument("dataset", choices=list(export.EXPORT_DATASETS))
+    parser.add_argument("--format", choices=export.EXPORT_FORMATS, default="csv")
+    parser.add_argument("--start", type=date.fromisoformat, help="시작 날짜 (YYYY-MM-DD, 포함)")
+    parser.add_argument("--end", type=date.fromisoformat, help="종료 날짜 (YYYY-MM-DD, 포함)")
+    parser.add_argument("--opponent", help="상대 팀 이름")
+    parser.add_argument("--output", help="출력 파일 경로 (생략하면 표준 출력)")
+    args = parser.parse_args()
+
+    try:
+        chunks = export.stream_export(args.dataset, args.format, start_date=args.start,
+                                      end_date=args.end, opponent=args.opponent)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.output:
+        out = open(args.output, "wb")
+    else:
+        out = sys.stdout.buffer
+    try:
+        for chunk in chunks:
+            out.write(chunk.encode("utf-8") if isinstance(chunk, str) else chunk)
+    finally:
+        if args.output:
+            out.close()
+
+if __name__ == "__main__":
+    main()
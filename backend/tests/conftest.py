@@ -0,0 +1,7 @@
+import os
+import tempfile
+
+# app 모듈을 import하기 전에 테스트용 임시 DB와 가짜 모델을 지정합니다. (app.main은 import할 때 DB를 마이그레이션합니다)
+_tmp = tempfile.mkdtemp(prefix="oracle-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp, 'app.db')}"
+os.environ["GEMINI_FAKE_MODELS"] = "1"
@@ -0,0 +1,70 @@
+# 버전별로 고정해 둔 마이그레이션 DDL이 현재 models.py와 같은 스키마를 만드는지,
+# 마이그레이션의 데이터 단계가 현재 코드와 같은 결과를 만드는지 확인합니다.
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, insert, inspect, select
+
+from app import migrations, models, ratings
+
+def describe_schema(engine) -> dict:
+    """테이블별 컬럼(이름, 타입, NULL 허용, 기본 키), 인덱스, 유니크 제약, 외래 키"""
+    inspector = inspect(engine)
+    schema = {}
+    for table in inspector.get_table_names():
+        if table == migrations.schema_version.name:
+            continue
+        schema[table] = {
+            "columns": sorted(
+                (c["name"], type(c["type"]).__name__, c["nullable"], c["primary_key"])
+                for c in inspector.get_columns(table)
+            ),
+            "indexes": sorted(
+                (i["name"], tuple(i["column_names"]), bool(i["unique"])) for i in inspector.get_indexes(table)
+            ),
+            "unique": sorted(tuple(u["column_names"]) for u in inspector.get_unique_constraints(table)),
+            "foreign_keys": sorted(
+                (tuple(f["constrained_columns"]), f["referred_table"], tuple(f["referred_columns"]))
+                for f in inspector.get_foreign_keys(table)
+            ),
+        }
+    return schema
+
+def test_migrations_match_models(tmp_path):
+    migrated = create_engine(f"sqlite:///{tmp_path / 'migrated.db'}")
+    migrations.upgrade(migrated)
+    created = create_engine(f"sqlite:///{tmp_path / 'created.db'}")
+    models.Base.metadata.create_all(created)
+
+    assert describe_schema(migrated) == describe_schema(created)
+
+def test_upgrade_is_noop_when_current(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    assert migrations.upgrade(engine) == [version for version, _, _ in migrations.MIGRATIONS]
+    assert migrations.upgrade(engine) == []
+
+def test_rating_migration_matches_rebuild(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    migrations.upgrade(engine, target=2)
+    start = datetime(2024, 1, 1)
+    scores = [(3, 0), (1, 1), (0, 2), (4, 1), (2, 2), (1, 0)]
+    with engine.begin() as conn:
+        conn.execute(insert(models.Game), [
+            {"id": game_id, "opponent_team": f"상대팀{game_id % 3}", "game_date": start + timedelta(days=game_id // 2),
+             "our_score": our, "opponent_score": their}
+            for game_id, (our, their) in enumerate(scores, start=1)
+        ])
+    migrations.upgrade(engine)
+
+    def snapshot(conn):
+        team_ratings = sorted(conn.execute(select(models.TeamRating.team, models.TeamRating.rating,
+                                                  models.TeamRating.games)).all())
+        history = conn.execute(select(models.RatingHistory.game_id, models.RatingHistory.rating_change)
+                               .order_by(models.RatingHistory.game_id)).all()
+        return team_ratings, history
+
+    with engine.begin() as conn:
+        migrated = snapshot(conn)
+        ratings.rebuild(conn)
+        assert snapshot(conn) == migrated
+        assert ratings.in_sync(conn)
@@ -0,0 +1,36 @@
+# 우리 팀 이름(schemas.OUR_TEAM)은 레이팅에서 우리 팀 키로 쓰이므로 상대 팀 이름으로 받지 않습니다.
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from app import crud, schemas
+from app.database import SessionLocal
+from app.main import app
+
+GAME = {"opponent_team": "상대팀", "game_date": "2026-01-01T10:00:00", "our_score": 2, "opponent_score": 1}
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as client:
+        yield client
+
+def test_create_game_rejects_our_team(client):
+    res = client.post("/games/", json={**GAME, "opponent_team": schemas.OUR_TEAM})
+    assert res.status_code == 422
+
+def test_update_game_rejects_our_team(client):
+    game = client.post("/games/", json=GAME).json()
+    res = client.put(f"/games/{game['id']}", json={**GAME, "opponent_team": schemas.OUR_TEAM})
+    assert res.status_code == 422
+    db = SessionLocal()
+    try:
+        assert crud.get_game(db, game["id"]).opponent_team == GAME["opponent_team"]
+    finally:
+        db.close()
+
+def test_live_match_rejects_our_team(client):
+    with pytest.raises(ValidationError):
+        schemas.LiveMatchCreate(opponent_team=schemas.OUR_TEAM)
+    assert client.post("/live/matches", json={"opponent_team": schemas.OUR_TEAM}).status_code == 422
+    assert client.post("/live/matches", json={"opponent_team": "상대팀"}).status_code == 200
@@ -0,0 +1,114 @@
+# 마이그레이션으로 만든 SQLite DB에서 자주 실행되는 조회(리더보드, 상대별 전적, 최신 경기 목록,
+# 경기별 이벤트, 경기 삭제, 레이팅 갱신)를 실제 crud 함수로 실행해 SQL을 모으고, EXPLAIN QUERY PLAN으로
+# games/game_events/rating_history 테이블을 인덱스 없이 전체 스캔하는지 확인합니다. 테이블 전체를 정렬/그룹하는 조회는
+# 임시 B-tree 없이 인덱스 순서로 읽는지도 확인합니다.
+#
+#   python -m pytest tests/test_query_plans.py   # backend/ 폴더에서 실행
+
+import random
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event, func, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app import crud, migrations, models, ratings
+
+GAMES = 5000
+EVENTS_PER_GAME = 6
+PLAYERS = 30
+
+# 인덱스 없이 읽으면 안 되는 테이블 (players는 리더보드에서 전체 선수를 읽는 것이 정상입니다)
+CHECKED_TABLES = ("games", "game_events", "rating_history")
+
+@pytest.fixture(scope="module")
+def engine(tmp_path_factory):
+    rng = random.Random(7)
+    engine = create_engine(f"sqlite:///{tmp_path_factory.mktemp('plans') / 'plans.db'}")
+    migrations.upgrade(engine)
+    start = datetime(2020, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(models.Player), [{"name": f"선수{i:03d}"} for i in range(1, PLAYERS + 1)])
+        conn.execute(insert(models.Game), [
+            {"id": game_id, "opponent_team": f"상대팀{rng.randint(1, 20):02d}",
+             "game_date": start + timedelta(hours=game_id), "our_score": 2, "opponent_score": 1, "result": "WIN"}
+            for game_id in range(1, GAMES + 1)
+        ])
+        conn.execute(insert(models.GameEvent), [
+            {"game_id": game_id, "player_id": rng.randint(1, PLAYERS), "event_type": rng.choice(("GOAL", "ASSIST"))}
+            for game_id in range(1, GAMES + 1) for _ in range(EVENTS_PER_GAME)
+        ])
+        ratings.rebuild(conn)
+    with engine.connect() as conn:
+        conn.exec_driver_sql("ANALYZE")
+    yield engine
+    engine.dispose()
+
+def capture_statements(engine, run):
+    """run(db)을 실행하는 동안 DB로 보낸 (SQL, 파라미터) 목록. 실행한 변경은 롤백합니다."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "DELETE", "UPDATE")):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        db = sessionmaker(bind=engine)()
+        try:
+            run(db)
+        finally:
+            db.rollback()
+            db.close()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return statements
+
+def plan_problems(plan: list, index_ordered: bool) -> list:
+    """index_ordered가 True면 ORDER BY/GROUP BY를 위한 임시 B-tree도 문제로 봅니다.
+    (한 페이지 분량의 이벤트처럼 이미 좁혀진 결과를 정렬하는 것은 허용)"""
+    problems = []
+    for detail in plan:
+        words = detail.split()
+        if words[:1] == ["SCAN"] and len(words) > 1 and words[1] in CHECKED_TABLES and "USING" not in words:
+            problems.append(f"전체 스캔: {detail}")
+        if index_ordered and "TEMP B-TREE" in detail:
+            problems.append(f"임시 정렬/그룹: {detail}")
+    return problems
+
+def delete_game(db):
+    # 커밋하지 않고 cascade 삭제 SQL만 실행합니다.
+    db_game = crud.get_game(db, game_id=1)
+    db.delete(db_game)
+    db.flush()
+
+def rate_latest_game(db):
+    # 가장 최근 경기 하나를 레이팅에 반영합니다.
+    latest_game_id = db.scalar(select(func.max(models.Game.id)))
+    ratings.apply_game_change(db.connection(), latest_game_id)
+
+# 이름: (실행 함수, 임시 B-tree 없이 인덱스 순서로 읽어야 하는지)
+HOT_QUERIES = {
+    "리더보드": (lambda db: crud.get_leaderboard_stats(db), True),
+    "리더보드 (기간)": (lambda db: crud.get_leaderboard_stats(db, date(2020, 3, 1), date(2020, 3, 31)), True),
+    "상대별 전적": (lambda db: crud.get_stats_by_opponent(db), True),
+    "상대별 전적 (기간)": (lambda db: crud.get_stats_by_opponent(db, date(2020, 3, 1), date(2020, 3, 31)), True),
+    "최신 경기 목록": (lambda db: crud.get_game_rows(db, limit=100), True),
+    "최신 경기 + 이벤트": (lambda db: crud.get_game_event_rows(db, limit=100), False),
+    "경기별 이벤트": (lambda db: crud.get_event_rows(db, [1, 2, 3]), False),
+    "경기 삭제 (cascade)": (delete_game, True),
+    "레이팅 갱신 (최근 경기)": (rate_latest_game, False),
+}
+
+@pytest.mark.parametrize("name", list(HOT_QUERIES))
+def test_hot_query_uses_indexes(engine, name):
+    run, index_ordered = HOT_QUERIES[name]
+    statements = capture_statements(engine, run)
+    assert statements, "실행된 SQL이 없습니다."
+
+    problems = []
+    with engine.connect() as conn:
+        for statement, parameters in statements:
+            plan = [row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+            problems.extend(f"{problem}\n    {statement}" for problem in plan_problems(plan, index_ordered))
+    assert not problems, "\n".join(problems)
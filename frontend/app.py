@@ -1,13 +1,235 @@
 import streamlit as st
 import requests
 import pandas as pd
+import functools
+import json
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime
 
 # 백엔드 API 주소
 BACKEND_URL = "https://oracle-ai-manager.onrender.com"
 
+# 백엔드 요청에 W3C traceparent 헤더를 붙여 서버 쪽 트레이스(app/tracing.py)와 이어지게 합니다.
+# 이 비율만큼의 요청에 샘플링 표시를 붙이면 서버가 DB/프롬프트/Gemini 구간까지 기록합니다.
+TRACE_SAMPLE_RATIO = float(os.getenv("TRACE_SAMPLE_RATIO", "0.1"))
+# 측정 패널에 보여줄 최근 API 요청 수
+RECENT_REQUESTS = 20
+# 변경 알림(SSE) 연결이 끊겼을 때 다시 연결하기까지 기다리는 시간(초)
+CHANGE_FEED_RETRY_SECONDS = 5
+
 st.set_page_config(page_title="Oracle AI Manager", layout="wide")
 
+# --- 렌더링 측정 ---
+# 페이지 전체와 각 구역(fragment)이 실행될 때마다 걸린 시간과 백엔드 호출 수를 세션에 기록합니다.
+# 구역 안의 위젯을 조작하면 그 구역만 다시 실행되므로, 측정 패널에서 페이지 전체 실행과 비용을 비교할 수 있습니다.
+
+@contextmanager
+def measure_render(name):
+    metrics = st.session_state.setdefault("render_metrics", {})
+    stack = st.session_state.setdefault("render_stack", [])
+    frame = {"name": name, "calls": 0}
+    stack.append(frame)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        stack.pop()
+        entry = metrics.setdefault(name, {"runs": 0, "total_ms": 0.0, "last_ms": 0.0, "backend_calls": 0, "last_backend_calls": 0})
+        entry["runs"] += 1
+        entry["total_ms"] += elapsed_ms
+        entry["last_ms"] = elapsed_ms
+        entry["backend_calls"] += frame["calls"]
+        entry["last_backend_calls"] = frame["calls"]
+
+def render_fragment(name):
+    """st.fragment로 감싸 구역 안의 위젯을 조작하면 이 구역만 다시 실행하고, 실행마다 렌더링 시간을 기록합니다."""
+    def decorator(func):
+        @functools.wraps(func)
+        def measured(*args, **kwargs):
+            with measure_render(name):
+                return func(*args, **kwargs)
+        return st.fragment(measured)
+    return decorator
+
+def server_duration_ms(response):
+    """응답의 Server-Timing 헤더에서 서버 처리 시간(ms)을 꺼냅니다."""
+    for metric in response.headers.get("Server-Timing", "").split(","):
+        name, _, params = metric.strip().partition(";")
+        if name == "app" and params.startswith("dur="):
+            return float(params[len("dur="):])
+    return None
+
+def call_backend(method, path, **kwargs):
+    """백엔드 API를 호출하고, 지금 실행 중인 페이지/구역의 백엔드 호출 수와 요청별 소요 시간을 기록합니다."""
+    stack = st.session_state.get("render_stack", [])
+    for frame in stack:
+        frame["calls"] += 1
+
+    trace_id = os.urandom(16).hex()
+    sampled = random.random() < TRACE_SAMPLE_RATIO
+    headers = {**kwargs.pop("headers", {}), "traceparent": f"00-{trace_id}-{os.urandom(8).hex()}-{'01' if sampled else '00'}"}
+    start = time.perf_counter()
+    response = requests.request(method, f"{BACKEND_URL}{path}", headers=headers, **kwargs)
+    total_ms = (time.perf_counter() - start) * 1000
+
+    server_ms = server_duration_ms(response)
+    recent = st.session_state.setdefault("recent_requests", [])
+    recent.append({
+        "구역": stack[-1]["name"] if stack else "",
+        "요청": f"{method} {path}",
+        "상태": response.status_code,
+        "전체(ms)": round(total_ms, 1),
+        "서버(ms)": server_ms,
+        "네트워크(ms)": round(total_ms - server_ms, 1) if server_ms is not None else None,
+        "trace ID": trace_id + (" (샘플링)" if sampled else ""),
+    })
+    del recent[:-RECENT_REQUESTS]
+    if method != "GET" and response.ok:
+        # 방금 저장한 변경이 변경 알림으로 도착하기 전에 다시 그려도 옛 데이터가 보이지 않게 합니다.
+        load_dashboard.clear()
+    return response
+
+def show_render_metrics():
+    with st.sidebar.expander("⏱️ 렌더링 측정"):
+        metrics = st.session_state.get("render_metrics", {})
+        if not metrics:
+            st.caption("아직 기록이 없습니다.")
+            return
+        st.dataframe(pd.DataFrame([
+            {
+                "구역": name,
+                "실행": entry["runs"],
+                "최근(ms)": round(entry["last_ms"], 1),
+                "평균(ms)": round(entry["total_ms"] / entry["runs"], 1),
+                "최근 API 호출": entry["last_backend_calls"],
+                "총 API 호출": entry["backend_calls"],
+            }
+            for name, entry in metrics.items()
+        ]), hide_index=True, use_container_width=True)
+        st.caption("구역 안에서만 다시 실행된 결과는 페이지 전체가 다시 실행될 때 표에 반영됩니다.")
+
+        recent = st.session_state.get("recent_requests", [])
+        if recent:
+            st.write("**최근 API 요청**")
+            st.dataframe(pd.DataFrame(recent[::-1]), hide_index=True, use_container_width=True)
+            st.caption("샘플링된 요청은 서버 트레이스 파일에서 trace ID로 DB/프롬프트/Gemini 구간을 찾을 수 있습니다.")
+
+        if st.button("측정 초기화"):
+            st.session_state["render_metrics"] = {}
+            st.session_state["recent_requests"] = []
+            st.rerun()
+
+# --- 데이터 버전과 대시보드 캐시 ---
+# 대시보드 응답은 백엔드 데이터 버전별로 캐시합니다. 버전은 백엔드의 변경 알림(/changes/stream)을
+# 구독하는 백그라운드 스레드가 갱신하므로, 데이터가 바뀌지 않았으면 다시 그려도 백엔드를 호출하지 않습니다.
+
+class ChangeFeed:
+    """/changes/stream(SSE)을 백그라운드 스레드에서 구독해 최신 데이터 버전을 기억합니다.
+    연결되어 있지 않으면 version은 None이며, 끊기면 다시 연결합니다."""
+
+    def __init__(self, url):
+        self.url = url
+        self.version = None
+        threading.Thread(target=self._run, name="change-feed", daemon=True).start()
+
+    def _run(self):
+        while True:
+            try:
+                # 서버가 15초마다 keep-alive를 보내므로 그보다 충분히 긴 읽기 제한 시간을 둡니다.
+                with requests.get(self.url, stream=True, timeout=(5, 60)) as response:
+                    response.raise_for_status()
+                    for line in response.iter_lines(decode_unicode=True):
+                        if line and line.startswith("data:"):
+                            self.version = json.loads(line[len("data:"):])["version"]
+            except (requests.exceptions.RequestException, ValueError, KeyError):
+                pass
+            self.version = None
+            time.sleep(CHANGE_FEED_RETRY_SECONDS)
+
+@st.cache_resource
+def change_feed():
+    """Streamlit 서버 프로세스에서 하나만 실행되는 변경 알림 구독"""
+    return ChangeFeed(f"{BACKEND_URL}/changes/stream")
+
+def data_version():
+    """백엔드의 현재 데이터 버전. 변경 알림이 연결되어 있지 않으면 /changes/version으로 확인하고, 실패하면 None"""
+    version = change_feed().version
+    if version is not None:
+        return version
+    try:
+        response = call_backend("GET", "/changes/version")
+    except requests.exceptions.ConnectionError:
+        return None
+    return response.json()["version"] if response.status_code == 200 else None
+
+class DashboardError(Exception):
+    pass
+
+def request_dashboard(page):
+    response = call_backend("GET", f"/dashboard/{page}")
+    if response.status_code != 200:
+        raise DashboardError(response.text)
+    return response.json()
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def load_dashboard(page, version):
+    """version이 같은 동안은 캐시된 응답을 반환합니다. (실패한 요청은 캐시되지 않음)"""
+    return request_dashboard(page)
+
+def fetch_dashboard(page):
+    """페이지에 필요한 데이터를 한 번의 요청으로 받아옵니다. 실패하면 None을 반환합니다.
+
+    표 형태 데이터는 행 목록 대신 {컬럼: [값, ...]} 형태(columnar)로 내려오므로 바로 DataFrame으로 만들 수 있습니다.
+    데이터 버전을 알 수 없으면 캐시를 건너뛰고 매번 요청합니다.
+    """
+    version = data_version()
+    try:
+        if version is None:
+            return request_dashboard(page)
+        return load_dashboard(page, version)
+    except requests.exceptions.ConnectionError:
+        st.error("백엔드 서버에 연결할 수 없습니다. 서버가 실행 중인지 확인하세요.")
+        return None
+    except DashboardError as e:
+        st.error(f"데이터를 불러오는 데 실패했습니다: {e}")
+        return None
+
+def show_stored_report(path, params=None):
+    """미리 만들어 둔 AI 결과가 있으면 바로 보여주고 True를 반환합니다."""
+    try:
+        res = call_backend("GET", path, params=params)
+    except requests.exceptions.ConnectionError:
+        return False
+    if res.status_code != 200:
+        return False
+    render_stored_report(res.json())
+    return True
+
+def render_stored_report(stored):
+    created_at = datetime.fromisoformat(stored['created_at']).strftime('%Y-%m-%d %H:%M')
+    st.caption(f"미리 생성된 결과 ({created_at})")
+    if stored['stale']:
+        st.warning("생성 이후 데이터가 바뀌었습니다. 다시 생성하면 최신 정보가 반영됩니다.")
+    st.markdown(stored['report'])
+
+def flash(message):
+    """다음 실행(rerun)에서 보여줄 성공 메시지를 저장합니다."""
+    st.session_state["flash_message"] = message
+
+def show_flash():
+    message = st.session_state.pop("flash_message", None)
+    if message:
+        st.success(message)
+
+def column_row(columns, index):
+    """columnar 데이터에서 index 번째 행을 딕셔너리로 꺼냅니다."""
+    return {col: values[index] for col, values in columns.items()}
+
 # --- 디자인 커스텀 CSS ---
 def set_custom_style():
     st.markdown("""
@@ -30,7 +252,7 @@ def set_custom_style():
         h2, h3 {
             color: #34495e; /* 타이틀과 동일한 색상으로 통일 */
         }
-        
+
         /* 사이드바 스타일 (밝은 테마에 맞게 수정) */
         [data-testid="stSidebar"] {
             background-color: rgba(255, 255, 255, 0.5); /* 반투명 흰색 배경 */
@@ -40,31 +262,24 @@ def set_custom_style():
         </style>
     """, unsafe_allow_html=True)
 
-set_custom_style()
-
-st.title("⚽ Oracle AI Manager & Coach")
-
-# --- 사이드바 ---
-st.sidebar.header("메뉴")
-menu = st.sidebar.radio("페이지 선택", ["선수 관리", "경기 기록", "팀 분석", "리더보드"])
+# 세분화된 포지션 목록
+DETAILED_POSITIONS = [
+    "GK", "LCB", "RCB", "LB", "RB", # 수비
+    "DM", "CM", "AM", # 미드필더
+    "LW", "RW", "CF"  # 공격수
+]
+FOOT_OPTIONS = ["오른발", "왼발", "양발"]
 
 # --- 선수 관리 페이지 ---
-if menu == "선수 관리":
-    st.header("👨‍👩‍👧‍👦 선수 관리")
-    
+@render_fragment("선수 등록 폼")
+def player_registration_form():
     # 선수 등록 폼
     with st.form("player_form"):
         st.subheader("📝 신규 선수 등록")
         name = st.text_input("이름")
-        
-        # 세분화된 포지션 목록
-        detailed_positions = [
-            "GK", "LCB", "RCB", "LB", "RB", # 수비
-            "DM", "CM", "AM", # 미드필더
-            "LW", "RW", "CF"  # 공격수
-        ]
-        position = st.selectbox("세부 포지션", detailed_positions)
-        dominant_foot = st.selectbox("주발", ["오른발", "왼발", "양발"])
+
+        position = st.selectbox("세부 포지션", DETAILED_POSITIONS)
+        dominant_foot = st.selectbox("주발", FOOT_OPTIONS)
 
         player_data = {"name": name, "position": position, "dominant_foot": dominant_foot}
 
@@ -106,153 +321,168 @@ if menu == "선수 관리":
             player_data["stamina"] = st.slider("체력", 1, 100, 50)
             player_data["speed"] = st.slider("속도", 1, 100, 50)
             player_data["shooting_accuracy"] = st.slider("슈팅 정확도", 1, 100, 50)
-        
+
         submitted = st.form_submit_button("등록")
         if submitted:
-            response = requests.post(f"{BACKEND_URL}/players/", json=player_data)
+            response = call_backend("POST", "/players/", json=player_data)
             if response.status_code == 200:
-                st.success("선수가 성공적으로 등록되었습니다!")
+                # 선수 목록에 새 선수를 반영하기 위해 페이지 전체를 다시 실행합니다.
+                flash("선수가 성공적으로 등록되었습니다!")
+                st.rerun()
             else:
                 st.error(f"선수 등록 실패: {response.text}")
 
+@render_fragment("선수 목록")
+def player_table(players):
+    df_players = pd.DataFrame(players)
+    # 모든 스탯 컬럼을 포함하여 표시
+    display_cols = ['id', 'name', 'position', 'dominant_foot', 'stamina', 'speed',
+                    'shooting_accuracy', 'dribbling', 'passing', 'finishing',
+                    'crossing', 'vision', 'interceptions', 'tackling', 'heading',
+                    'saving', 'defense_coordination', 'catching']
+    # 데이터프레임에 존재하지 않는 컬럼이 있을 경우를 대비하여 안전하게 필터링
+    existing_cols = [col for col in display_cols if col in df_players.columns]
+    st.dataframe(df_players[existing_cols], use_container_width=True)
+
+@render_fragment("선수 수정 폼")
+def player_edit_form(players, player_options):
+    """선수를 바꿔 선택해도 이 구역만 다시 그리며, 선수 정보는 페이지 실행 때 받아 둔 데이터를 사용합니다."""
+    selected_player_key = st.selectbox("수정 또는 삭제할 선수를 선택하세요", player_options.keys())
+
+    if selected_player_key:
+        player_id = player_options[selected_player_key]
+        selected_player = column_row(players, players['id'].index(player_id))
+
+        with st.form(f"edit_player_{player_id}"):
+            st.subheader(f"'{selected_player['name']}' 선수 정보 수정")
+
+            # --- 수정된 부분 시작 ---
+
+            # 기본 정보 수정
+            edit_name = st.text_input("이름", value=selected_player.get('name', ''))
+
+            current_pos_index = DETAILED_POSITIONS.index(selected_player['position']) if selected_player.get('position') in DETAILED_POSITIONS else 0
+            edit_position = st.selectbox("포지션", DETAILED_POSITIONS, index=current_pos_index, key=f"pos_{player_id}")
+
+            current_foot_index = FOOT_OPTIONS.index(selected_player['dominant_foot']) if selected_player.get('dominant_foot') in FOOT_OPTIONS else 0
+            edit_dominant_foot = st.selectbox("주발", FOOT_OPTIONS, index=current_foot_index, key=f"foot_{player_id}")
+
+            st.write("**능력치 수정**")
+            # 모든 능력치 슬라이더를 표시하여 수정 가능하도록 변경
+            col1, col2 = st.columns(2)
+            with col1:
+                edit_stamina = st.slider("체력", 1, 100, selected_player.get('stamina', 50))
+                edit_speed = st.slider("속도", 1, 100, selected_player.get('speed', 50))
+                edit_shooting_accuracy = st.slider("슈팅 정확도", 1, 100, selected_player.get('shooting_accuracy', 50))
+                edit_dribbling = st.slider("드리블", 1, 100, selected_player.get('dribbling', 50))
+                edit_passing = st.slider("패스", 1, 100, selected_player.get('passing', 50))
+                edit_finishing = st.slider("골 결정력", 1, 100, selected_player.get('finishing', 50))
+                edit_crossing = st.slider("크로스", 1, 100, selected_player.get('crossing', 50))
+                edit_vision = st.slider("시야", 1, 100, selected_player.get('vision', 50))
+            with col2:
+                edit_interceptions = st.slider("가로채기", 1, 100, selected_player.get('interceptions', 50))
+                edit_tackling = st.slider("태클", 1, 100, selected_player.get('tackling', 50))
+                edit_heading = st.slider("헤딩", 1, 100, selected_player.get('heading', 50))
+                edit_saving = st.slider("선방 능력 (GK)", 1, 100, selected_player.get('saving', 50))
+                edit_defense_coordination = st.slider("수비 조율 (GK)", 1, 100, selected_player.get('defense_coordination', 50))
+                edit_catching = st.slider("캐칭 (GK)", 1, 100, selected_player.get('catching', 50))
+
+            update_submitted = st.form_submit_button("정보 수정하기")
+            if update_submitted:
+                # 수정된 모든 정보를 포함하는 payload 생성
+                update_data = {
+                    "name": edit_name,
+                    "position": edit_position,
+                    "dominant_foot": edit_dominant_foot,
+                    "stamina": edit_stamina,
+                    "speed": edit_speed,
+                    "shooting_accuracy": edit_shooting_accuracy,
+                    "dribbling": edit_dribbling,
+                    "passing": edit_passing,
+                    "finishing": edit_finishing,
+                    "crossing": edit_crossing,
+                    "vision": edit_vision,
+                    "interceptions": edit_interceptions,
+                    "tackling": edit_tackling,
+                    "heading": edit_heading,
+                    "saving": edit_saving,
+                    "defense_coordination": edit_defense_coordination,
+                    "catching": edit_catching
+                }
+                res = call_backend("PUT", f"/players/{player_id}", json=update_data)
+                if res.status_code == 200:
+                    # 선수 목록에도 반영되도록 페이지 전체를 다시 실행합니다.
+                    flash("선수 정보가 성공적으로 수정되었습니다.")
+                    st.rerun()
+                else:
+                    st.error(f"수정 실패: {res.text}")
+
+            # --- 수정된 부분 끝 ---
+
+@render_fragment("AI 선수 분석")
+def player_report_panel(player_options):
+    st.subheader("🤖 AI 선수 분석 리포트")
+
+    # 분석을 위한 선수 선택
+    analysis_player_key = st.selectbox("분석할 선수를 선택하세요", player_options.keys(), key="analysis_select")
+
+    if st.button("분석 리포트 생성하기"):
+        if analysis_player_key:
+            player_id_for_analysis = player_options[analysis_player_key]
+            analysis_player_name = analysis_player_key.split(" (ID:")[0]
+            with st.spinner(f"{analysis_player_name} 선수의 데이터를 AI가 분석 중입니다..."):
+                res = call_backend("POST", f"/players/{player_id_for_analysis}/analysis")
+                if res.status_code == 200:
+                    report_data = res.json()
+                    st.success("분석이 완료되었습니다!")
+                    st.markdown("---")
+                    st.markdown(report_data['report'])
+                else:
+                    st.error(f"분석 실패: {res.text}")
+
+    # 전체 선수를 몇 번의 요청으로 묶어 한꺼번에 분석합니다.
+    if st.button("전체 선수 분석하기"):
+        with st.spinner(f"{len(player_options)}명의 선수를 AI가 분석 중입니다..."):
+            res = call_backend("POST", "/analysis/squad", json={})
+            if res.status_code == 200:
+                squad_data = res.json()
+                st.success(f"{len(squad_data['reports'])}명 분석 완료 (AI 호출 {squad_data['llm_calls']}회)")
+                if squad_data['failed_player_ids']:
+                    st.warning(f"분석하지 못한 선수 ID: {squad_data['failed_player_ids']}")
+                for item in squad_data['reports']:
+                    with st.expander(item['name']):
+                        st.markdown(item['report'])
+            else:
+                st.error(f"분석 실패: {res.text}")
+
+def players_page():
+    st.header("👨‍👩‍👧‍👦 선수 관리")
+    show_flash()
+
+    player_registration_form()
+
     st.divider()
 
     # 선수 목록 및 수정/삭제 (UI는 간단하게 모든 스탯을 보여주도록 유지)
     st.subheader("📋 선수 목록 및 관리")
-    try:
-        response = requests.get(f"{BACKEND_URL}/players/")
-        if response.status_code == 200:
-            players = response.json()
-            if players:
-                df_players = pd.DataFrame(players)
-                # 모든 스탯 컬럼을 포함하여 표시
-                display_cols = ['id', 'name', 'position', 'dominant_foot', 'stamina', 'speed', 
-                                'shooting_accuracy', 'dribbling', 'passing', 'finishing', 
-                                'crossing', 'vision', 'interceptions', 'tackling', 'heading',
-                                'saving', 'defense_coordination', 'catching']
-                # 데이터프레임에 존재하지 않는 컬럼이 있을 경우를 대비하여 안전하게 필터링
-                existing_cols = [col for col in display_cols if col in df_players.columns]
-                st.dataframe(df_players[existing_cols], use_container_width=True)
-
-                # ID와 이름을 조합하여 고유한 선택 옵션 생성
-                player_options = {f"{p['name']} (ID: {p['id']})": p['id'] for p in players}
-                selected_player_key = st.selectbox("수정 또는 삭제할 선수를 선택하세요", player_options.keys())
-
-                if selected_player_key:
-                    player_id = player_options[selected_player_key]
-                    selected_player = next((p for p in players if p['id'] == player_id), None)
-                    
-                    with st.form(f"edit_player_{player_id}"):
-                        st.subheader(f"'{selected_player['name']}' 선수 정보 수정")
-                        
-                        # --- 수정된 부분 시작 ---
-                        
-                        # 기본 정보 수정
-                        edit_name = st.text_input("이름", value=selected_player.get('name', ''))
-                        
-                        detailed_positions = [
-                            "GK", "LCB", "RCB", "LB", "RB", "DM", "CM", "AM", "LW", "RW", "CF"
-                        ]
-                        current_pos_index = detailed_positions.index(selected_player['position']) if selected_player.get('position') in detailed_positions else 0
-                        edit_position = st.selectbox("포지션", detailed_positions, index=current_pos_index, key=f"pos_{player_id}")
-                        
-                        foot_options = ["오른발", "왼발", "양발"]
-                        current_foot_index = foot_options.index(selected_player['dominant_foot']) if selected_player.get('dominant_foot') in foot_options else 0
-                        edit_dominant_foot = st.selectbox("주발", foot_options, index=current_foot_index, key=f"foot_{player_id}")
-
-                        st.write("**능력치 수정**")
-                        # 모든 능력치 슬라이더를 표시하여 수정 가능하도록 변경
-                        col1, col2 = st.columns(2)
-                        with col1:
-                            edit_stamina = st.slider("체력", 1, 100, selected_player.get('stamina', 50))
-                            edit_speed = st.slider("속도", 1, 100, selected_player.get('speed', 50))
-                            edit_shooting_accuracy = st.slider("슈팅 정확도", 1, 100, selected_player.get('shooting_accuracy', 50))
-                            edit_dribbling = st.slider("드리블", 1, 100, selected_player.get('dribbling', 50))
-                            edit_passing = st.slider("패스", 1, 100, selected_player.get('passing', 50))
-                            edit_finishing = st.slider("골 결정력", 1, 100, selected_player.get('finishing', 50))
-                            edit_crossing = st.slider("크로스", 1, 100, selected_player.get('crossing', 50))
-                            edit_vision = st.slider("시야", 1, 100, selected_player.get('vision', 50))
-                        with col2:
-                            edit_interceptions = st.slider("가로채기", 1, 100, selected_player.get('interceptions', 50))
-                            edit_tackling = st.slider("태클", 1, 100, selected_player.get('tackling', 50))
-                            edit_heading = st.slider("헤딩", 1, 100, selected_player.get('heading', 50))
-                            edit_saving = st.slider("선방 능력 (GK)", 1, 100, selected_player.get('saving', 50))
-                            edit_defense_coordination = st.slider("수비 조율 (GK)", 1, 100, selected_player.get('defense_coordination', 50))
-                            edit_catching = st.slider("캐칭 (GK)", 1, 100, selected_player.get('catching', 50))
-
-                        update_submitted = st.form_submit_button("정보 수정하기")
-                        if update_submitted:
-                            # 수정된 모든 정보를 포함하는 payload 생성
-                            update_data = {
-                                "name": edit_name,
-                                "position": edit_position,
-                                "dominant_foot": edit_dominant_foot,
-                                "stamina": edit_stamina,
-                                "speed": edit_speed,
-                                "shooting_accuracy": edit_shooting_accuracy,
-                                "dribbling": edit_dribbling,
-                                "passing": edit_passing,
-                                "finishing": edit_finishing,
-                                "crossing": edit_crossing,
-                                "vision": edit_vision,
-                                "interceptions": edit_interceptions,
-                                "tackling": edit_tackling,
-                                "heading": edit_heading,
-                                "saving": edit_saving,
-                                "defense_coordination": edit_defense_coordination,
-                                "catching": edit_catching
-                            }
-                            res = requests.put(f"{BACKEND_URL}/players/{player_id}", json=update_data)
-                            if res.status_code == 200:
-                                st.success("선수 정보가 성공적으로 수정되었습니다. 페이지를 새로고침하면 반영됩니다.")
-                                st.rerun() # 수정 후 바로 새로고침
-                            else:
-                                st.error(f"수정 실패: {res.text}")
-                        
-                        # --- 수정된 부분 끝 ---
-                
-                st.divider()
-                st.subheader("🤖 AI 선수 분석 리포트")
-
-                # 분석을 위한 선수 선택
-                analysis_player_key = st.selectbox("분석할 선수를 선택하세요", player_options.keys(), key="analysis_select")
-
-                if st.button("분석 리포트 생성하기"):
-                    if analysis_player_key:
-                        player_id_for_analysis = player_options[analysis_player_key]
-                        analysis_player_name = analysis_player_key.split(" (ID:")[0]
-                        with st.spinner(f"{analysis_player_name} 선수의 데이터를 AI가 분석 중입니다..."):
-                            res = requests.post(f"{BACKEND_URL}/players/{player_id_for_analysis}/analysis")
-                            if res.status_code == 200:
-                                report_data = res.json()
-                                st.success("분석이 완료되었습니다!")
-                                st.markdown("---")
-                                st.markdown(report_data['report'])
-                            else:
-                                st.error(f"분석 실패: {res.text}")
-            else:
-                st.info("등록된 선수가 없습니다.")
+    dashboard = fetch_dashboard("players")
+    if dashboard is not None:
+        players = dashboard["players"]
+        if players["id"]:
+            player_table(players)
+
+            # ID와 이름을 조합하여 고유한 선택 옵션 생성
+            player_options = {f"{name} (ID: {pid})": pid for name, pid in zip(players['name'], players['id'])}
+            player_edit_form(players, player_options)
+
+            st.divider()
+            player_report_panel(player_options)
         else:
-            st.error("선수 목록을 불러오는 데 실패했습니다.")
-    except requests.exceptions.ConnectionError:
-        st.error("백엔드 서버에 연결할 수 없습니다. 서버가 실행 중인지 확인하세요.")
-
+            st.info("등록된 선수가 없습니다.")
 
 # --- 경기 기록 페이지 ---
-elif menu == "경기 기록":
-    st.header("📊 경기 기록")
-
-    # 선수 목록을 가져와서 선택지에 사용
-    players = []
-    player_options = {}
-    try:
-        player_res = requests.get(f"{BACKEND_URL}/players/")
-        if player_res.status_code == 200:
-            players = player_res.json()
-            player_options = {f"{p['name']} (ID: {p['id']})": p['id'] for p in players}
-    except requests.exceptions.ConnectionError:
-        st.warning("선수 목록을 불러올 수 없습니다. 백엔드 연결을 확인하세요.")
-
+@render_fragment("경기 입력 폼")
+def game_entry_form(player_options):
     # 경기 결과 입력 폼
     with st.form("game_form"):
         st.subheader("📝 경기 결과 입력")
@@ -260,7 +490,7 @@ elif menu == "경기 기록":
         game_date = st.date_input("경기 날짜")
         our_score = st.number_input("우리 팀 득점", min_value=0, step=1)
         opponent_score = st.number_input("상대 팀 득점", min_value=0, step=1)
-        
+
         scorers = st.multiselect("득점 선수", options=player_options.keys())
         assisters = st.multiselect("도움 선수", options=player_options.keys())
 
@@ -274,127 +504,122 @@ elif menu == "경기 기록":
                 "scorers": [player_options[name] for name in scorers],
                 "assisters": [player_options[name] for name in assisters]
             }
-            response = requests.post(f"{BACKEND_URL}/games/", json=game_data)
+            response = call_backend("POST", "/games/", json=game_data)
             if response.status_code == 200:
-                st.success("경기 결과가 성공적으로 기록되었습니다!")
+                # 상단에서 받아온 경기 목록에 새 기록을 반영하기 위해 다시 실행합니다.
+                flash("경기 결과가 성공적으로 기록되었습니다!")
+                st.rerun()
             else:
                 st.error(f"경기 기록 실패: {response.text}")
 
+@render_fragment("경기 목록")
+def game_list(games, game_options):
+    """경기 목록과 수정/삭제 폼. 경기를 바꿔 선택해도 이 구역만 다시 그립니다."""
+    st.dataframe(games[['id', 'game_date_only', 'opponent_team', 'our_score', 'opponent_score', 'result', '득점', '도움']], use_container_width=True)
+
+    selected_game_key = st.selectbox("수정 또는 삭제할 경기를 선택하세요", game_options.keys())
+
+    if selected_game_key:
+        game_id = game_options[selected_game_key]
+        selected_game = games[games['id'] == game_id].iloc[0]
+
+        with st.form(f"edit_game_{game_id}"):
+            st.subheader(f"'{selected_game_key}' 경기 정보 수정")
+            edit_opponent = st.text_input("상대 팀", value=selected_game['opponent_team'])
+            edit_date = st.date_input("경기 날짜", value=selected_game['game_date_only'])
+            edit_our_score = st.number_input("우리 팀 득점", min_value=0, step=1, value=int(selected_game['our_score']))
+            edit_opponent_score = st.number_input("상대 팀 득점", min_value=0, step=1, value=int(selected_game['opponent_score']))
+
+            col1, col2 = st.columns(2)
+            with col1:
+                update_submitted = st.form_submit_button("수정하기")
+            with col2:
+                delete_submitted = st.form_submit_button("삭제하기", type="primary")
+
+            if update_submitted:
+                updated_data = {
+                    "opponent_team": edit_opponent, "game_date": edit_date.isoformat() + "T00:00:00",
+                    "our_score": edit_our_score, "opponent_score": edit_opponent_score
+                }
+                res = call_backend("PUT", f"/games/{game_id}", json=updated_data)
+                if res.status_code == 200:
+                    flash("경기 정보가 수정되었습니다.")
+                    st.rerun()
+                else:
+                    st.error("수정 실패!")
+
+            if delete_submitted:
+                res = call_backend("DELETE", f"/games/{game_id}")
+                if res.status_code == 200:
+                    flash("경기 정보가 삭제되었습니다.")
+                    st.rerun()
+                else:
+                    st.error("삭제 실패!")
+
+@render_fragment("AI 경기 리포트")
+def game_report_panel(game_options):
+    st.subheader("🤖 AI 경기 리포트 생성")
+
+    # 리포트 생성을 위한 경기 선택
+    report_game_key = st.selectbox("리포트를 생성할 경기를 선택하세요", game_options.keys(), key="report_select")
+    if report_game_key:
+        show_stored_report(f"/games/{game_options[report_game_key]}/report")
+
+    if st.button("리포트 생성하기"):
+        if report_game_key:
+            game_id_for_report = game_options[report_game_key]
+            with st.spinner("Gemini AI가 경기 리포트를 생성 중입니다... 잠시만 기다려주세요."):
+                report_res = call_backend("POST", f"/games/{game_id_for_report}/report", params={"refresh": True})
+                if report_res.status_code == 200:
+                    report_data = report_res.json()
+                    st.success("리포트 생성이 완료되었습니다!")
+                    st.markdown("---")
+                    st.markdown(report_data['report'])
+                else:
+                    st.error(f"리포트 생성 실패: {report_res.text}")
+
+def games_page():
+    st.header("📊 경기 기록")
+    show_flash()
+
+    # 선수 선택지와 경기 목록을 한 번의 요청으로 받아옵니다.
+    dashboard = fetch_dashboard("games")
+    player_options = {}
+    if dashboard is not None:
+        roster = dashboard["roster"]
+        player_options = {f"{name} (ID: {pid})": pid for name, pid in zip(roster['name'], roster['id'])}
+
+    game_entry_form(player_options)
+
     st.divider()
 
     # 최근 경기 전적 및 수정/삭제
     st.subheader("📈 최근 경기 전적 및 관리")
-    try:
-        response = requests.get(f"{BACKEND_URL}/games/")
-        if response.status_code == 200:
-            games = response.json()
-            if games:
-                df_games = pd.DataFrame(games)
-
-                # 득점 및 도움 선수 정보 처리
-                scorers_list = []
-                assisters_list = []
-                for game in games:
-                    scorers = [event['player']['name'] for event in game['events'] if event['event_type'] == 'GOAL']
-                    assisters = [event['player']['name'] for event in game['events'] if event['event_type'] == 'ASSIST']
-                    scorers_list.append(", ".join(scorers))
-                    assisters_list.append(", ".join(assisters))
-                
-                df_games['득점'] = scorers_list
-                df_games['도움'] = assisters_list
-                df_games['game_date_only'] = pd.to_datetime(df_games['game_date']).dt.date
-                st.dataframe(df_games[['id', 'game_date_only', 'opponent_team', 'our_score', 'opponent_score', 'result', '득점', '도움']], use_container_width=True)
-
-                game_options = {f"{pd.to_datetime(g['game_date']).date()} vs {g['opponent_team']} (ID: {g['id']})": g['id'] for g in games}
-                selected_game_key = st.selectbox("수정 또는 삭제할 경기를 선택하세요", game_options.keys())
-
-                if selected_game_key:
-                    game_id = game_options[selected_game_key]
-                    selected_game = next((g for g in games if g['id'] == game_id), None)
-
-                    with st.form(f"edit_game_{game_id}"):
-                        st.subheader(f"'{selected_game_key}' 경기 정보 수정")
-                        edit_opponent = st.text_input("상대 팀", value=selected_game['opponent_team'])
-                        edit_date = st.date_input("경기 날짜", value=pd.to_datetime(selected_game['game_date']).date())
-                        edit_our_score = st.number_input("우리 팀 득점", min_value=0, step=1, value=selected_game['our_score'])
-                        edit_opponent_score = st.number_input("상대 팀 득점", min_value=0, step=1, value=selected_game['opponent_score'])
-
-                        col1, col2 = st.columns(2)
-                        with col1:
-                            update_submitted = st.form_submit_button("수정하기")
-                        with col2:
-                            delete_submitted = st.form_submit_button("삭제하기", type="primary")
-
-                        if update_submitted:
-                            updated_data = {
-                                "opponent_team": edit_opponent, "game_date": edit_date.isoformat() + "T00:00:00",
-                                "our_score": edit_our_score, "opponent_score": edit_opponent_score
-                            }
-                            res = requests.put(f"{BACKEND_URL}/games/{game_id}", json=updated_data)
-                            if res.status_code == 200:
-                                st.success("경기 정보가 수정되었습니다. 페이지를 새로고침하세요.")
-                            else:
-                                st.error("수정 실패!")
-                        
-                        if delete_submitted:
-                            res = requests.delete(f"{BACKEND_URL}/games/{game_id}")
-                            if res.status_code == 200:
-                                st.success("경기 정보가 삭제되었습니다. 페이지를 새로고침하세요.")
-                            else:
-                                st.error("삭제 실패!")
-                
-                st.divider()
-                st.subheader("🤖 AI 경기 리포트 생성")
-                
-                # 리포트 생성을 위한 경기 선택
-                report_game_key = st.selectbox("리포트를 생성할 경기를 선택하세요", game_options.keys(), key="report_select")
-                
-                if st.button("리포트 생성하기"):
-                    if report_game_key:
-                        game_id_for_report = game_options[report_game_key]
-                        with st.spinner("Gemini AI가 경기 리포트를 생성 중입니다... 잠시만 기다려주세요."):
-                            report_res = requests.post(f"{BACKEND_URL}/games/{game_id_for_report}/report")
-                            if report_res.status_code == 200:
-                                report_data = report_res.json()
-                                st.success("리포트 생성이 완료되었습니다!")
-                                st.markdown("---")
-                                st.markdown(report_data['report'])
-                            else:
-                                st.error(f"리포트 생성 실패: {report_res.text}")
-            else:
-                st.info("기록된 경기가 없습니다.")
-        else:
-            st.error("경기 기록을 불러오는 데 실패했습니다.")
-    except requests.exceptions.ConnectionError:
-        st.error("백엔드 서버에 연결할 수 없습니다. 서버가 실행 중인지 확인하세요.")
-
-# --- 팀 분석 페이지 ---
-elif menu == "팀 분석":
-    st.header("🔍 팀 분석")
+    if dashboard is not None:
+        games = dashboard["games"]
+        if games["id"]:
+            df_games = pd.DataFrame(games)
+
+            # 득점 및 도움 선수 이름 목록은 서버에서 경기별로 묶어서 내려줍니다.
+            df_games['득점'] = df_games['scorers'].str.join(", ")
+            df_games['도움'] = df_games['assisters'].str.join(", ")
+            df_games['game_date_only'] = pd.to_datetime(df_games['game_date']).dt.date
+
+            game_options = {
+                f"{game_date} vs {opponent} (ID: {gid})": gid
+                for game_date, opponent, gid in zip(df_games['game_date_only'], games['opponent_team'], games['id'])
+            }
+            game_list(df_games, game_options)
 
-    st.subheader("🆚 상대별 전적")
-    try:
-        response = requests.get(f"{BACKEND_URL}/stats/opponents")
-        if response.status_code == 200:
-            stats = response.json()
-            if stats:
-                df_stats = pd.DataFrame(stats)
-                df_stats.rename(columns={
-                    'opponent_team': '상대 팀',
-                    'total_games': '총 경기',
-                    'wins': '승',
-                    'losses': '패',
-                    'draws': '무'
-                }, inplace=True)
-                st.dataframe(df_stats[['상대 팀', '총 경기', '승', '패', '무']])
-            else:
-                st.info("분석할 경기 기록이 없습니다.")
+            st.divider()
+            game_report_panel(game_options)
         else:
-            st.error("상대별 전적을 불러오는 데 실패했습니다.")
-    except requests.exceptions.ConnectionError:
-        st.error("백엔드 서버에 연결할 수 없습니다. 서버가 실행 중인지 확인하세요.")
+            st.info("기록된 경기가 없습니다.")
 
-    st.divider()
+# --- 팀 분석 페이지 ---
+@render_fragment("AI 전술 추천")
+def formation_panel():
+    """상대 팀 이름을 입력할 때마다 이 구역만 다시 실행해 저장된 추천을 찾습니다."""
     st.subheader("🎯 AI 전술 추천")
 
     col1, col2 = st.columns(2)
@@ -403,11 +628,15 @@ elif menu == "팀 분석":
     with col2:
         opponent_style_for_tactic = st.text_area("상대 팀 전술 스타일 (선택 사항)", placeholder="예: 빠른 역습 위주, 4-4-2 포메이션 사용, 측면 공격이 강함")
 
+    if opponent_team_for_tactic:
+        show_stored_report("/analysis/formation",
+                           {"opponent_team": opponent_team_for_tactic, "opponent_style": opponent_style_for_tactic})
+
     if st.button("최적 포메이션 추천받기"):
         if opponent_team_for_tactic:
             with st.spinner(f"'{opponent_team_for_tactic}' 팀을 상대로 한 최적의 전술을 AI가 분석 중입니다..."):
                 req_data = {"opponent_team": opponent_team_for_tactic, "opponent_style": opponent_style_for_tactic}
-                res = requests.post(f"{BACKEND_URL}/analysis/formation", json=req_data)
+                res = call_backend("POST", "/analysis/formation", json=req_data, params={"refresh": True})
                 if res.status_code == 200:
                     tactic_data = res.json()
                     st.success("전술 분석이 완료되었습니다!")
@@ -418,40 +647,136 @@ elif menu == "팀 분석":
         else:
             st.warning("상대 팀 이름을 입력해주세요.")
 
+@render_fragment("예정된 경기")
+def upcoming_matches_panel():
+    st.subheader("📅 예정된 경기")
+    st.caption("등록한 상대의 포메이션 추천은 AI 요청이 없는 시간에 미리 만들어 둡니다.")
+
+    with st.form("upcoming_match_form", clear_on_submit=True):
+        col1, col2 = st.columns(2)
+        with col1:
+            upcoming_opponent = st.text_input("상대 팀 이름", key="upcoming_opponent")
+            upcoming_style = st.text_input("상대 팀 전술 스타일 (선택 사항)", key="upcoming_style")
+        with col2:
+            upcoming_date = st.date_input("경기 날짜", key="upcoming_date")
+            upcoming_time = st.time_input("경기 시간", key="upcoming_time")
+        if st.form_submit_button("예정된 경기 등록"):
+            if upcoming_opponent:
+                match_data = {
+                    "opponent_team": upcoming_opponent,
+                    "match_date": datetime.combine(upcoming_date, upcoming_time).isoformat(),
+                    "opponent_style": upcoming_style or None,
+                }
+                try:
+                    res = call_backend("POST", "/schedule/upcoming", json=match_data)
+                except requests.exceptions.ConnectionError:
+                    st.error("백엔드 서버에 연결할 수 없습니다. 서버가 실행 중인지 확인하세요.")
+                else:
+                    if res.status_code == 200:
+                        st.success(f"'{upcoming_opponent}' 경기가 등록되었습니다. 포메이션 추천을 미리 준비합니다.")
+                    else:
+                        st.error(f"등록 실패: {res.text}")
+            else:
+                st.warning("상대 팀 이름을 입력해주세요.")
+
+    # 예정된 경기 목록에 미리 생성된 추천이 함께 들어 있으므로 경기마다 따로 요청하지 않습니다.
+    try:
+        upcoming_res = call_backend("GET", "/schedule/upcoming")
+    except requests.exceptions.ConnectionError:
+        st.error("백엔드 서버에 연결할 수 없습니다. 서버가 실행 중인지 확인하세요.")
+        return
+    if upcoming_res.status_code == 200:
+        for match in upcoming_res.json():
+            match_date = datetime.fromisoformat(match['match_date']).strftime('%Y-%m-%d %H:%M')
+            with st.expander(f"{match_date} vs {match['opponent_team']}"):
+                if match['formation']:
+                    render_stored_report(match['formation'])
+                else:
+                    st.info("추천을 준비 중입니다.")
+                if st.button("삭제", key=f"delete_upcoming_{match['id']}"):
+                    try:
+                        call_backend("DELETE", f"/schedule/upcoming/{match['id']}")
+                    except requests.exceptions.ConnectionError:
+                        st.error("백엔드 서버에 연결할 수 없습니다. 서버가 실행 중인지 확인하세요.")
+                    else:
+                        st.rerun(scope="fragment")
+
+def analysis_page():
+    st.header("🔍 팀 분석")
+
+    st.subheader("🆚 상대별 전적")
+    dashboard = fetch_dashboard("analysis")
+    if dashboard is not None:
+        stats = dashboard["opponent_stats"]
+        if stats["opponent_team"]:
+            df_stats = pd.DataFrame(stats)
+            df_stats.rename(columns={
+                'opponent_team': '상대 팀',
+                'total_games': '총 경기',
+                'wins': '승',
+                'losses': '패',
+                'draws': '무'
+            }, inplace=True)
+            st.dataframe(df_stats[['상대 팀', '총 경기', '승', '패', '무']])
+        else:
+            st.info("분석할 경기 기록이 없습니다.")
+
+    st.divider()
+    formation_panel()
+
+    st.divider()
+    upcoming_matches_panel()
+
 # --- 리더보드 페이지 ---
-elif menu == "리더보드":
+def leaderboard_page():
     st.header("🏆 팀 내 개인 순위")
 
-    try:
-        response = requests.get(f"{BACKEND_URL}/stats/leaderboard")
-        if response.status_code == 200:
-            leaderboard_data = response.json()
-            if leaderboard_data:
-                df_leaderboard = pd.DataFrame(leaderboard_data)
-                df_leaderboard.rename(columns={
-                    'name': '선수명',
-                    'goals': '득점',
-                    'assists': '도움',
-                    'points': '공격 포인트'
-                }, inplace=True)
-
-                st.subheader("🎯 공격 포인트 순위 (득점 + 도움)")
-                st.dataframe(
-                    df_leaderboard[['선수명', '공격 포인트', '득점', '도움']].sort_values(by="공격 포인트", ascending=False).reset_index(drop=True),
-                    use_container_width=True
-                )
-
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.subheader("⚽ 득점 순위")
-                    st.dataframe(df_leaderboard[['선수명', '득점']].sort_values(by="득점", ascending=False).reset_index(drop=True), use_container_width=True)
-                with col2:
-                    st.subheader("🤝 도움 순위")
-                    st.dataframe(df_leaderboard[['선수명', '도움']].sort_values(by="도움", ascending=False).reset_index(drop=True), use_container_width=True)
+    dashboard = fetch_dashboard("leaderboard")
+    if dashboard is not None:
+        leaderboard_data = dashboard["leaderboard"]
+        if leaderboard_data["player_id"]:
+            df_leaderboard = pd.DataFrame(leaderboard_data)
+            df_leaderboard.rename(columns={
+                'name': '선수명',
+                'goals': '득점',
+                'assists': '도움',
+                'points': '공격 포인트'
+            }, inplace=True)
+
+            st.subheader("🎯 공격 포인트 순위 (득점 + 도움)")
+            st.dataframe(
+                df_leaderboard[['선수명', '공격 포인트', '득점', '도움']].sort_values(by="공격 포인트", ascending=False).reset_index(drop=True),
+                use_container_width=True
+            )
+
+            col1, col2 = st.columns(2)
+            with col1:
+                st.subheader("⚽ 득점 순위")
+                st.dataframe(df_leaderboard[['선수명', '득점']].sort_values(by="득점", ascending=False).reset_index(drop=True), use_container_width=True)
+            with col2:
+                st.subheader("🤝 도움 순위")
+                st.dataframe(df_leaderboard[['선수명', '도움']].sort_values(by="도움", ascending=False).reset_index(drop=True), use_container_width=True)
 
-            else:
-                st.info("아직 득점 또는 도움 기록이 없습니다.")
         else:
-            st.error("리더보드 데이터를 불러오는 데 실패했습니다.")
-    except requests.exceptions.ConnectionError:
-        st.error("백엔드 서버에 연결할 수 없습니다. 서버가 실행 중인지 확인하세요.")
\ No newline at end of file
+            st.info("아직 득점 또는 도움 기록이 없습니다.")
+
+PAGES = {
+    "선수 관리": players_page,
+    "경기 기록": games_page,
+    "팀 분석": analysis_page,
+    "리더보드": leaderboard_page,
+}
+
+set_custom_style()
+
+st.title("⚽ Oracle AI Manager & Coach")
+
+# --- 사이드바 ---
+st.sidebar.header("메뉴")
+menu = st.sidebar.radio("페이지 선택", list(PAGES))
+
+# 페이지 전체 실행은 사이드바 메뉴를 바꾸거나 데이터를 저장한 뒤(st.rerun)에만 일어납니다.
+with measure_render(f"페이지 전체: {menu}"):
+    PAGES[menu]()
+
+show_render_metrics()